@@ -1,32 +1,381 @@
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
+import os
 import time
 
+import cache_chiffrement
+from lots import traite_lot
+
+TAILLE_BLOC = algorithms.AES.block_size // 8
+TAILLE_MORCEAU = 1 << 20
+MODES = {"ECB": None, "CBC": 16, "CTR": 16, "GCM": 12}
+
+
+def _contexte_ecb(key, sens):
+    """
+    Renvoie le contexte AES-ECB en cache pour cette clé ; il est réutilisable
+    tant qu'on ne lui donne que des blocs complets et qu'on ne le finalise pas
+    """
+    def fabrique():
+        cipher = Cipher(algorithms.AES(key), modes.ECB())
+        return cipher.encryptor() if sens == "crypter" else cipher.decryptor()
+    return cache_chiffrement.contexte("AES", "ECB", sens, key, fabrique)
+
+def _retire_bourrage(message_clair):
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    return unpadder.update(message_clair) + unpadder.finalize()
+
 def decrypte_aes(message_crypte, key):
-    cipher = Cipher(algorithms.AES(key), modes.ECB())
-    decrypteur = cipher.decryptor()
-    message_clair = decrypteur.update(message_crypte) + decrypteur.finalize()
-    return message_clair
+    if len(message_crypte) % TAILLE_BLOC:
+        raise ValueError("Message crypté de taille incorrecte")
+    decrypteur = _contexte_ecb(key, "decrypter")
+    return _retire_bourrage(decrypteur.update(message_crypte))
 
 def encrypte_aes(message_clair, key):
-    cipher = Cipher(algorithms.AES(key), modes.ECB())
-    crypteur = cipher.encryptor()
-    padder = padding.PKCS7(algorithms.AES.block_size).padder()
-    message_clair = padder.update(message_clair) + padder.finalize()
-    cipher_texte = crypteur.update(message_clair) + crypteur.finalize()
-    return cipher_texte
-
-cle = b'123456789abcdefghijklmnopqrstuvw'
-message = b'Ce message est crypte avec AES'
-
-# Chiffrement
-start_c = time.time()
-crypte = encrypte_aes(message, cle)
-end_c = time.time() - start_c
-print(f"Temps d'exécution du chiffrement AES : {end_c} secondes")
-
-# Déchiffrement
-start_d = time.time()
-clair = decrypte_aes(crypte, cle)
-end_d = time.time() - start_d
-print(f"Temps d'exécution du déchiffrement AES : {end_d} secondes")
+    crypteur = _contexte_ecb(key, "crypter")
+    taille_bourrage = TAILLE_BLOC - len(message_clair) % TAILLE_BLOC
+    return crypteur.update(bytes(message_clair) +
+                           bytes([taille_bourrage]) * taille_bourrage)
+
+def encrypte_aes_cbc(iv, message_clair, key):
+    """
+    Crypte un message entier en AES-CBC avec bourrage PKCS7
+
+    Args:
+        iv (bytes): Le vecteur d'initialisation de 16 octets
+        message_clair (bytes): Le message à crypter
+        key (bytes): La clé AES (16, 24 ou 32 octets)
+
+    Returns:
+        bytes: Le message crypté
+    """
+    flux = FluxAES(key, "CBC", iv)
+    return flux.update(message_clair) + flux.finalize()
+
+def decrypte_aes_cbc(iv, message_crypte, key):
+    """
+    Décrypte un message entier en AES-CBC et retire le bourrage PKCS7
+
+    Le contexte ECB de la clé est repris dans le cache : chaque bloc décrypté
+    en ECB est ensuite combiné par ou exclusif avec le bloc crypté précédent
+    (l'IV pour le premier), ce qui est exactement le décryptage CBC.
+
+    Args:
+        iv (bytes): Le vecteur d'initialisation de 16 octets
+        message_crypte (bytes): Le message crypté
+        key (bytes): La clé AES (16, 24 ou 32 octets)
+
+    Returns:
+        bytes: Le message clair
+    """
+    if len(iv) != TAILLE_BLOC:
+        raise ValueError("L'IV doit faire 16 octets")
+    if not message_crypte or len(message_crypte) % TAILLE_BLOC:
+        raise ValueError("Message crypté de taille incorrecte")
+    blocs = _contexte_ecb(key, "decrypter").update(message_crypte)
+    precedents = bytes(iv) + bytes(message_crypte[:-TAILLE_BLOC])
+    message_clair = (int.from_bytes(blocs, "big") ^
+                     int.from_bytes(precedents, "big")).to_bytes(
+                         len(blocs), "big")
+    return _retire_bourrage(message_clair)
+
+
+def _encrypte_paquet_aes(messages, key):
+    """
+    Crypte un paquet de messages en AES-ECB (contexte en cache par thread)
+    """
+    return [encrypte_aes(message, key) for message in messages]
+
+def _decrypte_paquet_aes(messages, key):
+    """
+    Décrypte un paquet de messages AES-ECB (contexte en cache par thread)
+    """
+    return [decrypte_aes(message, key) for message in messages]
+
+def encrypte_aes_lot(messages, key, nombre_threads=None, ordonne=True):
+    """
+    Crypte de nombreux messages comme `encrypte_aes`, dans un pool de threads
+
+    Args:
+        messages (Iterable[bytes]): Les messages (liste ou itérateur)
+        key (bytes): La clé AES
+        nombre_threads (int | None): La taille du pool
+        ordonne (bool): Faux pour obtenir des couples (indice, résultat) dès
+            qu'ils sont prêts
+
+    Returns:
+        Iterator: Les messages cryptés
+    """
+    return traite_lot(lambda paquet: _encrypte_paquet_aes(paquet, key),
+                      messages, nombre_threads, ordonne)
+
+def decrypte_aes_lot(messages, key, nombre_threads=None, ordonne=True):
+    """
+    Décrypte de nombreux messages comme `decrypte_aes`, dans un pool de
+    threads
+
+    Args:
+        messages (Iterable[bytes]): Les messages cryptés
+        key (bytes): La clé AES
+        nombre_threads (int | None): La taille du pool
+        ordonne (bool): Faux pour obtenir des couples (indice, résultat) dès
+            qu'ils sont prêts
+
+    Returns:
+        Iterator: Les messages clairs
+    """
+    return traite_lot(lambda paquet: _decrypte_paquet_aes(paquet, key),
+                      messages, nombre_threads, ordonne)
+
+
+class FluxAES:
+    """
+    Cryptage ou décryptage AES par morceaux, en ECB, CBC, CTR ou GCM
+
+    Les morceaux peuvent avoir n'importe quelle taille : le bourrage PKCS7
+    (ECB et CBC) n'est ajouté qu'à la fin, et au décryptage le dernier bloc est
+    gardé de côté jusqu'à `finalize()` pour pouvoir retirer le bourrage.
+    `update_into` écrit dans un tampon fourni par l'appelant, ce qui évite
+    d'allouer un objet par morceau.
+    """
+
+    def __init__(self, cle, mode="CBC", iv=None, dechiffrer=False,
+                 tag=None, donnees_associees=None):
+        """
+        Prépare le contexte AES
+
+        Args:
+            cle (bytes): La clé AES (16, 24 ou 32 octets)
+            mode (str): "ECB", "CBC", "CTR" ou "GCM"
+            iv (bytes | None): L'IV (CBC), le compteur initial (CTR) ou le
+                nonce (GCM) ; tiré au hasard au cryptage s'il n'est pas donné
+            dechiffrer (bool): Vrai pour décrypter
+            tag (bytes | None): Le tag GCM attendu, s'il est connu dès le début
+            donnees_associees (bytes | None): Les données authentifiées mais
+                non cryptées (GCM)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode AES inconnu : {mode}")
+        if MODES[mode] is not None and iv is None:
+            if dechiffrer:
+                raise ValueError(f"Le mode {mode} a besoin de son IV pour "
+                                 "décrypter")
+            iv = os.urandom(MODES[mode])
+        self.mode = mode
+        self.iv = iv
+        self.tag = tag
+        self.dechiffrer = dechiffrer
+        self.bourrage = mode in ("ECB", "CBC")
+        if mode == "ECB":
+            mode_aes = modes.ECB()
+        elif mode == "CBC":
+            mode_aes = modes.CBC(iv)
+        elif mode == "CTR":
+            mode_aes = modes.CTR(iv)
+        else:
+            mode_aes = modes.GCM(iv)
+        cipher = Cipher(algorithms.AES(cle), mode_aes)
+        self._contexte = cipher.decryptor() if dechiffrer else \
+            cipher.encryptor()
+        if donnees_associees:
+            if mode != "GCM":
+                raise ValueError("Seul le mode GCM authentifie des données "
+                                 "associées")
+            self._contexte.authenticate_additional_data(donnees_associees)
+        self._longueur = 0
+        # dernier bloc décrypté, retenu pour le retrait du bourrage
+        self._retenu = bytearray(TAILLE_BLOC)
+        self._nombre_retenus = 0
+
+    def taille_sortie(self, taille_entree):
+        """
+        Renvoie la taille de tampon nécessaire à `update_into` pour un
+        morceau de `taille_entree` octets
+        """
+        return taille_entree + 2 * TAILLE_BLOC - 1
+
+    def update_into(self, donnees, tampon):
+        """
+        Traite un morceau et écrit le résultat au début de `tampon`
+
+        Args:
+            donnees (bytes-like): Le morceau à traiter
+            tampon (bytearray | memoryview): Au moins
+                `taille_sortie(len(donnees))` octets
+
+        Returns:
+            int: Le nombre d'octets écrits dans le tampon
+        """
+        sortie = memoryview(tampon)
+        if len(sortie) < self.taille_sortie(len(donnees)):
+            raise ValueError("Tampon de sortie trop petit")
+        self._longueur += len(donnees)
+        if not (self.dechiffrer and self.bourrage):
+            return self._contexte.update_into(donnees, sortie)
+        # on réémet d'abord le bloc retenu au morceau précédent
+        debut = self._nombre_retenus
+        sortie[:debut] = self._retenu[:debut]
+        ecrits = debut + self._contexte.update_into(donnees, sortie[debut:])
+        self._nombre_retenus = min(ecrits, TAILLE_BLOC)
+        self._retenu[:self._nombre_retenus] = \
+            sortie[ecrits - self._nombre_retenus:ecrits]
+        return ecrits - self._nombre_retenus
+
+    def update(self, donnees):
+        """
+        Traite un morceau et renvoie le résultat disponible
+
+        Args:
+            donnees (bytes-like): Le morceau à traiter
+
+        Returns:
+            bytes: Les octets cryptés ou décryptés produits par ce morceau
+        """
+        tampon = bytearray(self.taille_sortie(len(donnees)))
+        return bytes(tampon[:self.update_into(donnees, tampon)])
+
+    def finalize(self, tag=None):
+        """
+        Termine le traitement : ajoute ou vérifie le bourrage, calcule ou
+        vérifie le tag GCM
+
+        Args:
+            tag (bytes | None): Le tag GCM attendu, s'il n'a été connu qu'à la
+                fin du message
+
+        Returns:
+            bytes: Les derniers octets du résultat
+        """
+        if self.mode == "GCM":
+            if not self.dechiffrer:
+                fin = self._contexte.finalize()
+                self.tag = self._contexte.tag
+                return fin
+            tag = tag if tag is not None else self.tag
+            if tag is None:
+                raise ValueError("Le tag GCM est nécessaire pour décrypter")
+            self.tag = tag
+            return self._contexte.finalize_with_tag(tag)
+        if not self.bourrage:
+            return self._contexte.finalize()
+        if not self.dechiffrer:
+            taille_bourrage = TAILLE_BLOC - self._longueur % TAILLE_BLOC
+            return self._contexte.update(
+                bytes([taille_bourrage]) * taille_bourrage) + \
+                self._contexte.finalize()
+        self._contexte.finalize()
+        if self._nombre_retenus != TAILLE_BLOC:
+            raise ValueError("Message crypté vide ou tronqué")
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        return unpadder.update(bytes(self._retenu)) + unpadder.finalize()
+
+
+def traduit_flux(entree, sortie, flux_aes, taille_morceau=TAILLE_MORCEAU):
+    """
+    Fait passer tout un fichier dans un `FluxAES`, morceau par morceau, avec
+    deux tampons alloués une seule fois
+
+    Args:
+        entree (BinaryIO): Le fichier à lire
+        sortie (BinaryIO): Le fichier à écrire
+        flux_aes (FluxAES): Le contexte de cryptage ou de décryptage
+        taille_morceau (int): La taille des morceaux lus
+
+    Returns:
+        int: Le nombre d'octets écrits
+    """
+    lecture = bytearray(taille_morceau)
+    ecriture = bytearray(flux_aes.taille_sortie(taille_morceau))
+    vue_lecture = memoryview(lecture)
+    vue_ecriture = memoryview(ecriture)
+    total = 0
+    while True:
+        lus = entree.readinto(lecture)
+        if not lus:
+            break
+        ecrits = flux_aes.update_into(vue_lecture[:lus], ecriture)
+        sortie.write(vue_ecriture[:ecrits])
+        total += ecrits
+    fin = flux_aes.finalize()
+    sortie.write(fin)
+    return total + len(fin)
+
+
+def traduit_morceaux(morceaux, flux_aes):
+    """
+    Fait passer un itérable de morceaux dans un `FluxAES`
+
+    Args:
+        morceaux (Iterable[bytes]): Les morceaux, de tailles quelconques
+        flux_aes (FluxAES): Le contexte de cryptage ou de décryptage ; son
+            tag GCM est disponible une fois le générateur épuisé
+
+    Yields:
+        bytes: Les morceaux traités (éventuellement vides)
+    """
+    for morceau in morceaux:
+        yield flux_aes.update(morceau)
+    yield flux_aes.finalize()
+
+
+def crypte_fichier_aes(chemin_entree, chemin_sortie, cle, mode="CBC",
+                       iv=None, donnees_associees=None):
+    """
+    Crypte un fichier en AES par morceaux
+
+    Args:
+        chemin_entree (str): Le fichier clair
+        chemin_sortie (str): Le fichier crypté à écrire
+        cle (bytes): La clé AES
+        mode (str): "ECB", "CBC", "CTR" ou "GCM"
+        iv (bytes | None): L'IV ou le nonce, tiré au hasard s'il manque
+        donnees_associees (bytes | None): Les données associées (GCM)
+
+    Returns:
+        tuple[bytes | None, bytes | None]: L'IV utilisé et le tag GCM
+    """
+    flux_aes = FluxAES(cle, mode, iv, donnees_associees=donnees_associees)
+    with open(chemin_entree, "rb") as entree, \
+            open(chemin_sortie, "wb") as sortie:
+        traduit_flux(entree, sortie, flux_aes)
+    return flux_aes.iv, flux_aes.tag
+
+
+def decrypte_fichier_aes(chemin_entree, chemin_sortie, cle, iv, mode="CBC",
+                         tag=None, donnees_associees=None):
+    """
+    Décrypte un fichier en AES par morceaux
+
+    Args:
+        chemin_entree (str): Le fichier crypté
+        chemin_sortie (str): Le fichier clair à écrire
+        cle (bytes): La clé AES
+        iv (bytes | None): L'IV ou le nonce utilisé au cryptage
+        mode (str): "ECB", "CBC", "CTR" ou "GCM"
+        tag (bytes | None): Le tag GCM
+        donnees_associees (bytes | None): Les données associées (GCM)
+
+    Returns:
+        int: La taille du fichier clair
+    """
+    flux_aes = FluxAES(cle, mode, iv, dechiffrer=True, tag=tag,
+                       donnees_associees=donnees_associees)
+    with open(chemin_entree, "rb") as entree, \
+            open(chemin_sortie, "wb") as sortie:
+        return traduit_flux(entree, sortie, flux_aes)
+
+if __name__ == "__main__":
+    cle = b'123456789abcdefghijklmnopqrstuvw'
+    message = b'Ce message est crypte avec AES'
+
+    # Chiffrement
+    start_c = time.time()
+    crypte = encrypte_aes(message, cle)
+    end_c = time.time() - start_c
+    print(f"Temps d'exécution du chiffrement AES : {end_c} secondes")
+
+    # Déchiffrement
+    start_d = time.time()
+    clair = decrypte_aes(crypte, cle)
+    end_d = time.time() - start_d
+    print(f"Temps d'exécution du déchiffrement AES : {end_d} secondes")
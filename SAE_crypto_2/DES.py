@@ -2,28 +2,87 @@ from Crypto.Cipher import DES
 from Crypto.Util.Padding import pad, unpad
 import time
 
+import cache_chiffrement
+from lots import traite_lot
+
+def _contexte_des(cle):
+    """
+    Renvoie l'objet DES-ECB en cache pour cette clé (l'ECB n'a pas d'état, le
+    même objet crypte et décrypte)
+    """
+    return cache_chiffrement.contexte("DES", "ECB", "", cle,
+                                      lambda: DES.new(cle, DES.MODE_ECB))
+
 def decrypte_des(message_crypte, cle):
-    cipher = DES.new(cle, DES.MODE_ECB)
+    cipher = _contexte_des(cle)
     message_clair = cipher.decrypt(message_crypte)
     return unpad(message_clair, DES.block_size)
 
 def encrypte_des(message_clair, cle):
-    cipher = DES.new(cle, DES.MODE_ECB)
+    cipher = _contexte_des(cle)
     message_clair = pad(message_clair, DES.block_size)
     return cipher.encrypt(message_clair)
 
-# Exemple d'utilisation
-cle = b'12345678'
-message = b'Ce message est crypte avec DES'
-
-# Chiffrement
-start_c = time.time()
-crypte = encrypte_des(message, cle)
-end_c = time.time() - start_c
-print(f"Temps d'exécution du chiffrement DES : {end_c} secondes")
-
-# Déchiffrement
-start_d = time.time()
-clair = decrypte_des(crypte, cle)
-end_d = time.time() - start_d
-print(f"Temps d'exécution du déchiffrement DES : {end_d} secondes")
\ No newline at end of file
+def _encrypte_paquet_des(messages, cle):
+    """
+    Crypte un paquet de messages en DES-ECB (objet en cache par thread)
+    """
+    return [encrypte_des(message, cle) for message in messages]
+
+def _decrypte_paquet_des(messages, cle):
+    """
+    Décrypte un paquet de messages DES-ECB (objet en cache par thread)
+    """
+    return [decrypte_des(message, cle) for message in messages]
+
+def encrypte_des_lot(messages, cle, nombre_threads=None, ordonne=True):
+    """
+    Crypte de nombreux messages comme `encrypte_des`, dans un pool de threads
+
+    Args:
+        messages (Iterable[bytes]): Les messages (liste ou itérateur)
+        cle (bytes): La clé DES
+        nombre_threads (int | None): La taille du pool
+        ordonne (bool): Faux pour obtenir des couples (indice, résultat) dès
+            qu'ils sont prêts
+
+    Returns:
+        Iterator: Les messages cryptés
+    """
+    return traite_lot(lambda paquet: _encrypte_paquet_des(paquet, cle),
+                      messages, nombre_threads, ordonne)
+
+def decrypte_des_lot(messages, cle, nombre_threads=None, ordonne=True):
+    """
+    Décrypte de nombreux messages comme `decrypte_des`, dans un pool de
+    threads
+
+    Args:
+        messages (Iterable[bytes]): Les messages cryptés
+        cle (bytes): La clé DES
+        nombre_threads (int | None): La taille du pool
+        ordonne (bool): Faux pour obtenir des couples (indice, résultat) dès
+            qu'ils sont prêts
+
+    Returns:
+        Iterator: Les messages clairs
+    """
+    return traite_lot(lambda paquet: _decrypte_paquet_des(paquet, cle),
+                      messages, nombre_threads, ordonne)
+
+if __name__ == "__main__":
+    # Exemple d'utilisation
+    cle = b'12345678'
+    message = b'Ce message est crypte avec DES'
+
+    # Chiffrement
+    start_c = time.time()
+    crypte = encrypte_des(message, cle)
+    end_c = time.time() - start_c
+    print(f"Temps d'exécution du chiffrement DES : {end_c} secondes")
+
+    # Déchiffrement
+    start_d = time.time()
+    clair = decrypte_des(crypte, cle)
+    end_d = time.time() - start_d
+    print(f"Temps d'exécution du déchiffrement DES : {end_d} secondes")
@@ -1,43 +1,295 @@
 """
 Module permettant de decrypter un trace reseau .cap
+
+Le décryptage est une chaîne de générateurs : lecture paresseuse des paquets
+et filtrage du port UDP 9999 (par le lecteur brut de `pcap_brut`, ou par
+scapy), séparation de l'IV de 16 octets, décryptage dans un pool de threads,
+puis restitution des messages dans l'ordre de la capture. Chaque étape ne
+garde que quelques paquets en mémoire, si bien que la taille de la trace
+n'est pas limitée par la mémoire.
+
+Le mode suivi décrypte une trace encore en cours d'écriture, message par
+message, et reprend après un redémarrage grâce à un point de reprise :
+
+    python analyse_trace.py --suivre capture.pcap --reprise capture.json
 """
+import argparse
+import os
+
+from AES import decrypte_aes_cbc
+from lots import traite_lot
+from pcap_brut import INTERVALLE_SUIVI, charges_udp, suit_charges
+from sdes.instrumentation import (INACTIVE, Instrumentation,
+                                  affiche_progression, instrumente)
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+CHEMIN_TRACE = os.path.join(DOSSIER, "sujet", "trace_sae.cap")
+PORT = 9999
+TAILLE_IV = 16
+
+
+def lit_paquets(chemin: str = CHEMIN_TRACE):
+    """
+    Lit les paquets de la trace un par un, sans charger tout le fichier
+
+    Args:
+        chemin (str): Le fichier .cap (pcap ou pcapng)
+
+    Yields:
+        Packet: Les paquets scapy, dans l'ordre de la capture
+    """
+    from scapy.all import PcapReader
+
+    with PcapReader(chemin) as lecteur:
+        yield from lecteur
+
+
+def filtre_udp(paquets, port: int = PORT):
+    """
+    Garde les paquets UDP envoyés au port donné
+
+    Args:
+        paquets (Iterable[Packet]): Les paquets scapy
+        port (int): Le port UDP de destination
+
+    Yields:
+        bytes: La charge utile UDP de chaque paquet gardé
+    """
+    from scapy.all import UDP
+
+    for paquet in paquets:
+        if paquet.haslayer(UDP) and paquet[UDP].dport == port:
+            yield bytes(paquet[UDP].payload)
 
-from aes import decrypte_aes_cbc
-from scapy.all import rdpcap, Raw, UDP
-from steganographie import retrouve_cle
-from cryptography.hazmat.primitives.padding import PKCS7
 
+def lit_charges(chemin: str = CHEMIN_TRACE, port: int = PORT,
+                moteur: str = "brut"):
+    """
+    Lit les charges utiles UDP envoyées au port donné
 
-def analyse_trace() -> list[tuple[bytes, bytes]]:
+    Args:
+        chemin (str): Le fichier .cap (pcap ou pcapng)
+        port (int): Le port UDP de destination
+        moteur (str): "brut" (lecture directe des en-têtes, sans copie) ou
+            "scapy" (dissection complète de chaque paquet)
+
+    Returns:
+        Iterator[bytes | memoryview]: Les charges utiles
+    """
+    if moteur == "brut":
+        return charges_udp(chemin, port)
+    if moteur == "scapy":
+        return filtre_udp(lit_paquets(chemin), port)
+    raise ValueError(f"Moteur de lecture inconnu : {moteur}")
+
+
+def separe_iv(charges):
+    """
+    Sépare l'IV (les 16 premiers octets) du message crypté
+
+    Args:
+        charges (Iterable[bytes | memoryview]): Les charges utiles UDP
+
+    Yields:
+        tuple: Le message crypté et l'IV (des tranches des charges, sans
+        copie pour une `memoryview`)
+    """
+    for charge in charges:
+        yield charge[TAILLE_IV:], charge[:TAILLE_IV]
+
+
+def decrypte_message(iv, message, cle: bytes) -> bytes | None:
+    """
+    Décrypte un message, ou renvoie None s'il est invalide (taille, IV ou
+    bourrage incorrects) : un paquet corrompu n'arrête pas le décryptage de
+    toute la trace
+    """
+    try:
+        return decrypte_aes_cbc(iv, message, cle)
+    except ValueError:
+        return None
+
+
+def decrypte_messages(messages, cle: bytes,
+                      nombre_threads: int | None = None,
+                      instrumentation: Instrumentation | None = None):
+    """
+    Décrypte les messages en AES-CBC dans un pool de threads, en gardant
+    l'ordre de la capture
+
+    Args:
+        messages (Iterable[tuple[bytes, bytes]]): Les messages cryptés et
+            leurs IV
+        cle (bytes): La clé AES
+        nombre_threads (int | None): La taille du pool
+        instrumentation (Instrumentation | None): Reçoit le temps de
+            décryptage, additionné sur tous les threads, et compte les
+            messages invalides
+
+    Yields:
+        bytes: Les messages clairs ; les messages invalides sont sautés et
+        comptés dans "messages_invalides"
+    """
+    mesures = INACTIVE if instrumentation is None else instrumentation
+
+    def decrypte_paquet(paquet):
+        with mesures.etape("decryptage"):
+            return [decrypte_message(iv, message, cle)
+                    for message, iv in paquet]
+
+    for message_clair in traite_lot(decrypte_paquet, messages,
+                                    nombre_threads):
+        if message_clair is None:
+            mesures.compte("messages_invalides")
+        else:
+            yield message_clair
+
+
+def analyse_trace(chemin: str = CHEMIN_TRACE, moteur: str = "brut",
+                  instrumentation: Instrumentation | None = None
+                  ) -> list[tuple[bytes, bytes]]:
     """
     Fonction permettant d'analyser le trace .cap
 
+    Args:
+        chemin (str): Le fichier .cap
+        moteur (str): "brut" ou "scapy"
+        instrumentation (Instrumentation | None): Reçoit le temps de lecture
+
     Returns:
         list[tuple[bytes, bytes]]: La liste des données et des entêtes
     """
-    packets = rdpcap('sujet/trace_sae.cap')
-    liste: list[tuple[bytes, bytes]] = []
-    for packet in packets:
-        if packet.haslayer(UDP) and packet[UDP].dport == 9999:
-            entete = packet[Raw].load[:16]
-            data = packet[Raw].load[16:]
-            liste.append((data, entete))
-    return liste
+    with instrumente(instrumentation, "analyse_trace") as mesures:
+        with mesures.etape("lecture"):
+            return [(bytes(data), bytes(entete)) for data, entete in
+                    separe_iv(lit_charges(chemin, moteur=moteur))]
 
 
-def decrypte_message_alice_et_bob() -> list[str]:
+def cle_alice_et_bob(cache: bool | None = None) -> bytes:
     """
-    Fonction qui decrypte les messages d'Alice et Bob dans le trace .cap
+    Retrouve la clé AES-256 d'Alice et Bob : la clé de 64 bits cachée dans
+    l'image, répétée 4 fois
+
+    Args:
+        cache (bool | None): Relit la clé de l'image dans le cache persistant
+            (par défaut si SDES_CACHE est défini)
     """
-    les_messages = analyse_trace()
-    cle = retrouve_cle() * 4
+    # importé ici : la lecture des images charge NumPy, dont le reste de
+    # l'analyse de trace n'a pas besoin
+    from enigme_images import retrouve_cle
+
+    cle = retrouve_cle(cache=cache) * 4
     cle_int = int(cle, 2)  # Transforme la clé en int
-    cle_bytes = cle_int.to_bytes(32,
-                                 byteorder='big')  #Transforme la clé en bytes
-    liste_messages: list[str] = []
-    for message in les_messages:
-        ciphertext = message[0]
-        iv = message[1]
-        ciphertext = PKCS7(128).padder().update(ciphertext)  # Ajout du padding
-        liste_messages.append(decrypte_aes_cbc(iv, ciphertext, cle_bytes))
-    return liste_messages
+    return cle_int.to_bytes(32, byteorder='big')  #Transforme la clé en bytes
+
+
+def messages_alice_et_bob(chemin: str = CHEMIN_TRACE,
+                          nombre_threads: int | None = None,
+                          moteur: str = "brut",
+                          instrumentation: Instrumentation | None = None):
+    """
+    Décrypte au fil de l'eau les messages d'Alice et Bob dans le trace .cap
+
+    Args:
+        chemin (str): Le fichier .cap
+        nombre_threads (int | None): La taille du pool de décryptage
+        moteur (str): "brut" ou "scapy"
+        instrumentation (Instrumentation | None): Reçoit les temps de
+            recherche de la clé, de lecture et de décryptage, et compte les
+            messages
+
+    Yields:
+        str: Les messages, dans l'ordre de la capture
+    """
+    with instrumente(instrumentation, "messages_alice_et_bob") as mesures:
+        with mesures.etape("cle"):
+            cle = cle_alice_et_bob()
+        messages = separe_iv(mesures.chronometre(
+            "lecture", lit_charges(chemin, moteur=moteur)))
+        for message in decrypte_messages(messages, cle, nombre_threads,
+                                         mesures):
+            mesures.avance()
+            yield message.decode("utf-8", errors="replace")
+
+
+def decrypte_message_alice_et_bob(
+        chemin: str = CHEMIN_TRACE,
+        instrumentation: Instrumentation | None = None) -> list[str]:
+    """
+    Fonction qui decrypte les messages d'Alice et Bob dans le trace .cap
+    """
+    return list(messages_alice_et_bob(chemin,
+                                      instrumentation=instrumentation))
+
+
+def suit_alice_et_bob(chemin: str = CHEMIN_TRACE,
+                      point_de_reprise: str | None = None,
+                      intervalle: float = INTERVALLE_SUIVI, arret=None,
+                      instrumentation: Instrumentation | None = None):
+    """
+    Décrypte les messages d'Alice et Bob dès qu'ils sont ajoutés à une trace
+    en cours d'écriture
+
+    Chaque message est décrypté dès sa lecture, sans attendre d'en avoir
+    assez pour remplir un paquet du pool de threads, pour que la latence
+    reste celle de l'intervalle de scrutation.
+
+    Args:
+        chemin (str): La trace suivie
+        point_de_reprise (str | None): Le fichier JSON où la position lue
+            est enregistrée, pour reprendre après un redémarrage
+        intervalle (float): L'attente (s) entre deux lectures de la trace
+        arret (threading.Event | None): Arrête le suivi quand il est levé
+        instrumentation (Instrumentation | None): Reçoit les temps de
+            lecture (attente comprise) et de décryptage, et compte les
+            messages invalides, qui sont sautés
+
+    Yields:
+        str: Les messages, dans l'ordre de la capture
+    """
+    with instrumente(instrumentation, "suit_alice_et_bob") as mesures:
+        with mesures.etape("cle"):
+            cle = cle_alice_et_bob()
+        for message, iv in separe_iv(mesures.chronometre(
+                "lecture", suit_charges(chemin, PORT, point_de_reprise,
+                                        intervalle, arret))):
+            with mesures.etape("decryptage"):
+                message_clair = decrypte_message(iv, message, cle)
+            if message_clair is None:
+                mesures.compte("messages_invalides")
+                continue
+            mesures.avance()
+            yield message_clair.decode("utf-8", errors="replace")
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(
+        description="Décrypte les messages d'Alice et Bob d'une trace")
+    parseur.add_argument("trace", nargs="?", default=CHEMIN_TRACE)
+    parseur.add_argument("-s", "--suivre", action="store_true",
+                         help="suit la trace pendant qu'elle est écrite")
+    parseur.add_argument("-r", "--reprise",
+                         help="fichier JSON du point de reprise (--suivre)")
+    parseur.add_argument("-m", "--moteur", choices=("brut", "scapy"),
+                         default="brut")
+    parseur.add_argument("--metriques",
+                         help="fichier JSON lines où ajouter les mesures")
+    parseur.add_argument("--progression", action="store_true",
+                         help="affiche le débit sur la sortie d'erreur")
+    options = parseur.parse_args()
+    instrumentation = None
+    if options.metriques or options.progression:
+        instrumentation = Instrumentation(
+            progression=affiche_progression if options.progression else None,
+            sortie=options.metriques)
+    if options.suivre:
+        messages = suit_alice_et_bob(options.trace, options.reprise,
+                                     instrumentation=instrumentation)
+    else:
+        messages = messages_alice_et_bob(options.trace, moteur=options.moteur,
+                                         instrumentation=instrumentation)
+    try:
+        for message_clair in messages:
+            print(message_clair, flush=options.suivre)
+    except KeyboardInterrupt:
+        messages.close()
@@ -0,0 +1,304 @@
+"""
+Module de mesure du débit de AES.py et DES.py
+
+Chaque chiffrement est mesuré sur des messages de 16 octets à 1 Gio, avec
+des exécutions d'échauffement puis plusieurs répétitions, pour les deux
+bibliothèques du projet : `cryptography` (AES.py) et PyCryptodome (DES.py).
+Un appel crée le contexte (clé, mode) puis crypte tout le message, comme les
+fonctions du projet. Au-delà de TAILLE_MORCEAU, le message est crypté par
+morceaux dans un tampon réutilisé, pour ne pas allouer plusieurs Gio.
+
+    python bench_chiffrement.py -o bench_chiffrement.json
+    python bench_chiffrement.py --taille-max 16M --filtre AES-CBC
+"""
+import argparse
+import datetime
+import json
+import math
+import platform
+import sys
+import time
+
+TAILLES = (16, 256, 4 << 10, 64 << 10, 1 << 20, 16 << 20, 256 << 20, 1 << 30)
+TAILLE_MORCEAU = 16 << 20
+REPETITIONS = 50
+ECHAUFFEMENT = 3
+# nombre d'octets cryptés par mesure et par taille, pour borner la durée
+OCTETS_PAR_MESURE = 256 << 20
+REPETITIONS_MIN = 3
+# les fonctions du projet allouent le message entier et son bourrage
+TAILLE_MAX_PROJET = 16 << 20
+CLE_AES = b'123456789abcdefghijklmnopqrstuvw'
+CLE_DES = b'12345678'
+CENTILES = (50, 90, 99)
+
+
+def _morceaux(taille: int, fonction, tampon: memoryview) -> None:
+    """
+    Fait passer `taille` octets dans `fonction` par morceaux du tampon
+    """
+    reste = taille
+    while reste:
+        longueur = min(reste, len(tampon))
+        fonction(tampon[:longueur])
+        reste -= longueur
+
+
+def _cryptography(mode: str):
+    """
+    Renvoie la fabrique de mesures d'AES-256 avec `cryptography`
+    """
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, \
+        modes
+
+    fabriques = {
+        "ECB": modes.ECB,
+        "CBC": lambda: modes.CBC(bytes(16)),
+        "CTR": lambda: modes.CTR(bytes(16)),
+        "GCM": lambda: modes.GCM(bytes(12)),
+    }
+
+    def preparer(taille: int):
+        entree = memoryview(bytearray(min(taille, TAILLE_MORCEAU)))
+        sortie = bytearray(len(entree) + 15)
+
+        def appel():
+            crypteur = Cipher(algorithms.AES(CLE_AES),
+                              fabriques[mode]()).encryptor()
+            _morceaux(taille,
+                      lambda morceau: crypteur.update_into(morceau, sortie),
+                      entree)
+            crypteur.finalize()
+        return appel
+    return preparer
+
+
+def _pycryptodome(algorithme: str, mode: str):
+    """
+    Renvoie la fabrique de mesures d'AES-256 ou de DES avec PyCryptodome
+    """
+    from Crypto.Cipher import AES, DES
+
+    module, cle = (AES, CLE_AES) if algorithme == "AES" else (DES, CLE_DES)
+    parametres = {
+        "ECB": {},
+        "CBC": {"iv": bytes(module.block_size)},
+        "CTR": {"nonce": bytes(module.block_size // 2)},
+        "GCM": {"nonce": bytes(12)},
+    }[mode]
+
+    def preparer(taille: int):
+        entree = memoryview(bytearray(min(taille, TAILLE_MORCEAU)))
+        sortie = bytearray(len(entree))
+        vue_sortie = memoryview(sortie)
+
+        def appel():
+            crypteur = module.new(cle, getattr(module, f"MODE_{mode}"),
+                                  **parametres)
+            _morceaux(taille,
+                      lambda morceau: crypteur.encrypt(
+                          morceau, output=vue_sortie[:len(morceau)]),
+                      entree)
+            if mode == "GCM":
+                crypteur.digest()
+        return appel
+    return preparer
+
+
+def _projet(nom_fonction: str):
+    """
+    Renvoie la fabrique de mesures d'une fonction de AES.py ou DES.py
+    """
+    import AES
+    import DES
+
+    fonction, cle = {
+        "encrypte_aes": (AES.encrypte_aes, CLE_AES),
+        "encrypte_des": (DES.encrypte_des, CLE_DES),
+    }[nom_fonction]
+
+    def preparer(taille: int):
+        message = bytes(taille)
+        return lambda: fonction(message, cle)
+    return preparer
+
+
+def implementations() -> dict:
+    """
+    Renvoie les implémentations mesurables, par nom
+
+    Returns:
+        dict: Pour chaque nom, la bibliothèque, l'algorithme, le mode, la
+        taille maximale et la fabrique `preparer(taille) -> appel`
+    """
+    resultats = {}
+    for mode in ("ECB", "CBC", "CTR", "GCM"):
+        resultats[f"cryptography/AES-{mode}"] = (
+            "cryptography", "AES", mode, None, _cryptography(mode))
+        resultats[f"pycryptodome/AES-{mode}"] = (
+            "pycryptodome", "AES", mode, None, _pycryptodome("AES", mode))
+    for mode in ("ECB", "CBC", "CTR"):
+        resultats[f"pycryptodome/DES-{mode}"] = (
+            "pycryptodome", "DES", mode, None, _pycryptodome("DES", mode))
+    resultats["AES.encrypte_aes"] = ("cryptography", "AES", "ECB",
+                                     TAILLE_MAX_PROJET,
+                                     _projet("encrypte_aes"))
+    resultats["DES.encrypte_des"] = ("pycryptodome", "DES", "ECB",
+                                     TAILLE_MAX_PROJET,
+                                     _projet("encrypte_des"))
+    return resultats
+
+
+def centile(durees: list[float], pourcentage: float) -> float:
+    """
+    Renvoie le centile des durées (triées), par interpolation linéaire
+    """
+    position = (len(durees) - 1) * pourcentage / 100
+    bas = math.floor(position)
+    haut = min(bas + 1, len(durees) - 1)
+    return durees[bas] + (durees[haut] - durees[bas]) * (position - bas)
+
+
+def mesurer(appel, taille: int, repetitions: int = REPETITIONS,
+            echauffement: int = ECHAUFFEMENT) -> dict:
+    """
+    Mesure le débit et la latence d'un appel
+
+    Le nombre de répétitions est réduit pour les grands messages, afin de ne
+    pas crypter plus de OCTETS_PAR_MESURE octets (au moins REPETITIONS_MIN).
+
+    Args:
+        appel (callable): L'appel à mesurer, sans argument
+        taille (int): La taille du message crypté par un appel
+        repetitions (int): Le nombre maximal d'appels mesurés
+        echauffement (int): Le nombre maximal d'appels préalables non mesurés
+
+    Returns:
+        dict: Le débit (Mo/s, calculé sur la durée médiane) et les centiles
+        de latence (µs)
+    """
+    repetitions = max(REPETITIONS_MIN,
+                      min(repetitions, OCTETS_PAR_MESURE // taille))
+    for _ in range(min(echauffement, repetitions)):
+        appel()
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        appel()
+        durees.append(time.perf_counter() - debut)
+    durees.sort()
+    mediane = centile(durees, 50)
+    return {
+        "repetitions": repetitions,
+        "debit_mo_s": taille / mediane / 1e6,
+        "latence_us": {
+            "min": durees[0] * 1e6,
+            **{f"p{p}": centile(durees, p) * 1e6 for p in CENTILES},
+            "max": durees[-1] * 1e6,
+        },
+    }
+
+
+def _versions() -> dict:
+    """
+    Renvoie les versions des bibliothèques cryptographiques installées
+    """
+    from importlib import metadata
+
+    versions = {}
+    for paquet in ("cryptography", "pycryptodome"):
+        try:
+            versions[paquet] = metadata.version(paquet)
+        except metadata.PackageNotFoundError:
+            versions[paquet] = None
+    return versions
+
+
+def lancer(tailles=TAILLES, repetitions: int = REPETITIONS,
+           filtre: str | None = None, afficher: bool = False) -> dict:
+    """
+    Lance les mesures de toutes les implémentations sur toutes les tailles
+
+    Args:
+        tailles (Iterable[int]): Les tailles de message (octets)
+        repetitions (int): Le nombre maximal d'appels mesurés par taille
+        filtre (str | None): Ne mesure que les implémentations dont le nom
+            contient ce texte
+        afficher (bool): Affiche chaque mesure sur la sortie d'erreur
+
+    Returns:
+        dict: Les métadonnées de l'exécution et la liste des mesures
+    """
+    mesures = []
+    for nom, (bibliotheque, algorithme, mode, taille_max,
+              preparer) in implementations().items():
+        if filtre and filtre not in nom:
+            continue
+        for taille in tailles:
+            if taille_max is not None and taille > taille_max:
+                continue
+            mesure = {"implementation": nom, "bibliotheque": bibliotheque,
+                      "algorithme": algorithme, "mode": mode,
+                      "taille": taille,
+                      **mesurer(preparer(taille), taille, repetitions)}
+            mesures.append(mesure)
+            if afficher:
+                print(f"{nom:26} {taille:>11} o  "
+                      f"{mesure['debit_mo_s']:10.1f} Mo/s  "
+                      f"p50 {mesure['latence_us']['p50']:12.1f} µs",
+                      file=sys.stderr)
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+            "versions": _versions(),
+            "repetitions": repetitions,
+            "echauffement": ECHAUFFEMENT,
+            "taille_morceau": TAILLE_MORCEAU,
+        },
+        "mesures": mesures,
+    }
+
+
+def _taille(texte: str) -> int:
+    """
+    Lit une taille en octets, avec un suffixe K, M ou G éventuel
+    """
+    suffixes = {"K": 10, "M": 20, "G": 30}
+    texte = texte.strip().upper()
+    if texte and texte[-1] in suffixes:
+        return int(texte[:-1]) << suffixes[texte[-1]]
+    return int(texte)
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Point d'entrée : mesure puis enregistre les résultats en JSON
+    """
+    parseur = argparse.ArgumentParser(
+        description="Débit et latence de AES.py et DES.py")
+    parseur.add_argument("-o", "--sortie", default="bench_chiffrement.json",
+                         help="fichier JSON (« - » pour la sortie standard)")
+    parseur.add_argument("-r", "--repetitions", type=int,
+                         default=REPETITIONS)
+    parseur.add_argument("--taille-max", type=_taille, default=TAILLES[-1],
+                         help="ex. 64M ; 1G par défaut")
+    parseur.add_argument("-f", "--filtre",
+                         help="ne mesure que les implémentations dont le nom "
+                         "contient ce texte")
+    options = parseur.parse_args(arguments)
+    resultats = lancer([t for t in TAILLES if t <= options.taille_max],
+                       options.repetitions, options.filtre, afficher=True)
+    if options.sortie == "-":
+        json.dump(resultats, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(resultats, fichier, indent=2)
+        print(options.sortie)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
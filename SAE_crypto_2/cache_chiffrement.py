@@ -0,0 +1,178 @@
+"""
+Module pour le cache LRU des contextes de chiffrement déjà initialisés
+
+Créer un contexte AES ou DES refait le cadencement de la clé. Quand la même
+clé revient (tous les paquets d'une trace, tous les messages d'un lot), le
+contexte préparé est repris dans le cache, indexé par
+(algorithme, mode, sens, clé). Seuls des contextes sans état d'un message à
+l'autre (ECB) ou des fabriques y sont rangés.
+
+Les contextes ne sont pas partagés entre threads : chaque thread a son propre
+cache, de la taille configurée. Les caches des threads terminés sont libérés
+à la création d'un nouveau cache ou à la lecture des statistiques, et leurs
+compteurs restent comptés.
+"""
+import threading
+from collections import Counter, OrderedDict
+
+TAILLE_CACHE = 128
+
+_local = threading.local()
+# thread -> cache, et compteurs des caches des threads terminés
+_caches = {}
+_compteurs_termines = Counter()
+_verrou = threading.Lock()
+_taille = TAILLE_CACHE
+
+
+class CacheLRU:
+    """
+    Cache borné qui évince l'entrée utilisée le moins récemment
+    """
+
+    def __init__(self, taille: int = TAILLE_CACHE):
+        if taille < 1:
+            raise ValueError("La taille du cache doit être positive")
+        self.taille = taille
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self._entrees = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def obtenir(self, cle, fabrique):
+        """
+        Renvoie la valeur associée à `cle`, en la créant avec `fabrique()` si
+        elle n'est pas dans le cache
+
+        Args:
+            cle (Hashable): La clé du cache
+            fabrique (callable): Crée la valeur, sans argument
+
+        Returns:
+            La valeur en cache ou nouvellement créée
+        """
+        try:
+            valeur = self._entrees[cle]
+        except KeyError:
+            self.echecs += 1
+            valeur = self._entrees[cle] = fabrique()
+            self._evincer()
+            return valeur
+        self.succes += 1
+        self._entrees.move_to_end(cle)
+        return valeur
+
+    def redimensionner(self, taille: int) -> None:
+        """
+        Change la taille maximale, en évinçant le surplus
+        """
+        if taille < 1:
+            raise ValueError("La taille du cache doit être positive")
+        self.taille = taille
+        self._evincer()
+
+    def vider(self) -> None:
+        """
+        Vide le cache et remet les compteurs à zéro
+        """
+        self._entrees.clear()
+        self.succes = self.echecs = self.evictions = 0
+
+    def _evincer(self) -> None:
+        while len(self._entrees) > self.taille:
+            self._entrees.popitem(last=False)
+            self.evictions += 1
+
+
+def cache() -> CacheLRU:
+    """
+    Renvoie le cache du thread courant, créé au premier appel
+    """
+    try:
+        return _local.cache
+    except AttributeError:
+        with _verrou:
+            _purger()
+            _local.cache = CacheLRU(_taille)
+            _caches[threading.current_thread()] = _local.cache
+        return _local.cache
+
+
+def _purger() -> None:
+    """
+    Libère les caches des threads terminés en gardant leurs compteurs (à
+    appeler avec le verrou)
+    """
+    for thread in [t for t in _caches if not t.is_alive()]:
+        cache_thread = _caches.pop(thread)
+        _compteurs_termines.update(succes=cache_thread.succes,
+                                   echecs=cache_thread.echecs,
+                                   evictions=cache_thread.evictions)
+
+
+def contexte(algorithme: str, mode: str, sens: str, cle: bytes, fabrique):
+    """
+    Renvoie le contexte de chiffrement préparé pour cette clé
+
+    Args:
+        algorithme (str): "AES" ou "DES"
+        mode (str): Le mode de chiffrement
+        sens (str): "crypter", "decrypter" ou "" si le contexte sert aux deux
+        cle (bytes): La clé
+        fabrique (callable): Crée le contexte s'il n'est pas en cache
+
+    Returns:
+        Le contexte en cache ou nouvellement créé
+    """
+    return cache().obtenir((algorithme, mode, sens, bytes(cle)), fabrique)
+
+
+def configurer(taille: int) -> None:
+    """
+    Change la taille des caches de tous les threads
+
+    Args:
+        taille (int): Le nombre maximal de contextes par thread
+    """
+    global _taille
+    if taille < 1:
+        raise ValueError("La taille du cache doit être positive")
+    with _verrou:
+        _taille = taille
+        for cache_thread in list(_caches.values()):
+            cache_thread.redimensionner(taille)
+
+
+def statistiques() -> dict:
+    """
+    Renvoie les compteurs cumulés des caches de tous les threads
+
+    Returns:
+        dict: La taille maximale, le nombre d'entrées, de succès, d'échecs et
+        d'évictions
+    """
+    with _verrou:
+        _purger()
+        caches = list(_caches.values())
+        termines = dict(_compteurs_termines)
+    return {
+        "taille": _taille,
+        "entrees": sum(len(c) for c in caches),
+        **{compteur: termines.get(compteur, 0) +
+           sum(getattr(c, compteur) for c in caches)
+           for compteur in ("succes", "echecs", "evictions")},
+    }
+
+
+def vider() -> None:
+    """
+    Vide les caches de tous les threads et remet les compteurs à zéro
+    """
+    with _verrou:
+        _purger()
+        _compteurs_termines.clear()
+        for cache_thread in list(_caches.values()):
+            cache_thread.vider()
@@ -2,7 +2,6 @@
 Module contenant les constantes du deuxième défi
 """
 
-NOMBRE_CLE_POSSIBLE_SDES = 256
 NOMBRE_CLE_POSSIBLE_AES = 2**256
 NOMBRE_OCTETS_CLE = 32
 TEXTE_CRYPTER = 0
\ No newline at end of file
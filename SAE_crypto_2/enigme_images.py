@@ -1,15 +1,362 @@
-from PIL import Image
+"""
+Module pour la stéganographie sur les images
+
+Les pixels d'un BMP non compressé sont lus directement dans le fichier,
+projeté en mémoire à la position donnée par l'en-tête, sans décodage ; les
+autres images passent par PIL. Les bits cachés sont extraits d'un bloc avec
+NumPy, dans n'importe quels plans de bits, en parcourant l'image ligne par
+ligne ou colonne par colonne.
+
+L'insertion fait l'inverse : la charge est écrite dans les plans de bits
+choisis, directement dans une copie du fichier BMP projetée en mémoire.
+"""
+import os
+import shutil
+import struct
+from typing import NamedTuple
+
+import numpy as np
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+# l'image dont les bits de poids faible cachent la clé d'Alice et Bob
+IMAGE_CLE = os.path.join(DOSSIER, "rossignol2.bmp")
+TAILLE_CLE = 64
+ORDRES = ("lignes", "colonnes")
+
+
+class EnteteBMP(NamedTuple):
+    """
+    Ce qu'il faut de l'en-tête d'un BMP pour lire ses pixels
+    """
+    decalage: int
+    largeur: int
+    hauteur: int
+    bits_par_pixel: int
+    de_bas_en_haut: bool
+
+    @property
+    def octets_par_pixel(self) -> int:
+        return self.bits_par_pixel // 8
+
+    @property
+    def taille_ligne(self) -> int:
+        """
+        La taille d'une ligne dans le fichier, complétée à un multiple de 4
+        """
+        return (self.largeur * self.octets_par_pixel + 3) // 4 * 4
+
+
+def entete_bmp(chemin: str) -> EnteteBMP | None:
+    """
+    Lit l'en-tête d'un BMP dont les pixels peuvent être lus directement
+
+    Args:
+        chemin (str): Le fichier image
+
+    Returns:
+        EnteteBMP | None: L'en-tête, ou None si ce n'est pas un BMP non
+        compressé de 8, 24 ou 32 bits par pixel
+    """
+    with open(chemin, "rb") as fichier:
+        debut = fichier.read(34)
+    if len(debut) < 34 or debut[:2] != b"BM":
+        return None
+    decalage, = struct.unpack_from("<I", debut, 10)
+    largeur, hauteur, _, bits_par_pixel, compression = struct.unpack_from(
+        "<iiHHI", debut, 18)
+    if compression != 0 or bits_par_pixel not in (8, 24, 32) or largeur <= 0:
+        return None
+    return EnteteBMP(decalage, largeur, abs(hauteur), bits_par_pixel,
+                     hauteur > 0)
+
+
+def pixels_bmp(chemin: str, mode: str = "r",
+               entete: EnteteBMP | None = None) -> np.ndarray:
+    """
+    Projette en mémoire les pixels d'un BMP non compressé
+
+    Args:
+        chemin (str): Le fichier BMP
+        mode (str): "r" pour lire, "r+" pour modifier le fichier en place
+        entete (EnteteBMP | None): L'en-tête, s'il a déjà été lu
+
+    Returns:
+        np.ndarray: Une vue (hauteur, largeur) en 8 bits ou
+        (hauteur, largeur, 3) en RGB, la première ligne en haut, sans copie
+        du fichier
+    """
+    entete = entete or entete_bmp(chemin)
+    if entete is None:
+        raise ValueError(f"{chemin} n'est pas un BMP non compressé")
+    lignes = np.memmap(chemin, dtype=np.uint8, mode=mode,
+                       offset=entete.decalage,
+                       shape=(entete.hauteur, entete.taille_ligne))
+    pixels = lignes[:, :entete.largeur * entete.octets_par_pixel]
+    if entete.de_bas_en_haut:
+        pixels = pixels[::-1]
+    if entete.octets_par_pixel > 1:
+        # le BMP range les canaux en BGR(X), PIL en RGB : on renverse les
+        # trois canaux (vue à pas négatif) et on ignore le quatrième octet
+        pixels = pixels.reshape(entete.hauteur, entete.largeur,
+                                entete.octets_par_pixel)[:, :, 2::-1]
+    return pixels
+
+
+def pixels_image(chemin: str) -> np.ndarray:
+    """
+    Renvoie les pixels d'une image, projetés en mémoire pour un BMP non
+    compressé, décodés par PIL sinon
+
+    Args:
+        chemin (str): Le fichier image
+
+    Returns:
+        np.ndarray: Les pixels (hauteur, largeur[, canaux]), en uint8
+    """
+    entete = entete_bmp(chemin)
+    if entete is not None:
+        return pixels_bmp(chemin, entete=entete)
+    from PIL import Image
+
+    with Image.open(chemin) as image:
+        if image.mode not in ("L", "P", "RGB", "RGBA"):
+            image = image.convert("L" if len(image.getbands()) == 1 else
+                                  "RGBA" if "A" in image.mode else "RGB")
+        return np.asarray(image)
+
+
+def _plans(plan) -> np.ndarray:
+    """
+    Renvoie les plans de bits demandés (un entier ou une suite d'entiers)
+    """
+    plans = np.atleast_1d(np.asarray(plan, dtype=np.uint8))
+    if plans.ndim != 1 or not len(plans) or plans.max() > 7:
+        raise ValueError("Les plans de bits vont de 0 (poids faible) à 7")
+    return plans
+
+
+def echantillons(pixels: np.ndarray, nombre: int | None = None,
+                 ordre: str = "lignes") -> np.ndarray:
+    """
+    Met à plat les valeurs des pixels (tous canaux) dans l'ordre de lecture
+
+    Seules les lignes (ou colonnes) nécessaires aux `nombre` premières
+    valeurs sont lues.
+
+    Args:
+        pixels (np.ndarray): Les pixels (hauteur, largeur[, canaux])
+        nombre (int | None): Le nombre de valeurs voulues (toutes sinon)
+        ordre (str): "lignes" (de gauche à droite puis de haut en bas) ou
+            "colonnes" (de haut en bas puis de gauche à droite)
+
+    Returns:
+        np.ndarray: Les valeurs, à plat
+    """
+    if ordre not in ORDRES:
+        raise ValueError(f"Ordre de parcours inconnu : {ordre}")
+    if ordre == "colonnes":
+        pixels = pixels.swapaxes(0, 1)
+    if nombre is None:
+        return pixels.reshape(-1)
+    par_ligne = pixels[0].size if len(pixels) else 1
+    lignes = -(-nombre // par_ligne)
+    return pixels[:lignes].reshape(-1)[:nombre]
+
+
+def extrait_bits(pixels: np.ndarray, nombre_bits: int | None = None,
+                 plan=0, ordre: str = "lignes") -> np.ndarray:
+    """
+    Extrait les bits cachés dans les plans de bits des pixels
+
+    Pour chaque valeur de pixel, dans l'ordre de parcours, on lit les bits
+    des plans demandés, dans l'ordre où ils sont donnés.
+
+    Args:
+        pixels (np.ndarray): Les pixels (hauteur, largeur[, canaux])
+        nombre_bits (int | None): Le nombre de bits voulus (tous sinon)
+        plan (int | Sequence[int]): Le ou les plans de bits (0 = poids
+            faible)
+        ordre (str): "lignes" ou "colonnes"
+
+    Returns:
+        np.ndarray: Les bits (0 ou 1), en uint8
+    """
+    plans = _plans(plan)
+    nombre = None if nombre_bits is None else -(-nombre_bits // len(plans))
+    valeurs = echantillons(pixels, nombre, ordre)
+    bits = (valeurs[:, None] >> plans) & 1
+    return bits.reshape(-1)[:nombre_bits]
+
+
+def extrait_octets(image, nombre_octets: int | None = None, plan=0,
+                   ordre: str = "lignes") -> bytes:
+    """
+    Extrait des octets cachés dans une image, les bits de poids fort d'abord
+
+    Args:
+        image (str | np.ndarray): Le fichier image ou ses pixels
+        nombre_octets (int | None): Le nombre d'octets voulus (tous ceux que
+            l'image peut contenir sinon)
+        plan (int | Sequence[int]): Le ou les plans de bits
+        ordre (str): "lignes" ou "colonnes"
+
+    Returns:
+        bytes: Les octets extraits
+    """
+    pixels = pixels_image(image) if isinstance(image, str) else image
+    nombre_bits = None if nombre_octets is None else 8 * nombre_octets
+    bits = extrait_bits(pixels, nombre_bits, plan, ordre)
+    return np.packbits(bits[:len(bits) // 8 * 8]).tobytes()
+
+
+def capacite(pixels: np.ndarray, plan=0) -> int:
+    """
+    Renvoie le nombre d'octets que l'on peut cacher dans les pixels
+
+    Args:
+        pixels (np.ndarray): Les pixels (hauteur, largeur[, canaux])
+        plan (int | Sequence[int]): Le ou les plans de bits utilisés
+
+    Returns:
+        int: La capacité en octets
+    """
+    return pixels.size * len(_plans(plan)) // 8
+
+
+def insere_bits(pixels: np.ndarray, bits, plan=0,
+                ordre: str = "lignes") -> None:
+    """
+    Écrit des bits dans les plans de bits des pixels, en place
+
+    C'est l'inverse de `extrait_bits` : seules les lignes (ou colonnes)
+    nécessaires sont lues puis réécrites, et les bits non utilisés du dernier
+    pixel touché sont conservés.
+
+    Args:
+        pixels (np.ndarray): Les pixels, modifiables (par exemple la vue
+            renvoyée par `pixels_bmp(chemin, "r+")`)
+        bits (array-like): Les bits (0 ou 1) à écrire
+        plan (int | Sequence[int]): Le ou les plans de bits
+        ordre (str): "lignes" ou "colonnes"
+    """
+    plans = _plans(plan)
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    if ordre not in ORDRES:
+        raise ValueError(f"Ordre de parcours inconnu : {ordre}")
+    if len(bits) > pixels.size * len(plans):
+        raise ValueError(f"Charge trop grande : {len(bits)} bits pour une "
+                         f"capacité de {pixels.size * len(plans)}")
+    if not len(bits):
+        return
+    nombre = -(-len(bits) // len(plans))
+    vue = pixels.swapaxes(0, 1) if ordre == "colonnes" else pixels
+    par_ligne = vue[0].size
+    zone = vue[:-(-nombre // par_ligne)]
+    # vue si la zone est contiguë, copie des seules lignes touchées sinon
+    valeurs = zone.reshape(-1)
+    if len(bits) == nombre * len(plans):
+        champs = bits.reshape(nombre, len(plans))
+    else:
+        # dernier pixel incomplet : on garde ses bits non utilisés
+        champs = (valeurs[:nombre, None] >> plans) & 1
+        champs.reshape(-1)[:len(bits)] = bits
+    poids = (1 << plans.astype(np.uint16)).astype(np.uint8)
+    masque = np.uint8(np.bitwise_or.reduce(poids))
+    if len(plans) == 1:
+        nouveaux = champs[:, 0] << plans[0]
+    else:
+        nouveaux = champs @ poids
+    valeurs[:nombre] &= ~masque
+    valeurs[:nombre] |= nouveaux
+    if not np.shares_memory(valeurs, zone):
+        zone[...] = valeurs.reshape(zone.shape)
+
+
+def insere_octets(source: str, charge: bytes, destination: str | None = None,
+                  plan=0, ordre: str = "lignes") -> int:
+    """
+    Cache des octets dans une image, les bits de poids fort d'abord
+
+    Un BMP non compressé est copié tel quel puis modifié en place dans la
+    copie projetée en mémoire ; les autres images sont décodées par PIL et
+    réenregistrées au format de la destination (qui doit être sans perte).
+
+    Args:
+        source (str): L'image d'origine
+        charge (bytes): Les octets à cacher
+        destination (str | None): L'image à écrire (la source est modifiée
+            sur place si elle n'est pas donnée)
+        plan (int | Sequence[int]): Le ou les plans de bits
+        ordre (str): "lignes" ou "colonnes"
+
+    Returns:
+        int: Le nombre de bits écrits
+    """
+    destination = destination or source
+    bits = np.unpackbits(np.frombuffer(charge, dtype=np.uint8))
+    entete = entete_bmp(source)
+    if entete is not None:
+        echantillons_bmp = entete.hauteur * entete.largeur * min(
+            entete.octets_par_pixel, 3)
+        if echantillons_bmp * len(_plans(plan)) < len(bits):
+            raise ValueError(f"Charge trop grande : {len(charge)} octets pour "
+                             f"une capacité de "
+                             f"{echantillons_bmp * len(_plans(plan)) // 8}")
+        if os.path.abspath(destination) != os.path.abspath(source):
+            shutil.copyfile(source, destination)
+        pixels = pixels_bmp(destination, "r+", entete)
+        insere_bits(pixels, bits, plan, ordre)
+        pixels.flush()
+        return len(bits)
+    from PIL import Image
+
+    pixels = np.array(pixels_image(source))
+    insere_bits(pixels, bits, plan, ordre)
+    Image.fromarray(pixels).save(destination)
+    return len(bits)
+
 
 def compare_image(path_image):
-    image = Image.open(path_image)
-    res = ""
-    largeur, hauteur = image.size
-    for y in range(hauteur):
-        for x in range(largeur):
-            pixel = image.getpixel((x, y))
-            res += str(pixel % 2)
-            if len(res) == 64:
-                return res
-    return None
-
-print(compare_image("rossignol1.bmp"))
\ No newline at end of file
+    """
+    Lit les 64 bits de poids faible des premiers pixels de l'image
+
+    Args:
+        path_image (str): L'image
+
+    Returns:
+        str | None: Les 64 bits sous forme de texte de 0 et de 1, ou None si
+        l'image est trop petite
+    """
+    bits = extrait_bits(pixels_image(path_image), TAILLE_CLE)
+    if len(bits) < TAILLE_CLE:
+        return None
+    return "".join("01"[bit] for bit in bits)
+
+
+def retrouve_cle(path_image=IMAGE_CLE, cache: bool | None = None):
+    """
+    Retrouve la clé de 64 bits cachée dans les bits de poids faible des
+    premiers pixels de l'image
+
+    Args:
+        path_image (str): L'image qui contient la clé
+        cache (bool | None): Relit la clé dans le cache persistant si cette
+            image (au contenu près) a déjà été lue (par défaut si SDES_CACHE
+            est défini)
+
+    Returns:
+        str: Les 64 bits de la clé, sous forme de texte de 0 et de 1
+    """
+    from sdes import cache_actif
+
+    if cache_actif(cache):
+        from sdes import cache_resultats
+
+        return cache_resultats.cache().memoise(
+            lambda: compare_image(path_image), "retrouve_cle", TAILLE_CLE,
+            cache_resultats.empreinte_fichier(path_image))
+    return compare_image(path_image)
+
+
+if __name__ == "__main__":
+    print(compare_image("rossignol1.bmp"))
@@ -0,0 +1,84 @@
+"""
+Module pour le traitement par lots de nombreux messages dans un pool de threads
+
+Les messages sont regroupés en paquets : un paquet est traité par un seul
+thread, avec un seul objet de chiffrement, ce qui amortit la création des
+contextes et le coût de la file d'attente. Le nombre de paquets en cours est
+borné, si bien qu'un itérateur de messages est consommé au fil de l'eau sans
+être chargé en entier.
+"""
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+TAILLE_PAQUET = 256
+# paquets soumis en avance, par thread
+PAQUETS_PAR_THREAD = 2
+
+
+def paquets(messages, taille_paquet: int = TAILLE_PAQUET):
+    """
+    Découpe un itérable de messages en paquets
+
+    Args:
+        messages (Iterable): Les messages
+        taille_paquet (int): Le nombre de messages par paquet
+
+    Yields:
+        tuple[int, list]: L'indice du premier message du paquet et le paquet
+    """
+    iterateur = iter(messages)
+    indice = 0
+    while paquet := list(islice(iterateur, taille_paquet)):
+        yield indice, paquet
+        indice += len(paquet)
+
+
+def traite_lot(traite_paquet, messages, nombre_threads: int | None = None,
+               ordonne: bool = True, taille_paquet: int = TAILLE_PAQUET):
+    """
+    Applique `traite_paquet` à tous les messages, paquet par paquet, dans un
+    pool de threads
+
+    Args:
+        traite_paquet (callable): Fonction qui prend une liste de messages et
+            renvoie la liste des résultats, dans le même ordre
+        messages (Iterable): Les messages (liste ou itérateur)
+        nombre_threads (int | None): La taille du pool (nombre de cœurs par
+            défaut)
+        ordonne (bool): Vrai pour produire les résultats dans l'ordre des
+            messages, faux pour les produire dès qu'un paquet est prêt
+        taille_paquet (int): Le nombre de messages par paquet
+
+    Yields:
+        Le résultat de chaque message si `ordonne`, sinon des couples
+        (indice du message, résultat)
+    """
+    nombre_threads = nombre_threads or os.cpu_count() or 1
+    maximum_en_cours = PAQUETS_PAR_THREAD * nombre_threads
+    executeur = ThreadPoolExecutor(nombre_threads)
+    try:
+        if ordonne:
+            en_cours = deque()
+            for indice, paquet in paquets(messages, taille_paquet):
+                en_cours.append(executeur.submit(traite_paquet, paquet))
+                if len(en_cours) >= maximum_en_cours:
+                    yield from en_cours.popleft().result()
+            while en_cours:
+                yield from en_cours.popleft().result()
+        else:
+            en_cours = {}
+            for indice, paquet in paquets(messages, taille_paquet):
+                en_cours[executeur.submit(traite_paquet, paquet)] = indice
+                if len(en_cours) >= maximum_en_cours:
+                    termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                    for futur in termines:
+                        yield from enumerate(futur.result(),
+                                             en_cours.pop(futur))
+            while en_cours:
+                termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for futur in termines:
+                    yield from enumerate(futur.result(), en_cours.pop(futur))
+    finally:
+        executeur.shutdown(cancel_futures=True)
@@ -0,0 +1,582 @@
+"""
+Module de lecture rapide des traces pcap et pcapng, sans dissection scapy
+
+Le fichier est projeté en mémoire (mmap) et seuls les en-têtes nécessaires
+sont décodés : lien (Ethernet avec VLAN, Linux SLL/SLL2, IP brut, loopback
+BSD), IPv4 ou IPv6, puis UDP, pour filtrer sur le port de destination. Les
+charges utiles sont rendues sous forme de `memoryview` sur le fichier, sans
+copie ; elles restent valables tant qu'on les garde, et `bytes()` en fait une
+copie indépendante. Les types de lien inconnus sont confiés à scapy.
+
+    python pcap_brut.py -n 200000
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+PORT = 9999
+INTERVALLE_SUIVI = 0.2
+# le point de reprise est enregistré tous les N enregistrements lus ou toutes
+# les T secondes, même pendant le rattrapage d'une longue trace
+ENREGISTREMENTS_PAR_POINT = 10000
+DELAI_POINT = 1.0
+
+# formats de fichier
+MAGIQUES_PCAP = {
+    b"\xd4\xc3\xb2\xa1": "<", b"\xa1\xb2\xc3\xd4": ">",  # microsecondes
+    b"\x4d\x3c\xb2\xa1": "<", b"\xa1\xb2\x3c\x4d": ">",  # nanosecondes
+}
+TAILLE_ENTETE_PCAP = 24
+TAILLE_ENREGISTREMENT_PCAP = 16
+BLOC_SECTION = 0x0A0D0D0A
+BLOC_INTERFACE = 0x00000001
+BLOC_PAQUET_OBSOLETE = 0x00000002
+BLOC_PAQUET_SIMPLE = 0x00000003
+BLOC_PAQUET_ETENDU = 0x00000006
+MAGIQUE_ORDRE = 0x1A2B3C4D
+
+# types de lien
+LIEN_NULL = 0
+LIEN_ETHERNET = 1
+LIEN_RAW = 101
+LIEN_LOOP = 108
+LIEN_SLL = 113
+LIEN_IPV4 = 228
+LIEN_IPV6 = 229
+LIEN_SLL2 = 276
+LIENS_RAW = (LIEN_RAW, 12, 14)
+
+# en-têtes réseau
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPES_VLAN = (0x8100, 0x88A8, 0x9100)
+PROTOCOLE_UDP = 17
+# saut par saut, routage, options de destination (les fragments sont ignorés)
+EXTENSIONS_IPV6 = (0, 43, 60)
+FAMILLES_IPV6 = (10, 24, 28, 30)
+
+_u16 = struct.Struct("!H").unpack_from
+
+
+class LecteurPcap:
+    """
+    Lecteur d'une trace pcap ou pcapng projetée en mémoire
+
+    S'utilise comme gestionnaire de contexte :
+
+        with LecteurPcap("trace.cap") as lecteur:
+            for charge, fin in lecteur.charges_udp(9999):
+                ...
+    """
+
+    def __init__(self, chemin: str, debut: int = 0,
+                 ordre: str | None = None, liens: list[int] | None = None):
+        """
+        Ouvre la trace
+
+        Args:
+            chemin (str): Le fichier pcap ou pcapng
+            debut (int): La position où reprendre la lecture (la fin d'un
+                enregistrement déjà lu), 0 pour lire depuis le début
+            ordre (str | None): En pcapng, l'ordre des octets de la section
+                en cours à la position de reprise, s'il est connu
+            liens (list[int] | None): En pcapng, les types de lien des
+                interfaces déjà décrites avant la position de reprise ; sans
+                eux, les blocs précédents sont relus
+        """
+        self.chemin = chemin
+        self.debut = debut
+        self._fichier = open(chemin, "rb")
+        taille = os.fstat(self._fichier.fileno()).st_size
+        self._carte = mmap.mmap(self._fichier.fileno(), 0,
+                                access=mmap.ACCESS_READ) if taille else b""
+        self.donnees = memoryview(self._carte)
+        self.format, self.ordre, self.liens = self._lire_entete()
+        if self.format == "pcapng" and debut and liens:
+            self.ordre, self.liens = ordre or self.ordre, list(liens)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.fermer()
+
+    def fermer(self) -> None:
+        """
+        Ferme la trace ; si des charges utiles sont encore référencées, la
+        projection est libérée quand elles disparaissent
+        """
+        self.donnees.release()
+        if isinstance(self._carte, mmap.mmap):
+            try:
+                self._carte.close()
+            except BufferError:
+                pass
+        self._fichier.close()
+
+    def _lire_entete(self):
+        """
+        Reconnaît le format et lit l'en-tête du fichier
+
+        Returns:
+            tuple: Le format ("pcap" ou "pcapng"), l'ordre des octets et
+            les types de lien (un seul en pcap, un par interface en pcapng)
+        """
+        debut = bytes(self.donnees[:4])
+        if debut in MAGIQUES_PCAP:
+            if len(self.donnees) < TAILLE_ENTETE_PCAP:
+                raise ValueError("En-tête pcap tronqué")
+            ordre = MAGIQUES_PCAP[debut]
+            lien, = struct.unpack_from(ordre + "I", self.donnees, 20)
+            self.debut = max(self.debut, TAILLE_ENTETE_PCAP)
+            return "pcap", ordre, [lien & 0x0FFFFFFF]
+        if len(debut) == 4 and struct.unpack("<I", debut)[0] == BLOC_SECTION:
+            # l'ordre est lu dans chaque bloc de section
+            return "pcapng", "<", []
+        if not debut:
+            raise ValueError("Trace vide")
+        raise ValueError("Format de trace inconnu (ni pcap, ni pcapng)")
+
+    def enregistrements(self):
+        """
+        Parcourt les paquets de la trace à partir de `debut`
+
+        Un enregistrement incomplet en fin de fichier (trace en cours
+        d'écriture) arrête le parcours sans erreur.
+
+        Yields:
+            tuple[int, memoryview, int]: Le type de lien, les octets capturés
+            et la position de la fin de l'enregistrement
+        """
+        if self.format == "pcap":
+            yield from self._enregistrements_pcap()
+        else:
+            yield from self._enregistrements_pcapng()
+
+    def _enregistrements_pcap(self):
+        donnees = self.donnees
+        taille = len(donnees)
+        entete = struct.Struct(self.ordre + "8xI4x").unpack_from
+        lien = self.liens[0]
+        position = self.debut
+        while position + TAILLE_ENREGISTREMENT_PCAP <= taille:
+            longueur, = entete(donnees, position)
+            debut = position + TAILLE_ENREGISTREMENT_PCAP
+            fin = debut + longueur
+            if fin > taille:
+                return
+            yield lien, donnees[debut:fin], fin
+            position = fin
+
+    def _enregistrements_pcapng(self, position: int | None = None,
+                                limite: int | None = None):
+        donnees = self.donnees
+        taille = len(donnees) if limite is None else min(len(donnees), limite)
+        if position is None:
+            position = self.debut
+            if position and not self.liens:
+                # reprise : il faut relire les interfaces déjà décrites
+                for _ in self._enregistrements_pcapng(0, position):
+                    pass
+        ordre = self.ordre
+        while position + 12 <= taille:
+            type_bloc, = struct.unpack_from(ordre + "I", donnees, position)
+            if type_bloc == BLOC_SECTION:
+                magique, = struct.unpack_from("<I", donnees, position + 8)
+                ordre = self.ordre = "<" if magique == MAGIQUE_ORDRE else ">"
+                self.liens = []
+            longueur, = struct.unpack_from(ordre + "I", donnees, position + 4)
+            if longueur < 12 or longueur % 4:
+                raise ValueError(f"Bloc pcapng invalide à la position "
+                                 f"{position}")
+            fin = position + longueur
+            if fin > taille:
+                return
+            corps = position + 8
+            if type_bloc == BLOC_INTERFACE:
+                lien, = struct.unpack_from(ordre + "H", donnees, corps)
+                self.liens.append(lien)
+            elif type_bloc == BLOC_PAQUET_ETENDU:
+                interface, _, _, capture = struct.unpack_from(
+                    ordre + "IIII", donnees, corps)
+                yield (self.liens[interface],
+                       donnees[corps + 20:corps + 20 + capture], fin)
+            elif type_bloc == BLOC_PAQUET_SIMPLE:
+                origine, = struct.unpack_from(ordre + "I", donnees, corps)
+                capture = min(origine, longueur - 16)
+                yield (self.liens[0],
+                       donnees[corps + 4:corps + 4 + capture], fin)
+            elif type_bloc == BLOC_PAQUET_OBSOLETE:
+                interface, = struct.unpack_from(ordre + "H", donnees, corps)
+                capture, = struct.unpack_from(ordre + "I", donnees, corps + 12)
+                yield (self.liens[interface],
+                       donnees[corps + 20:corps + 20 + capture], fin)
+            position = fin
+
+    def charges_udp(self, port: int = PORT):
+        """
+        Parcourt les charges utiles UDP envoyées au port donné
+
+        Args:
+            port (int): Le port UDP de destination
+
+        Yields:
+            tuple[memoryview, int]: La charge utile (sans copie) et la
+            position de la fin de son enregistrement
+        """
+        for lien, octets, fin in self.enregistrements():
+            charge = charge_udp(lien, octets, port)
+            if charge is not None:
+                yield charge, fin
+
+
+def charge_udp(lien: int, octets: memoryview, port: int = PORT):
+    """
+    Décode un paquet capturé jusqu'à UDP et renvoie sa charge utile s'il est
+    envoyé au port donné
+
+    Args:
+        lien (int): Le type de lien de l'interface de capture
+        octets (memoryview): Les octets capturés
+        port (int): Le port UDP de destination
+
+    Returns:
+        memoryview | None: La charge utile, ou None si le paquet ne convient
+        pas
+    """
+    taille = len(octets)
+    if lien == LIEN_ETHERNET:
+        if taille < 14:
+            return None
+        decalage = 12
+        type_reseau = _u16(octets, decalage)[0]
+        while type_reseau in ETHERTYPES_VLAN and decalage + 6 <= taille:
+            decalage += 4
+            type_reseau = _u16(octets, decalage)[0]
+        decalage += 2
+    elif lien == LIEN_SLL:
+        if taille < 16:
+            return None
+        type_reseau, decalage = _u16(octets, 14)[0], 16
+    elif lien == LIEN_SLL2:
+        if taille < 20:
+            return None
+        type_reseau, decalage = _u16(octets, 0)[0], 20
+    elif lien in LIENS_RAW or lien in (LIEN_IPV4, LIEN_IPV6):
+        if not taille:
+            return None
+        version = octets[0] >> 4
+        type_reseau = ETHERTYPE_IPV4 if version == 4 else \
+            ETHERTYPE_IPV6 if version == 6 else None
+        decalage = 0
+    elif lien in (LIEN_NULL, LIEN_LOOP):
+        if taille < 4:
+            return None
+        famille = octets[0] | octets[3] if lien == LIEN_NULL else octets[3]
+        type_reseau = ETHERTYPE_IPV4 if famille == 2 else \
+            ETHERTYPE_IPV6 if famille in FAMILLES_IPV6 else None
+        decalage = 4
+    else:
+        return _charge_udp_scapy(lien, octets, port)
+
+    if type_reseau == ETHERTYPE_IPV4:
+        if taille < decalage + 20:
+            return None
+        longueur_entete = (octets[decalage] & 0x0F) * 4
+        fragment = _u16(octets, decalage + 6)[0]
+        # fragment suivant, ou premier fragment d'un datagramme incomplet
+        if octets[decalage + 9] != PROTOCOLE_UDP or fragment & 0x3FFF:
+            return None
+        fin_ip = min(taille, decalage + _u16(octets, decalage + 2)[0])
+        decalage += longueur_entete
+    elif type_reseau == ETHERTYPE_IPV6:
+        if taille < decalage + 40:
+            return None
+        suivant = octets[decalage + 6]
+        fin_ip = min(taille, decalage + 40 + _u16(octets, decalage + 4)[0])
+        decalage += 40
+        while suivant in EXTENSIONS_IPV6 and decalage + 8 <= fin_ip:
+            suivant = octets[decalage]
+            decalage += (octets[decalage + 1] + 1) * 8
+        if suivant != PROTOCOLE_UDP:
+            return None
+    else:
+        return None
+
+    if fin_ip < decalage + 8 or _u16(octets, decalage + 2)[0] != port:
+        return None
+    fin_udp = min(fin_ip, decalage + _u16(octets, decalage + 4)[0])
+    return octets[decalage + 8:fin_udp]
+
+
+def _charge_udp_scapy(lien: int, octets: memoryview, port: int):
+    """
+    Dissèque avec scapy un paquet dont le type de lien n'est pas décodé ici
+    (la charge utile est alors une copie)
+    """
+    from scapy.all import UDP, conf
+
+    classe = conf.l2types.get(lien)
+    if classe is None:
+        return None
+    paquet = classe(bytes(octets))
+    if paquet.haslayer(UDP) and paquet[UDP].dport == port:
+        return memoryview(bytes(paquet[UDP].payload))
+    return None
+
+
+def charges_udp(chemin: str, port: int = PORT):
+    """
+    Parcourt les charges utiles UDP envoyées au port donné dans une trace
+
+    Args:
+        chemin (str): Le fichier pcap ou pcapng
+        port (int): Le port UDP de destination
+
+    Yields:
+        memoryview: Les charges utiles, sans copie
+    """
+    with LecteurPcap(chemin) as lecteur:
+        for charge, _ in lecteur.charges_udp(port):
+            yield charge
+
+
+def charge_point_de_reprise(chemin: str) -> dict | None:
+    """
+    Lit un point de reprise enregistré par `suit_charges`
+
+    Args:
+        chemin (str): Le fichier JSON du point de reprise
+
+    Returns:
+        dict | None: Le point de reprise, ou None s'il n'existe pas
+    """
+    try:
+        with open(chemin, encoding="utf-8") as fichier:
+            return json.load(fichier)
+    except FileNotFoundError:
+        return None
+
+
+def sauvegarde_point_de_reprise(chemin: str, point: dict) -> None:
+    """
+    Enregistre un point de reprise en JSON, de façon atomique
+    """
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, "w", encoding="utf-8") as fichier:
+        json.dump(point, fichier)
+    os.replace(temporaire, chemin)
+
+
+def suit_charges(chemin: str, port: int = PORT,
+                 point_de_reprise: str | None = None,
+                 intervalle: float = INTERVALLE_SUIVI, arret=None,
+                 enregistrements_par_point: int = ENREGISTREMENTS_PAR_POINT,
+                 delai_point: float = DELAI_POINT):
+    """
+    Suit une trace en cours d'écriture (tcpdump -w) et produit les charges
+    utiles UDP au fur et à mesure qu'elles y sont ajoutées
+
+    La position atteinte est enregistrée dans `point_de_reprise` tous les
+    `enregistrements_par_point` enregistrements ou toutes les `delai_point`
+    secondes, à la fin de chaque lecture et quand le générateur est fermé :
+    une relance reprend là où la précédente s'était arrêtée, même après un
+    arrêt brutal pendant le rattrapage d'une longue trace. Une charge compte
+    comme lue dès qu'elle est produite : après une fermeture du générateur,
+    la relance reprend à la suivante ; seul un arrêt brutal peut faire
+    produire à nouveau les charges lues depuis le dernier enregistrement.
+    Si la trace rétrécit (fichier recréé), la lecture repart du début.
+
+    Args:
+        chemin (str): La trace, qui peut ne pas encore exister
+        port (int): Le port UDP de destination
+        point_de_reprise (str | None): Le fichier JSON du point de reprise
+        intervalle (float): L'attente (s) entre deux lectures quand la trace
+            ne grandit pas
+        arret (threading.Event | None): Arrête le suivi quand il est levé ;
+            sans lui, le suivi ne s'arrête que si on ferme le générateur
+        enregistrements_par_point (int): Le nombre d'enregistrements lus
+            entre deux enregistrements du point de reprise
+        delai_point (float): Le délai maximal (s) entre deux enregistrements
+            du point de reprise pendant une lecture
+
+    Yields:
+        memoryview: Les charges utiles, dans l'ordre de la trace
+    """
+    trace = os.path.abspath(chemin)
+    point = None
+    if point_de_reprise is not None:
+        point = charge_point_de_reprise(point_de_reprise)
+        if point is not None and point.get("trace") != trace:
+            point = None
+    if point is None:
+        point = {"trace": trace, "position": 0, "ordre": None, "liens": None,
+                 "charges": 0}
+    enregistre = dict(point)
+    taille_vue = 0
+    lus = 0
+    dernier_point = time.monotonic()
+
+    def enregistrer():
+        nonlocal lus, dernier_point
+        lus, dernier_point = 0, time.monotonic()
+        if point_de_reprise is not None and point != enregistre:
+            sauvegarde_point_de_reprise(point_de_reprise, point)
+            enregistre.update(point)
+
+    try:
+        while arret is None or not arret.is_set():
+            try:
+                taille = os.path.getsize(chemin)
+            except FileNotFoundError:
+                taille = 0
+            if taille < point["position"]:
+                point.update(position=0, ordre=None, liens=None)
+                taille_vue = 0
+            if taille > taille_vue and taille >= TAILLE_ENTETE_PCAP:
+                taille_vue = taille
+                with LecteurPcap(chemin, point["position"], point["ordre"],
+                                 point["liens"]) as lecteur:
+                    for lien, octets, fin in lecteur.enregistrements():
+                        charge = charge_udp(lien, octets, port)
+                        # le point avance avant de produire la charge : si
+                        # le générateur est fermé pendant le yield, la charge
+                        # déjà rendue n'est pas reproduite à la relance
+                        point["position"] = fin
+                        point["ordre"] = lecteur.ordre
+                        point["liens"] = lecteur.liens
+                        lus += 1
+                        if charge is not None:
+                            point["charges"] += 1
+                            yield charge
+                        if lus >= enregistrements_par_point or \
+                                time.monotonic() - dernier_point >= delai_point:
+                            enregistrer()
+                enregistrer()
+                continue
+            taille_vue = min(taille_vue, taille)
+            if arret is None:
+                time.sleep(intervalle)
+            else:
+                arret.wait(intervalle)
+    finally:
+        enregistrer()
+
+
+def ecrit_trace_synthetique(chemin: str, nombre: int, port: int = PORT,
+                            format: str = "pcap",
+                            taille_charge: int = 64) -> int:
+    """
+    Écrit une trace de test : un tiers de paquets UDP vers `port` (IPv4,
+    IPv4 avec VLAN, IPv6 en alternance), les autres vers un autre port
+
+    Args:
+        chemin (str): Le fichier à écrire
+        nombre (int): Le nombre de paquets
+        port (int): Le port UDP des paquets à retrouver
+        format (str): "pcap" ou "pcapng"
+        taille_charge (int): La taille des charges utiles
+
+    Returns:
+        int: Le nombre de paquets envoyés au port
+    """
+    ethernet = bytes(12)
+    trouves = 0
+    with open(chemin, "wb") as fichier:
+        if format == "pcap":
+            fichier.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0,
+                                      65535, LIEN_ETHERNET))
+        else:
+            fichier.write(struct.pack("<IIIHHqI", BLOC_SECTION, 28,
+                                      MAGIQUE_ORDRE, 1, 0, -1, 28))
+            fichier.write(struct.pack("<IIHHII", BLOC_INTERFACE, 20,
+                                      LIEN_ETHERNET, 0, 65535, 20))
+        for numero in range(nombre):
+            destination = port if numero % 3 == 0 else port + 1
+            trouves += destination == port
+            charge = numero.to_bytes(8, "big") * (taille_charge // 8)
+            udp = struct.pack("!HHHH", 12345, destination, 8 + len(charge),
+                              0) + charge
+            if numero % 2:
+                paquet = ethernet + struct.pack("!H", ETHERTYPE_IPV6) + \
+                    struct.pack("!IHBB", 6 << 28, len(udp), PROTOCOLE_UDP,
+                                64) + bytes(32) + udp
+            else:
+                vlan = struct.pack("!HH", 0x8100, 7) if numero % 4 else b""
+                paquet = ethernet + vlan + struct.pack("!H", ETHERTYPE_IPV4) \
+                    + struct.pack("!BBHHHBBH", 0x45, 0, 20 + len(udp), 0, 0,
+                                  64, PROTOCOLE_UDP, 0) + bytes(8) + udp
+            if format == "pcap":
+                fichier.write(struct.pack("<IIII", numero, 0, len(paquet),
+                                          len(paquet)) + paquet)
+            else:
+                bourrage = -len(paquet) % 4
+                longueur = 32 + len(paquet) + bourrage
+                fichier.write(struct.pack("<IIIIIII", BLOC_PAQUET_ETENDU,
+                                          longueur, 0, 0, numero, len(paquet),
+                                          len(paquet)) + paquet +
+                              bytes(bourrage) + struct.pack("<I", longueur))
+    return trouves
+
+
+def compare_rdpcap(chemin: str, port: int = PORT) -> dict:
+    """
+    Compare le temps de filtrage d'une trace avec ce module et avec
+    `scapy.rdpcap`
+
+    Args:
+        chemin (str): La trace
+        port (int): Le port UDP filtré
+
+    Returns:
+        dict: Le nombre de charges trouvées et les durées (s) des deux
+        méthodes
+    """
+    from scapy.all import UDP, rdpcap
+
+    debut = time.perf_counter()
+    brutes = [bytes(charge) for charge in charges_udp(chemin, port)]
+    duree_brute = time.perf_counter() - debut
+    debut = time.perf_counter()
+    scapy = [bytes(paquet[UDP].payload) for paquet in rdpcap(chemin)
+             if paquet.haslayer(UDP) and paquet[UDP].dport == port]
+    duree_scapy = time.perf_counter() - debut
+    if brutes != scapy:
+        raise RuntimeError("Les deux lecteurs ne trouvent pas les mêmes "
+                           "charges utiles")
+    return {"charges": len(brutes), "brut_s": duree_brute,
+            "rdpcap_s": duree_scapy, "acceleration": duree_scapy / duree_brute}
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Point d'entrée : compare les deux lecteurs sur des traces synthétiques
+    """
+    parseur = argparse.ArgumentParser(
+        description="Lecteur pcap brut comparé à scapy.rdpcap")
+    parseur.add_argument("-n", "--nombre", type=int, default=100_000,
+                         help="nombre de paquets de la trace synthétique")
+    parseur.add_argument("trace", nargs="?",
+                         help="trace existante (sinon, trace synthétique)")
+    options = parseur.parse_args(arguments)
+    resultats = {}
+    if options.trace:
+        resultats[options.trace] = compare_rdpcap(options.trace)
+    else:
+        for format in ("pcap", "pcapng"):
+            with tempfile.TemporaryDirectory() as dossier:
+                chemin = os.path.join(dossier, f"synthetique.{format}")
+                ecrit_trace_synthetique(chemin, options.nombre, format=format)
+                resultats[format] = compare_rdpcap(chemin)
+    json.dump(resultats, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -179,28 +179,58 @@ def decryptage_mot(texte_chiffre, cle1, cle2):
         liste.append(decryptage2SDES(chiffre,cle1,cle2))
     return liste
 
-def cassage2SDESbrutal(message_crypte, message_clair):
-    cle1 = creation_cles(10)
-    cle2 = creation_cles(10)
-    for premiere_cle in cle1:
-        for deuxieme_cle in cle2:
-            for i in range(len(message_crypte)):
-                if decryptage2SDES(message_crypte[i], premiere_cle, deuxieme_cle) != message_clair[i]:
-                    break
-                else:
-                    if i == len(message_crypte) - 1:
-                        return (premiere_cle, deuxieme_cle)
-    return None
+class _SansMesures:
+    """Instrumentation qui ne mesure rien, pour ne pas dépendre du paquet sdes"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+    def etape(self, nom):
+        return self
+
+    def prevoit(self, total):
+        pass
+
+    def avance(self, nombre=1):
+        pass
+
+def _mesures(instrumentation, nom):
+    """Le paquet sdes n'est importé que si une instrumentation est donnée"""
+    if instrumentation is None:
+        return _SansMesures()
+    from sdes.instrumentation import instrumente
+    return instrumente(instrumentation, nom)
+
+def cassage2SDESbrutal(message_crypte, message_clair, instrumentation=None):
+    with _mesures(instrumentation, "cassage2SDESbrutal") as mesures:
+        with mesures.etape("cles"):
+            cle1 = creation_cles(10)
+            cle2 = creation_cles(10)
+        mesures.prevoit(len(cle1) * len(cle2))
+        with mesures.etape("recherche"):
+            for premiere_cle in cle1:
+                for deuxieme_cle in cle2:
+                    for i in range(len(message_crypte)):
+                        if decryptage2SDES(message_crypte[i], premiere_cle, deuxieme_cle) != message_clair[i]:
+                            break
+                        else:
+                            if i == len(message_crypte) - 1:
+                                mesures.avance(deuxieme_cle + 1)
+                                return (premiere_cle, deuxieme_cle)
+                mesures.avance(len(cle2))
+        return None
 
 '''fonctionne pas :'''
 
 
 '''fonctionne : '''
-
-mottest = "mangez"
-print(int_from_bytes(mottest))
-messagecrypte = cryptage_mot(mottest,0b1100001110, 0b10001010)
-print(messagecrypte)
-messagedecrypte = decryptage_mot(messagecrypte,0b1100001110, 0b10001010)
-print(messagedecrypte)
-print(cassage2SDESbrutal(messagecrypte,messagedecrypte))
+if __name__ == "__main__":
+    mottest = "mangez"
+    print(int_from_bytes(mottest))
+    messagecrypte = cryptage_mot(mottest,0b1100001110, 0b10001010)
+    print(messagecrypte)
+    messagedecrypte = decryptage_mot(messagecrypte,0b1100001110, 0b10001010)
+    print(messagedecrypte)
+    print(cassage2SDESbrutal(messagecrypte,messagedecrypte))
@@ -0,0 +1,278 @@
+"""
+Paquet pour le SDES et le cassage du double SDES
+
+L'import du paquet ne fait aucun calcul : les tables sont chargées au premier
+cryptage, et NumPy, le cache et l'instrumentation ne sont importés que par
+les attaques qui en ont besoin.
+La ligne de commande est `python -m sdes`.
+"""
+import os
+import time
+
+from .filtrage_sdes import index_inverse, paires_candidates
+from .flux_sdes import crypte_octets, decrypte_octets
+from .tables_sdes import NOMBRE_CLES, tables
+
+
+def cache_actif(demande: bool | None) -> bool:
+    """
+    Dit si le cache persistant doit servir : `demande` s'il est donné, sinon
+    vrai si SDES_CACHE est défini
+
+    Le module `cache_resultats` (et SQLite) n'est importé que si c'est le cas.
+    """
+    return bool(os.environ.get("SDES_CACHE")) if demande is None else demande
+
+
+def crypte_double_sdes(texte: str, cle1: int, cle2: int) -> str:
+    """
+    Fonction qui fait un double SDES sur le texte donné avec les clés données
+
+    Args:
+        texte (str): Le texte à crypter de n'importe quelle longueur
+        cle1 (int | SousCles): La première clé, éventuellement déjà planifiée
+        cle2 (int | SousCles): La deuxième clé, éventuellement déjà planifiée
+
+    Returns:
+        str: Le texte crypté
+    """
+    return crypte_octets(texte.encode("latin-1"), cle1,
+                         cle2).decode("latin-1")
+
+
+def decrypte_double_sdes(texte: str, cle1: int, cle2: int) -> str:
+    """
+    Fonction qui fait un double SDES sur le texte donné avec les clés données
+
+    Args:
+        texte (str): Le texte à crypter de n'importe quelle longueur
+        cle1 (int | SousCles): La première clé, éventuellement déjà planifiée
+        cle2 (int | SousCles): La deuxième clé, éventuellement déjà planifiée
+
+    Returns:
+        str: Le texte crypté
+    """
+    return decrypte_octets(texte.encode("latin-1"), cle1,
+                           cle2).decode("latin-1")
+
+
+def cassage_brutal(message_clair: str,
+                   message_chiffre: str,
+                   moteur: str = "filtrage",
+                   cache: bool | None = None,
+                   instrumentation=None) -> tuple[int, int, int, float] | None:
+    """
+    Fonction qui casse le cryptage double SDES en testant toutes les clés possibles
+
+    Args:
+        message_clair (str): Le message clair
+        message_chiffre (str): Le message chiffré
+        moteur (str): "filtrage" pour écarter les paires dès le premier octet,
+            "tables" pour crypter tout le message à chaque paire, "bitslice" pour
+            tester 64 clés par mot machine avec NumPy, "parallele" pour
+            répartir les clés sur un processus par cœur
+        cache (bool | None): Relit le résultat d'un cassage déjà fait dans le
+            cache persistant (par défaut si SDES_CACHE est défini)
+        instrumentation (Instrumentation | None): Reçoit les temps des
+            étapes et la progression (voir `instrumentation`)
+
+    Returns:
+        tuple: La clé 1 et la clé 2, le nombre de tentatives et le temps de calcul
+    """
+    clair = message_clair.encode("latin-1")
+    chiffre = message_chiffre.encode("latin-1")
+    if cache_actif(cache):
+        from . import cache_resultats
+
+        return cache_resultats.cache().memoise(
+            lambda: cassage_brutal(message_clair, message_chiffre, moteur,
+                                   cache=False,
+                                   instrumentation=instrumentation),
+            "cassage_brutal", moteur, clair, chiffre, transformation=tuple)
+    from .instrumentation import instrumente
+
+    with instrumente(instrumentation, "cassage_brutal") as mesures:
+        mesures.prevoit(NOMBRE_CLES * NOMBRE_CLES)
+        if moteur == "bitslice":
+            from . import bitslice_sdes
+            with mesures.etape("recherche"):
+                return bitslice_sdes.cassage_brutal(clair, chiffre,
+                                                    mesures.atteint)
+        if moteur == "parallele":
+            from . import parallele_sdes
+            with mesures.etape("recherche"):
+                return parallele_sdes.cassage_brutal_parallele(
+                    clair, chiffre, progression=mesures.atteint)
+        if moteur == "filtrage" and clair and len(clair) == len(chiffre):
+            with mesures.etape("tables"):
+                index_inverse()
+            with mesures.etape("recherche"):
+                debut = time.time()
+                for cle1, cle2 in paires_candidates(clair, chiffre,
+                                                    mesures.atteint):
+                    temps = time.time() - debut
+                    temps = round(temps, 3)
+                    nombre_tentatives = cle1 * NOMBRE_CLES + cle2 + 1
+                    mesures.atteint(nombre_tentatives)
+                    return (cle1, cle2, nombre_tentatives, temps)
+            return None
+        with mesures.etape("tables"):
+            table = tables()
+            lignes = [
+                table.ligne_chiffrement(cle)
+                for cle in range(NOMBRE_CLES)
+            ]
+        with mesures.etape("recherche"):
+            nombre_tentatives = 0
+            debut = time.time()
+            for cle1 in range(NOMBRE_CLES):
+                milieu = clair.translate(lignes[cle1])
+                for cle2 in range(NOMBRE_CLES):
+                    nombre_tentatives += 1
+                    if milieu.translate(lignes[cle2]) == chiffre:
+                        temps = time.time() - debut
+                        temps = round(temps, 3)
+                        mesures.avance(cle2 + 1)
+                        return (cle1, cle2, nombre_tentatives, temps)
+                mesures.avance(NOMBRE_CLES)
+        return None
+
+
+def cassage_astucieux(
+        message_clair: str,
+        message_chiffre: str,
+        moteur: str = "tables",
+        cache: bool | None = None,
+        instrumentation=None) -> tuple[int, int, int, float] | None:
+    """
+    Fonction qui casse le cryptage double SDES en utilisant
+    les propriétés de la fonction de cryptage
+
+    Args:
+        message_clair (str): Le message clair
+        message_chiffre (str): Le message chiffré
+        moteur (str): "tables" pour le dictionnaire de codes, "bitslice" pour
+            calculer les états intermédiaires 64 clés à la fois avec NumPy
+        cache (bool | None): Relit le résultat d'un cassage déjà fait dans le
+            cache persistant (par défaut si SDES_CACHE est défini)
+        instrumentation (Instrumentation | None): Reçoit les temps des
+            étapes et la progression (voir `instrumentation`)
+
+    Returns:
+        tuple: La clé 1 et la clé 2, le nombre de tentatives et le temps de calcul
+    """
+    clair = message_clair.encode("latin-1")
+    chiffre = message_chiffre.encode("latin-1")
+    if cache_actif(cache):
+        from . import cache_resultats
+
+        return cache_resultats.cache().memoise(
+            lambda: cassage_astucieux(message_clair, message_chiffre, moteur,
+                                      cache=False,
+                                      instrumentation=instrumentation),
+            "cassage_astucieux", moteur, clair, chiffre,
+            transformation=tuple)
+    from .instrumentation import instrumente
+
+    with instrumente(instrumentation, "cassage_astucieux") as mesures:
+        mesures.prevoit(2 * NOMBRE_CLES)
+        if moteur == "bitslice":
+            from . import bitslice_sdes
+            with mesures.etape("recherche"):
+                return bitslice_sdes.cassage_astucieux(clair, chiffre,
+                                                       mesures.atteint)
+        with mesures.etape("tables"):
+            table = tables()
+        with mesures.etape("dictionnaire"):
+            tableau = {}
+            nombre_tentatives = 0
+            debut = time.time()
+            for cle1 in range(NOMBRE_CLES):
+                message_crypte = clair.translate(table.ligne_chiffrement(cle1))
+                tableau[message_crypte] = cle1
+                nombre_tentatives += 1
+            mesures.avance(NOMBRE_CLES)
+
+        with mesures.etape("recherche"):
+            for cle2 in range(NOMBRE_CLES):
+                nombre_tentatives += 1
+                message_decrypte = chiffre.translate(
+                    table.ligne_dechiffrement(cle2))
+                if message_decrypte in tableau:
+                    temps = time.time() - debut
+                    temps = round(temps, 3)
+                    mesures.avance(cle2 + 1)
+                    return tableau[message_decrypte], cle2, \
+                        nombre_tentatives, temps
+            mesures.avance(NOMBRE_CLES)
+        return None
+
+
+def cassage_astucieux_complet(message_clair: str, message_chiffre: str):
+    """
+    Fonction qui trouve toutes les paires de clés compatibles avec le message
+    clair et le message chiffré, par rencontre au milieu vectorisée
+
+    Args:
+        message_clair (str): Le message clair
+        message_chiffre (str): Le message chiffré
+
+    Returns:
+        ResultatRencontre: Les paires de clés, le nombre de candidats, le
+        nombre de collisions et le temps de calcul
+    """
+    from .mitm_sdes import rencontre_au_milieu
+    return rencontre_au_milieu(message_clair.encode("latin-1"),
+                               message_chiffre.encode("latin-1"))
+
+
+def cassage_frequentiel(message_chiffre: str,
+                        nombre: int = 10,
+                        methode: str = "vraisemblance"):
+    """
+    Fonction qui casse le cryptage double SDES sans connaître le message clair,
+    en comparant les fréquences des octets décryptés à celles du français
+
+    Args:
+        message_chiffre (str): Le message chiffré
+        nombre (int): Le nombre de paires de clés à renvoyer
+        methode (str): "vraisemblance" ou "khi2"
+
+    Returns:
+        tuple: Les meilleures paires de clés (cle1, cle2, score) et le temps
+        de calcul
+    """
+    from .frequences_sdes import classer_paires
+    debut = time.time()
+    candidats = classer_paires(message_chiffre.encode("latin-1"),
+                               nombre=nombre, methode=methode)
+    temps = time.time() - debut
+    temps = round(temps, 3)
+    return candidats, temps
+
+
+def cles_equivalentes(message_clair: str, message_chiffre: str):
+    """
+    Fonction qui trouve toutes les paires de clés compatibles avec quelques
+    caractères clairs et chiffrés connus, par recherche dans l'index des
+    permutations du double SDES (construit et enregistré au premier appel)
+
+    Args:
+        message_clair (str): Les caractères clairs connus
+        message_chiffre (str): Les caractères chiffrés correspondants
+
+    Returns:
+        tuple: Les paires de clés (cle1, cle2), le nombre de permutations
+        distinctes compatibles et le temps de calcul
+    """
+    from .index_sdes import index
+    debut = time.time()
+    index_permutations = index()
+    clair = message_clair.encode("latin-1")
+    chiffre = message_chiffre.encode("latin-1")
+    identifiants = index_permutations.recherche_permutations(clair, chiffre)
+    paires = sorted(paire for identifiant in identifiants
+                    for paire in index_permutations.paires_de(identifiant))
+    temps = time.time() - debut
+    temps = round(temps, 3)
+    return paires, len(identifiants), temps
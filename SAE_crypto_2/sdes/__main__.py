@@ -0,0 +1,189 @@
+"""
+Ligne de commande du paquet SDES
+
+    python -m sdes crypter 0b1100001110 0b1110001110 -i clair -o chiffre
+    python -m sdes decrypter 0b1100001110 0b1110001110 < chiffre
+    python -m sdes casser clair chiffre --moteur bitslice
+    python -m sdes index
+    python -m sdes cache --vider
+    python -m sdes bench mesurer -o resultats.json
+
+Les modules lourds ne sont importés que par la sous-commande qui les utilise,
+pour que le démarrage reste rapide.
+"""
+import argparse
+import json
+import sys
+
+MOTEURS = ("filtrage", "tables", "bitslice", "parallele", "rencontre",
+           "index")
+
+
+def _cle(texte: str) -> int:
+    """
+    Lit une clé SDES écrite en décimal, en binaire (0b) ou en hexadécimal (0x)
+    """
+    return int(texte, 0)
+
+
+def _ouvrir(chemin: str | None, mode: str):
+    """
+    Ouvre le fichier, ou l'entrée/la sortie standard si aucun chemin n'est donné
+    """
+    if chemin is None or chemin == "-":
+        flux = sys.stdin if "r" in mode else sys.stdout
+        return open(flux.fileno(), mode, closefd=False)
+    return open(chemin, mode)
+
+
+def commande_chiffrement(options) -> int:
+    """
+    Crypte ou décrypte un fichier en SDES, morceau par morceau
+    """
+    from .flux_sdes import table_substitution, traduit_flux
+
+    substitution = table_substitution(
+        *options.cles, dechiffrer=options.commande in ("decrypter", "decrypt"))
+    with _ouvrir(options.entree, "rb") as entree, \
+            _ouvrir(options.sortie, "wb") as sortie:
+        traduit_flux(entree, sortie, substitution)
+    return 0
+
+
+def commande_cassage(options) -> int:
+    """
+    Retrouve les clés du double SDES à partir d'un clair et d'un chiffré connus
+    """
+    from . import cassage_astucieux_complet, cassage_brutal, cles_equivalentes
+
+    with open(options.clair, "rb") as fichier:
+        clair = fichier.read().decode("latin-1")
+    with open(options.chiffre, "rb") as fichier:
+        chiffre = fichier.read().decode("latin-1")
+    if options.moteur == "rencontre":
+        resultat = cassage_astucieux_complet(clair, chiffre)
+        print(json.dumps(resultat._asdict()))
+        return 0 if resultat.paires else 1
+    if options.moteur == "index":
+        paires, nombre_permutations, temps = cles_equivalentes(clair, chiffre)
+        print(json.dumps({"paires": paires,
+                          "nombre_permutations": nombre_permutations,
+                          "temps": temps}))
+        return 0 if paires else 1
+    instrumentation = None
+    if options.metriques or options.progression:
+        from .instrumentation import Instrumentation, affiche_progression
+
+        instrumentation = Instrumentation(
+            progression=affiche_progression if options.progression else None,
+            sortie=options.metriques)
+    resultat = cassage_brutal(clair, chiffre, options.moteur,
+                              cache=options.cache,
+                              instrumentation=instrumentation)
+    if resultat is None:
+        print(json.dumps(None))
+        return 1
+    print(json.dumps(dict(zip(("cle1", "cle2", "nombre_tentatives", "temps"),
+                              resultat))))
+    return 0
+
+
+def commande_index(options) -> int:
+    """
+    Construit l'index des permutations du double SDES, l'enregistre et
+    affiche le nombre de permutations distinctes
+    """
+    from .index_sdes import CHEMIN_INDEX, construire_index, sauvegarder_index
+
+    index, temps = construire_index()
+    sauvegarder_index(index, options.chemin or CHEMIN_INDEX)
+    tailles = index.debuts[1:].astype("int64") - index.debuts[:-1]
+    print(json.dumps({"nombre_paires": len(index.paires),
+                      "nombre_permutations": index.nombre_permutations,
+                      "plus_grand_groupe": int(tailles.max()),
+                      "temps": round(temps, 3)}))
+    return 0
+
+
+def commande_cache(options) -> int:
+    """
+    Affiche les statistiques du cache des résultats, ou le vide
+    """
+    from .cache_resultats import CHEMIN_CACHE, cache
+
+    resultats = cache(options.chemin or CHEMIN_CACHE)
+    if options.vider:
+        resultats.vider()
+    print(json.dumps({"chemin": resultats.chemin,
+                      **resultats.statistiques()}))
+    return 0
+
+
+def commande_bench(options) -> int:
+    """
+    Lance les mesures de performance ou trace leurs résultats
+    """
+    from .bench_sdes import main as main_bench
+    return main_bench(options.reste)
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Point d'entrée de `python -m sdes`
+    """
+    parseur = argparse.ArgumentParser(
+        prog="python -m sdes",
+        description="SDES : cryptage, décryptage, cassage et mesures")
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+    for nom, alias, aide in (("crypter", "encrypt", "crypte un fichier"),
+                             ("decrypter", "decrypt", "décrypte un fichier")):
+        commande = commandes.add_parser(nom, aliases=[alias], help=aide)
+        commande.add_argument("cles", nargs="+", type=_cle,
+                              help="les clés SDES (ex. 0b1100001110 0x28e)")
+        commande.add_argument("-i", "--entree",
+                              help="fichier à lire (stdin sinon)")
+        commande.add_argument("-o", "--sortie",
+                              help="fichier à écrire (stdout sinon)")
+        commande.set_defaults(fonction=commande_chiffrement)
+    cassage = commandes.add_parser("casser", aliases=["crack"],
+                                   help="retrouve les clés du double SDES")
+    cassage.add_argument("clair", help="fichier du message clair")
+    cassage.add_argument("chiffre", help="fichier du message chiffré")
+    cassage.add_argument("-m", "--moteur", choices=MOTEURS,
+                         default="filtrage",
+                         help="« rencontre » et « index » renvoient toutes "
+                         "les paires")
+    cassage.add_argument("--cache", action=argparse.BooleanOptionalAction,
+                         default=None,
+                         help="relit les cassages déjà faits (par défaut si "
+                         "SDES_CACHE est défini)")
+    cassage.add_argument("--metriques",
+                         help="fichier JSON lines où ajouter les mesures")
+    cassage.add_argument("--progression", action="store_true",
+                         help="affiche le débit et le temps restant sur la "
+                         "sortie d'erreur")
+    cassage.set_defaults(fonction=commande_cassage)
+    permutations = commandes.add_parser(
+        "index", help="construit l'index des permutations du double SDES")
+    permutations.add_argument("-o", "--chemin", default=None,
+                              help="fichier de l'index (.npz)")
+    permutations.set_defaults(fonction=commande_index)
+    resultats = commandes.add_parser(
+        "cache", help="statistiques du cache des résultats")
+    resultats.add_argument("-o", "--chemin", default=None,
+                           help="fichier du cache (.sqlite)")
+    resultats.add_argument("--vider", action="store_true",
+                           help="supprime tous les résultats")
+    resultats.set_defaults(fonction=commande_cache)
+    bench = commandes.add_parser("bench", help="mesures de performance",
+                                 add_help=False)
+    bench.set_defaults(fonction=commande_bench)
+    options, reste = parseur.parse_known_args(arguments)
+    if options.fonction is not commande_bench and reste:
+        parseur.error(f"arguments non reconnus : {' '.join(reste)}")
+    options.reste = reste
+    return options.fonction(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
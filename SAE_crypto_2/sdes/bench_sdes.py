@@ -0,0 +1,353 @@
+"""
+Module de mesure des performances des implémentations du SDES et des attaques
+
+Les mesures utilisent `time.perf_counter`, avec des exécutions d'échauffement
+puis plusieurs répétitions, et sont enregistrées en JSON pour suivre les
+régressions d'une version à l'autre. Les graphiques sont tracés à part, à
+partir du fichier JSON.
+
+    python -m sdes bench mesurer -o resultats.json
+    python -m sdes bench tracer resultats.json
+
+Les implémentations de référence `prec.py` et `test.py` sont comparées quand
+elles sont présentes dans le dossier du projet, au-dessus du paquet.
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+REPETITIONS = 5
+ECHAUFFEMENT = 1
+CLES_BENCH = (0b0000000011, 0b1100001110)
+TEXTE_BENCH = ("Nous sommes nes dans un royaume florissant ; mais nous n'avons "
+               "pas cru que ses bornes fussent celles de nos connoissances. ")
+LONGUEURS = (1, 2, 4, 8, 16, 64, 256)
+BITS_ESPACE_CLES = (2, 4, 6, 8, 10)
+# dossier des implémentations de référence
+DOSSIER_REFERENCES = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+# fonctions attendues dans chacune
+FONCTIONS_REFERENCES = {
+    "prec": ("encryptage", "decryptage", "cassage2SDESbrutal"),
+    "test": ("encryptage", "decryptage", "cassage2SDESastucieux"),
+}
+# au-delà, l'implémentation de référence prend plusieurs minutes par mesure
+BITS_MAX = {"prec.cassage2SDESbrutal": 6}
+
+
+def mesurer(fonction, *arguments, repetitions: int = REPETITIONS,
+            echauffement: int = ECHAUFFEMENT) -> tuple[dict, object]:
+    """
+    Mesure la durée d'exécution d'une fonction
+
+    Args:
+        fonction (callable): La fonction à mesurer
+        arguments: Les arguments de la fonction
+        repetitions (int): Le nombre d'exécutions mesurées
+        echauffement (int): Le nombre d'exécutions préalables non mesurées
+
+    Returns:
+        tuple: Les durées minimale, médiane, moyenne et leur écart type (s),
+        et le résultat de la dernière exécution
+    """
+    for _ in range(echauffement):
+        fonction(*arguments)
+    durees = []
+    resultat = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction(*arguments)
+        durees.append(time.perf_counter() - debut)
+    return {
+        "min": min(durees),
+        "mediane": statistics.median(durees),
+        "moyenne": statistics.fmean(durees),
+        "ecart_type": statistics.stdev(durees) if len(durees) > 1 else 0.0,
+        "repetitions": repetitions,
+    }, resultat
+
+
+def references() -> dict:
+    """
+    Charge les modules de référence `prec` et `test` depuis leur fichier
+
+    Ils sont chargés par chemin et non par nom : `test` désignerait sinon le
+    paquet de tests de la bibliothèque standard dès que le dossier du projet
+    n'est pas en tête de sys.path.
+
+    Returns:
+        dict: Les modules trouvés, par nom
+
+    Raises:
+        ImportError: Si un fichier de référence n'a pas les fonctions
+            attendues
+    """
+    modules = {}
+    for nom, fonctions in FONCTIONS_REFERENCES.items():
+        chemin = os.path.join(DOSSIER_REFERENCES, nom + ".py")
+        if not os.path.isfile(chemin):
+            continue
+        specification = importlib.util.spec_from_file_location(
+            f"reference_{nom}", chemin)
+        module = importlib.util.module_from_spec(specification)
+        specification.loader.exec_module(module)
+        manquantes = [fonction for fonction in fonctions
+                      if not hasattr(module, fonction)]
+        if manquantes:
+            raise ImportError(f"{chemin} n'est pas une référence SDES : "
+                              f"{', '.join(manquantes)} manquant")
+        modules[nom] = module
+    return modules
+
+
+def _par_octet(fonction, cle):
+    """
+    Fabrique une fonction qui applique `fonction(cle, octet)` aux 256 octets
+    """
+
+    def appliquer():
+        for octet in range(256):
+            fonction(cle, octet)
+
+    return appliquer
+
+
+def implementations_octet() -> dict:
+    """
+    Renvoie les implémentations octet par octet à comparer
+
+    Returns:
+        dict: Pour chaque nom, la fonction de cryptage et celle de décryptage
+    """
+    from . import double_sdes
+
+    implementations = {
+        "double_sdes.tables": (double_sdes.crypter, double_sdes.decrypt),
+        "double_sdes.bits": (double_sdes.crypter_bits,
+                             double_sdes.decrypt_bits),
+    }
+    for nom, module in references().items():
+        implementations[nom] = (module.encryptage, module.decryptage)
+    return implementations
+
+
+def bench_debit(repetitions: int = REPETITIONS) -> list[dict]:
+    """
+    Mesure le débit de cryptage et de décryptage, octet par octet et par blocs
+
+    Returns:
+        list[dict]: Une mesure par implémentation et par sens
+    """
+    from . import flux_sdes
+
+    resultats = []
+    for nom, (crypter, decrypter) in implementations_octet().items():
+        for sens, fonction in (("crypter", crypter), ("decrypter", decrypter)):
+            mesure, _ = mesurer(_par_octet(fonction, CLES_BENCH[0]),
+                                repetitions=repetitions)
+            mesure.update(implementation=nom, sens=sens, octets=256,
+                          octets_par_seconde=256 / mesure["mediane"])
+            resultats.append(mesure)
+    donnees = bytes(range(256)) * 4096
+    for sens, fonction in (("crypter", flux_sdes.crypte_octets),
+                           ("decrypter", flux_sdes.decrypte_octets)):
+        mesure, _ = mesurer(fonction, donnees, *CLES_BENCH,
+                            repetitions=repetitions)
+        mesure.update(implementation="flux_sdes.double", sens=sens,
+                      octets=len(donnees),
+                      octets_par_seconde=len(donnees) / mesure["mediane"])
+        resultats.append(mesure)
+    return resultats
+
+
+def attaques() -> dict:
+    """
+    Renvoie les attaques à comparer, sous la forme
+    nom -> fonction(clair: str, chiffre: str)
+    """
+    from . import cassage_astucieux, cassage_brutal, mitm_sdes
+
+    def rencontre(clair, chiffre):
+        return mitm_sdes.rencontre_au_milieu(clair.encode("latin-1"),
+                                             chiffre.encode("latin-1"))
+
+    # le cache des résultats fausserait toutes les mesures après la première
+    liste = {
+        "sdes.brutal.filtrage":
+            lambda clair, chiffre: cassage_brutal(clair, chiffre, cache=False),
+        "sdes.brutal.tables":
+            lambda clair, chiffre: cassage_brutal(clair, chiffre, "tables",
+                                                  cache=False),
+        "sdes.brutal.bitslice":
+            lambda clair, chiffre: cassage_brutal(clair, chiffre, "bitslice",
+                                                  cache=False),
+        "sdes.astucieux":
+            lambda clair, chiffre: cassage_astucieux(clair, chiffre,
+                                                     cache=False),
+        "mitm_sdes.rencontre_au_milieu": rencontre,
+    }
+    modules = references()
+    if "prec" in modules:
+        liste["prec.cassage2SDESbrutal"] = (
+            lambda clair, chiffre: modules["prec"].cassage2SDESbrutal(
+                [ord(c) for c in chiffre], [ord(c) for c in clair]))
+    if "test" in modules:
+        liste["test.cassage2SDESastucieux"] = (
+            lambda clair, chiffre: modules["test"].cassage2SDESastucieux(
+                [ord(c) for c in chiffre], clair))
+    return liste
+
+
+def bench_longueur(longueurs=LONGUEURS,
+                   repetitions: int = REPETITIONS) -> list[dict]:
+    """
+    Mesure la durée des attaques en fonction de la longueur du message connu
+
+    Returns:
+        list[dict]: Une mesure par attaque et par longueur
+    """
+    from . import crypte_double_sdes
+
+    resultats = []
+    for longueur in longueurs:
+        clair = (TEXTE_BENCH * (longueur // len(TEXTE_BENCH) + 1))[:longueur]
+        chiffre = crypte_double_sdes(clair, *CLES_BENCH)
+        for nom, attaque in attaques().items():
+            mesure, _ = mesurer(attaque, clair, chiffre,
+                                repetitions=repetitions)
+            mesure.update(attaque=nom, longueur=longueur)
+            resultats.append(mesure)
+    return resultats
+
+
+def bench_espace_cles(bits=BITS_ESPACE_CLES,
+                      repetitions: int = REPETITIONS) -> list[dict]:
+    """
+    Mesure la durée des attaques en fonction de la taille de l'espace de clés
+    parcouru : les clés secrètes valent 2^b - 1 et 2^b - 2, si bien qu'une
+    recherche dans l'ordre parcourt les clés inférieures à 2^b avant de les
+    trouver (le nombre de tentatives est enregistré, car une paire équivalente
+    peut être trouvée plus tôt)
+
+    Returns:
+        list[dict]: Une mesure par attaque et par nombre de bits
+    """
+    from . import crypte_double_sdes
+
+    resultats = []
+    clair = TEXTE_BENCH[:8]
+    for nombre_bits in bits:
+        cle = (1 << nombre_bits) - 1
+        chiffre = crypte_double_sdes(clair, cle, cle - 1)
+        for nom, attaque in attaques().items():
+            if nombre_bits > BITS_MAX.get(nom, nombre_bits):
+                continue
+            mesure, resultat = mesurer(attaque, clair, chiffre,
+                                       repetitions=repetitions)
+            mesure.update(attaque=nom, bits=nombre_bits)
+            if isinstance(resultat, tuple) and len(resultat) == 4:
+                mesure["tentatives"] = resultat[2]
+            resultats.append(mesure)
+    return resultats
+
+
+def lancer(repetitions: int = REPETITIONS) -> dict:
+    """
+    Lance toutes les mesures
+
+    Returns:
+        dict: Les métadonnées de l'exécution et les trois séries de mesures
+    """
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+            "repetitions": repetitions,
+            "echauffement": ECHAUFFEMENT,
+            "cles": list(CLES_BENCH),
+        },
+        "debit": bench_debit(repetitions),
+        "longueur": bench_longueur(repetitions=repetitions),
+        "espace_cles": bench_espace_cles(repetitions=repetitions),
+    }
+
+
+def tracer(resultats: dict, prefixe: str) -> list[str]:
+    """
+    Trace les graphiques des mesures enregistrées
+
+    Args:
+        resultats (dict): Les mesures chargées depuis le fichier JSON
+        prefixe (str): Le préfixe des images produites
+
+    Returns:
+        list[str]: Les chemins des images produites
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    chemins = []
+    fig, ax = plt.subplots()
+    noms = [f"{m['implementation']}\n{m['sens']}" for m in resultats["debit"]]
+    ax.barh(noms, [m["octets_par_seconde"] for m in resultats["debit"]])
+    ax.set_xscale("log")
+    ax.set_xlabel("Octets par seconde")
+    ax.set_title("Débit SDES")
+    fig.tight_layout()
+    chemins.append(f"{prefixe}_debit.png")
+    fig.savefig(chemins[-1])
+
+    for serie, abscisse, titre in (("longueur", "longueur",
+                                    "Longueur du message (octets)"),
+                                   ("espace_cles", "bits",
+                                    "Bits de l'espace de clés parcouru")):
+        fig, ax = plt.subplots()
+        for nom in dict.fromkeys(m["attaque"] for m in resultats[serie]):
+            mesures = [m for m in resultats[serie] if m["attaque"] == nom]
+            ax.plot([m[abscisse] for m in mesures],
+                    [m["mediane"] for m in mesures], marker="o", label=nom)
+        ax.set_yscale("log")
+        ax.set_xlabel(titre)
+        ax.set_ylabel("Temps médian (s)")
+        ax.legend(fontsize="small")
+        fig.tight_layout()
+        chemins.append(f"{prefixe}_{serie}.png")
+        fig.savefig(chemins[-1])
+    return chemins
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Point d'entrée : `mesurer` enregistre les mesures, `tracer` les affiche
+    """
+    parseur = argparse.ArgumentParser(
+        prog="python -m sdes bench",
+        description="Mesures de performance du SDES et des attaques")
+    actions = parseur.add_subparsers(dest="action", required=True)
+    mesure = actions.add_parser("mesurer", help="lance les mesures")
+    mesure.add_argument("-o", "--sortie", default="bench_sdes.json")
+    mesure.add_argument("-r", "--repetitions", type=int, default=REPETITIONS)
+    trace = actions.add_parser("tracer", help="trace un fichier de mesures")
+    trace.add_argument("fichier")
+    trace.add_argument("-p", "--prefixe", default="bench_sdes")
+    options = parseur.parse_args(arguments)
+    if options.action == "mesurer":
+        with open(options.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(lancer(options.repetitions), fichier, indent=2)
+        print(options.sortie)
+    else:
+        with open(options.fichier, encoding="utf-8") as fichier:
+            print("\n".join(tracer(json.load(fichier), options.prefixe)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Module pour le SDES en tranches de bits (bitslicing)
+
+Chaque bit de l'état SDES est rangé dans un tableau NumPy de mots uint64 : le
+bit j du mot w correspond à la clé w * 64 + j. Les permutations (IP, EP, P4,
+FP, P10, P8) deviennent de simples réordonnancements de tableaux et les boîtes
+S0/S1 des multiplexeurs, si bien qu'une opération bit à bit teste 64 clés.
+"""
+import time
+
+import numpy as np
+
+from .double_sdes import (finale_table, initiale_table, table_50, table_ep,
+                         table_p4, table_p8, table_p10, table_s1, taille_cle)
+from .tables_sdes import NOMBRE_CLES
+
+BITS_PAR_MOT = 64
+MOTS_PAR_CLE = NOMBRE_CLES // BITS_PAR_MOT
+TOUS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _bits_sous_cles() -> tuple[list[int], list[int]]:
+    """
+    Suit les bits de la clé à travers P10, les décalages et P8
+
+    Returns:
+        tuple: Pour chaque bit des deux sous-clés, l'indice du bit de clé
+    """
+
+    def decalage_gauche(liste_bits):
+        return liste_bits[1:5] + liste_bits[0:1] + liste_bits[6:10] + \
+            liste_bits[5:6]
+
+    perm = [elem - 1 for elem in table_p10]
+    decalage_1 = decalage_gauche(perm)
+    decalage_2 = decalage_gauche(decalage_gauche(decalage_1))
+    return ([decalage_1[elem - 1] for elem in table_p8],
+            [decalage_2[elem - 1] for elem in table_p8])
+
+
+BITS_SOUS_CLE1, BITS_SOUS_CLE2 = _bits_sous_cles()
+
+
+def permuter(bits: list, la_table_permutation) -> list:
+    """
+    Permute des bits en tranches selon la table de permutation donnée
+
+    Args:
+        bits (list): Les tranches, du bit de poids fort au bit de poids faible
+        la_table_permutation (tuple): La table de permutation (indices à partir de 1)
+    """
+    return [bits[elem - 1] for elem in la_table_permutation]
+
+
+def _boite_s(entrees: list, la_table) -> list:
+    """
+    Évalue une boîte S 4 bits -> 2 bits sur des tranches
+
+    L'entrée vaut 8 * b1 + 4 * b4 + 2 * b2 + b3 (ligne b1b4, colonne b2b3),
+    comme dans `double_sdes.fonction_feistel`. La boîte est décomposée en arbre
+    de multiplexeurs sur les bits de l'indice.
+
+    Args:
+        entrees (list): Les quatre tranches b1, b2, b3, b4
+        la_table (tuple): La boîte S (16 valeurs de 2 bits)
+
+    Returns:
+        list: Les deux tranches de sortie, poids fort en premier
+    """
+    b1, b2, b3, b4 = entrees
+    selecteurs = (b3, b2, b4, b1)
+    sorties = []
+    for poids in (2, 1):
+        feuilles = [TOUS if la_table[indice] & poids else np.uint64(0)
+                    for indice in range(16)]
+        for selecteur in selecteurs:
+            feuilles = [(feuilles[i] & ~selecteur) | (feuilles[i + 1] & selecteur)
+                        for i in range(0, len(feuilles), 2)]
+        sorties.append(feuilles[0])
+    return sorties
+
+
+def fonction_feistel(sous_cle: list, donnees: list) -> list:
+    """
+    Applique la fonction de Feistel sur des tranches
+
+    Args:
+        sous_cle (list): Les 8 tranches de la sous-clé
+        donnees (list): Les 8 tranches des données
+    """
+    etendu = permuter(donnees[4:], table_ep)
+    aux = [etendu[i] ^ sous_cle[i] for i in range(8)]
+    sortie_sbox = _boite_s(aux[0:4], table_50) + _boite_s(aux[4:8], table_s1)
+    f = permuter(sortie_sbox, table_p4)
+    return [donnees[i] ^ f[i] for i in range(4)] + donnees[4:]
+
+
+def echange_nibble(donnees: list) -> list:
+    """
+    Échange les deux nibbles des tranches
+    """
+    return donnees[4:] + donnees[:4]
+
+
+def _appliquer(sous_cle_a: list, sous_cle_b: list, donnees: list) -> list:
+    donnees = fonction_feistel(sous_cle_a, permuter(donnees, initiale_table))
+    donnees = fonction_feistel(sous_cle_b, echange_nibble(donnees))
+    return permuter(donnees, finale_table)
+
+
+def tranches_cles(cles=None) -> list:
+    """
+    Découpe des clés en tranches de bits
+
+    Args:
+        cles (np.ndarray | None): Les clés, de longueur multiple de 64
+            (toutes les clés SDES par défaut)
+
+    Returns:
+        list: Les 10 tranches de la clé, du bit de poids fort au bit de poids faible
+    """
+    if cles is None:
+        cles = np.arange(NOMBRE_CLES, dtype=np.uint64)
+    cles = np.asarray(cles, dtype=np.uint64).reshape(-1, BITS_PAR_MOT)
+    decalages = np.arange(BITS_PAR_MOT, dtype=np.uint64)
+    return [
+        np.bitwise_or.reduce(((cles >> np.uint64(taille_cle - 1 - bit))
+                              & np.uint64(1)) << decalages, axis=1)
+        for bit in range(taille_cle)
+    ]
+
+
+def tranches_octet(octet: int) -> list:
+    """
+    Tranches d'un octet identique pour toutes les clés
+
+    Args:
+        octet (int): L'octet à découper
+    """
+    return [TOUS if octet & (128 >> bit) else np.uint64(0) for bit in range(8)]
+
+
+def tranches_octets(octets: np.ndarray) -> list:
+    """
+    Tranches d'octets différents pour chaque ligne : chaque bit devient un mot
+    plein (tous les bits à 1) ou vide
+
+    Args:
+        octets (np.ndarray): Les octets, un par ligne
+
+    Returns:
+        list: Les 8 tranches, de forme (len(octets), 1)
+    """
+    octets = np.asarray(octets, dtype=np.uint8).reshape(-1, 1)
+    return [np.where(octets & (128 >> bit), TOUS, np.uint64(0))
+            for bit in range(8)]
+
+
+def crypter_tranches(cle: list, donnees: list) -> list:
+    """
+    Crypte des tranches avec les tranches de clés données
+
+    Args:
+        cle (list): Les 10 tranches de la clé
+        donnees (list): Les 8 tranches des données
+    """
+    return _appliquer([cle[i] for i in BITS_SOUS_CLE1],
+                      [cle[i] for i in BITS_SOUS_CLE2], donnees)
+
+
+def decrypter_tranches(cle: list, donnees: list) -> list:
+    """
+    Décrypte des tranches avec les tranches de clés données
+
+    Args:
+        cle (list): Les 10 tranches de la clé
+        donnees (list): Les 8 tranches des données
+    """
+    return _appliquer([cle[i] for i in BITS_SOUS_CLE2],
+                      [cle[i] for i in BITS_SOUS_CLE1], donnees)
+
+
+def assembler(tranches: list) -> np.ndarray:
+    """
+    Recompose les octets de chaque clé à partir des tranches
+
+    Args:
+        tranches (list): Les 8 tranches, de forme (..., mots)
+
+    Returns:
+        np.ndarray: Les octets, de forme (..., mots * 64)
+    """
+    decalages = np.arange(BITS_PAR_MOT, dtype=np.uint64)
+    octets = np.zeros(tranches[0].shape + (BITS_PAR_MOT,), dtype=np.uint8)
+    for bit, tranche in enumerate(tranches):
+        valeurs = (tranche[..., None] >> decalages) & np.uint64(1)
+        octets |= (valeurs.astype(np.uint8) << np.uint8(7 - bit))
+    return octets.reshape(tranches[0].shape[:-1] + (-1,))
+
+
+def _egalite(tranches: list, octet_attendu) -> np.ndarray:
+    """
+    Masque des clés pour lesquelles les tranches valent l'octet attendu
+    """
+    attendu = tranches_octet(octet_attendu) if isinstance(
+        octet_attendu, int) else octet_attendu
+    masque = ~(tranches[0] ^ attendu[0])
+    for bit in range(1, 8):
+        masque &= ~(tranches[bit] ^ attendu[bit])
+    return masque
+
+
+def _premier_bit(masque: np.ndarray) -> tuple[int, int]:
+    """
+    Renvoie la ligne et l'indice de clé du premier bit à 1 du masque (m, mots)
+    """
+    lignes, mots = np.nonzero(masque)
+    ligne, mot = int(lignes[0]), int(mots[0])
+    valeur = int(masque[ligne, mot])
+    return ligne, mot * BITS_PAR_MOT + (valeur & -valeur).bit_length() - 1
+
+
+def cassage_brutal(clair: bytes, chiffre: bytes,
+                   progression=None) -> tuple[int, int, int, float] | None:
+    """
+    Casse le double SDES en testant toutes les paires de clés, 64 à la fois
+
+    Toutes les premières clés sont traitées d'un coup : les états
+    intermédiaires deviennent des mots pleins ou vides (une ligne par première
+    clé) et la deuxième clé varie dans les bits des mots.
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré
+        progression (callable | None): Appelée avec (tentatives, total)
+            après chaque octet, les tentatives comptées au prorata des octets
+            traités
+
+    Returns:
+        tuple: La clé 1 et la clé 2, le nombre de tentatives et le temps de calcul
+    """
+    debut = time.time()
+    if len(clair) != len(chiffre):
+        return None
+    total = NOMBRE_CLES * NOMBRE_CLES
+    cles = tranches_cles()
+    masque = np.full((NOMBRE_CLES, MOTS_PAR_CLE), TOUS)
+    for position, (octet_clair, octet_chiffre) in enumerate(zip(clair,
+                                                                 chiffre)):
+        milieu = assembler(crypter_tranches(cles, tranches_octet(octet_clair)))
+        sortie = crypter_tranches(cles, tranches_octets(milieu))
+        masque &= _egalite(sortie, octet_chiffre)
+        if not masque.any():
+            return None
+        if progression is not None:
+            progression(total * (position + 1) // len(clair), total)
+    cle1, cle2 = _premier_bit(masque)
+    temps = round(time.time() - debut, 3)
+    return (cle1, cle2, cle1 * NOMBRE_CLES + cle2 + 1, temps)
+
+
+def etats_milieu(clair: bytes, chiffre: bytes,
+                 progression=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule en tranches les états intermédiaires de toutes les clés
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré
+        progression (callable | None): Appelée avec (cles, total) après
+            chaque octet, les clés comptées au prorata des octets traités
+
+    Returns:
+        tuple: Les matrices (1024, len(clair)) des cryptages du clair et des
+        décryptages du chiffré
+    """
+    cles = tranches_cles()
+    avant = np.empty((NOMBRE_CLES, len(clair)), dtype=np.uint8)
+    arriere = np.empty((NOMBRE_CLES, len(chiffre)), dtype=np.uint8)
+    total = 2 * NOMBRE_CLES
+    octets = len(clair) + len(chiffre)
+    for position, octet in enumerate(clair):
+        avant[:, position] = assembler(
+            crypter_tranches(cles, tranches_octet(octet)))
+        if progression is not None:
+            progression(total * (position + 1) // octets, total)
+    for position, octet in enumerate(chiffre):
+        arriere[:, position] = assembler(
+            decrypter_tranches(cles, tranches_octet(octet)))
+        if progression is not None:
+            progression(total * (len(clair) + position + 1) // octets, total)
+    return avant, arriere
+
+
+def cassage_astucieux(clair: bytes, chiffre: bytes,
+                      progression=None) -> tuple[int, int, int, float] | None:
+    """
+    Casse le double SDES par rencontre au milieu, états calculés en tranches
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré
+        progression (callable | None): Voir `etats_milieu`
+
+    Returns:
+        tuple: La clé 1 et la clé 2, le nombre de tentatives et le temps de calcul
+    """
+    debut = time.time()
+    avant, arriere = etats_milieu(clair, chiffre, progression)
+    tableau = {ligne.tobytes(): cle1 for cle1, ligne in enumerate(avant)}
+    for cle2, ligne in enumerate(arriere):
+        if ligne.tobytes() in tableau:
+            temps = round(time.time() - debut, 3)
+            return (tableau[ligne.tobytes()], cle2, NOMBRE_CLES + cle2 + 1,
+                    temps)
+    return None
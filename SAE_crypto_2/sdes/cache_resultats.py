@@ -0,0 +1,291 @@
+"""
+Module pour le cache persistant des résultats de cassage et d'extraction
+
+Un résultat est rangé dans une base SQLite sous l'empreinte SHA-256 de tout
+ce qui le détermine (nom du calcul, paramètres, messages, contenu de
+l'image). La base est en mode WAL, ce qui permet à plusieurs processus de la
+lire et de l'écrire en même temps ; quand elle dépasse sa taille maximale,
+les résultats utilisés le moins récemment sont supprimés. Une lecture ne
+prend pas le verrou d'écriture : les dates d'accès et les compteurs sont
+gardés en mémoire et écrits d'un coup au plus toutes les `DELAI_ECRITURE`
+secondes, à chaque écriture d'un résultat et à la sortie du processus.
+
+Le cache est désactivé par défaut pour que les mesures de temps restent
+justes ; la variable d'environnement SDES_CACHE (le chemin de la base)
+l'active pour tous les appels, et chaque fonction accepte `cache=True`.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+CHEMIN_CACHE = os.environ.get("SDES_CACHE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resultats_sdes.sqlite")
+TAILLE_MAX = 64 << 20
+ATTENTE_VERROU = 30.0
+# délai maximal (s) avant d'écrire les dates d'accès et les compteurs lus
+DELAI_ECRITURE = 1.0
+
+_caches = {}
+_verrou_caches = threading.Lock()
+
+
+def empreinte(*parties) -> str:
+    """
+    Calcule la clé d'un résultat à partir de tout ce qui le détermine
+
+    Les octets sont pris tels quels, le texte en UTF-8 et le reste en JSON ;
+    chaque partie est précédée de son type et de sa longueur pour que deux
+    découpages différents ne donnent pas la même empreinte.
+
+    Returns:
+        str: L'empreinte SHA-256 en hexadécimal
+    """
+    hachage = hashlib.sha256()
+    for partie in parties:
+        if isinstance(partie, (bytes, bytearray, memoryview)):
+            type_partie, octets = b"b", bytes(partie)
+        elif isinstance(partie, str):
+            type_partie, octets = b"s", partie.encode("utf-8")
+        else:
+            type_partie, octets = b"j", json.dumps(
+                partie, sort_keys=True).encode("utf-8")
+        hachage.update(type_partie + len(octets).to_bytes(8, "big"))
+        hachage.update(octets)
+    return hachage.hexdigest()
+
+
+def empreinte_fichier(chemin: str) -> str:
+    """
+    Calcule l'empreinte SHA-256 du contenu d'un fichier
+    """
+    hachage = hashlib.sha256()
+    with open(chemin, "rb") as fichier:
+        for morceau in iter(lambda: fichier.read(1 << 20), b""):
+            hachage.update(morceau)
+    return hachage.hexdigest()
+
+
+class CacheResultats:
+    """
+    Cache LRU de résultats sérialisables en JSON, sur disque
+
+    Une instance peut servir à plusieurs threads : ses accès à la base
+    passent par un verrou.
+    """
+
+    def __init__(self, chemin: str = CHEMIN_CACHE,
+                 taille_max: int = TAILLE_MAX):
+        """
+        Ouvre (ou crée) la base
+
+        Args:
+            chemin (str): Le fichier SQLite
+            taille_max (int): La taille maximale des résultats rangés
+                (octets de JSON)
+        """
+        self.chemin = chemin
+        self.taille_max = taille_max
+        self.succes = 0
+        self.echecs = 0
+        self._verrou = threading.RLock()
+        self._pid = os.getpid()
+        self._acces = {}
+        self._compteurs = Counter()
+        self._derniere_ecriture = time.monotonic()
+        self._connexion = sqlite3.connect(chemin, timeout=ATTENTE_VERROU,
+                                          isolation_level=None,
+                                          check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        self._connexion.executescript("""
+            CREATE TABLE IF NOT EXISTS resultats (
+                cle TEXT PRIMARY KEY,
+                valeur TEXT NOT NULL,
+                taille INTEGER NOT NULL,
+                acces REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS resultats_acces ON resultats (acces);
+            CREATE TABLE IF NOT EXISTS compteurs (
+                nom TEXT PRIMARY KEY,
+                valeur INTEGER NOT NULL
+            );
+        """)
+
+    def fermer(self) -> None:
+        with self._verrou:
+            self.synchroniser()
+            self._connexion.close()
+
+    def _ecrire_en_attente(self) -> None:
+        """
+        Écrit les dates d'accès et les compteurs gardés en mémoire, dans la
+        transaction d'écriture en cours
+        """
+        self._connexion.executemany(
+            "UPDATE resultats SET acces = MAX(acces, ?) WHERE cle = ?",
+            [(acces, cle) for cle, acces in self._acces.items()])
+        self._connexion.executemany(
+            "INSERT INTO compteurs VALUES (?, ?) "
+            "ON CONFLICT (nom) DO UPDATE SET valeur = valeur + excluded.valeur",
+            list(self._compteurs.items()))
+        self._acces.clear()
+        self._compteurs.clear()
+        self._derniere_ecriture = time.monotonic()
+
+    def synchroniser(self) -> None:
+        """
+        Écrit tout de suite les dates d'accès et les compteurs des lectures
+        """
+        with self._verrou:
+            # après un fork, la connexion appartient au processus parent
+            if os.getpid() != self._pid or \
+                    not (self._acces or self._compteurs):
+                return
+            with self._connexion:
+                self._connexion.execute("BEGIN IMMEDIATE")
+                self._ecrire_en_attente()
+
+    def lire(self, cle: str) -> tuple[bool, object]:
+        """
+        Cherche un résultat
+
+        Args:
+            cle (str): L'empreinte du résultat
+
+        Returns:
+            tuple[bool, object]: Vrai et le résultat s'il est en cache, faux
+            et None sinon
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT valeur FROM resultats WHERE cle = ?",
+                (cle,)).fetchone()
+            if ligne is None:
+                self.echecs += 1
+                self._compteurs["echecs"] += 1
+            else:
+                self.succes += 1
+                self._compteurs["succes"] += 1
+                self._acces[cle] = time.time()
+            if time.monotonic() - self._derniere_ecriture >= DELAI_ECRITURE:
+                self.synchroniser()
+        if ligne is None:
+            return False, None
+        return True, json.loads(ligne[0])
+
+    def ecrire(self, cle: str, valeur) -> None:
+        """
+        Range un résultat, puis supprime les plus anciens si la base dépasse
+        sa taille maximale
+
+        Args:
+            cle (str): L'empreinte du résultat
+            valeur: Le résultat, sérialisable en JSON
+        """
+        texte = json.dumps(valeur)
+        with self._verrou, self._connexion:
+            self._connexion.execute("BEGIN IMMEDIATE")
+            self._ecrire_en_attente()
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?)",
+                (cle, texte, len(texte), time.time()))
+            total, = self._connexion.execute(
+                "SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()
+            if total <= self.taille_max:
+                return
+            evictions = 0
+            for ancienne, taille in self._connexion.execute(
+                    "SELECT cle, taille FROM resultats ORDER BY acces"
+            ).fetchall():
+                if total <= self.taille_max:
+                    break
+                self._connexion.execute(
+                    "DELETE FROM resultats WHERE cle = ?", (ancienne,))
+                total -= taille
+                evictions += 1
+            self._connexion.execute(
+                "INSERT INTO compteurs VALUES ('evictions', ?) "
+                "ON CONFLICT (nom) DO UPDATE SET valeur = valeur + ?",
+                (evictions, evictions))
+
+    def memoise(self, fonction, *parties, transformation=None):
+        """
+        Renvoie le résultat en cache, ou le calcule et le range
+
+        Args:
+            fonction (callable): Le calcul, sans argument
+            parties: Tout ce qui détermine le résultat (voir `empreinte`)
+            transformation (callable | None): Appliquée au résultat relu
+                depuis le JSON (par exemple `tuple`)
+
+        Returns:
+            Le résultat
+        """
+        cle = empreinte(*parties)
+        trouve, valeur = self.lire(cle)
+        if trouve:
+            if transformation is not None and valeur is not None:
+                valeur = transformation(valeur)
+            return valeur
+        valeur = fonction()
+        self.ecrire(cle, valeur)
+        return valeur
+
+    def statistiques(self) -> dict:
+        """
+        Renvoie les compteurs de ce processus et ceux de la base (tous les
+        processus depuis sa création)
+
+        Returns:
+            dict: Succès, échecs, évictions, nombre d'entrées et taille
+        """
+        with self._verrou:
+            self.synchroniser()
+            compteurs = dict(self._connexion.execute(
+                "SELECT nom, valeur FROM compteurs").fetchall())
+            entrees, taille = self._connexion.execute(
+                "SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM resultats"
+            ).fetchone()
+        return {
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "succes_total": compteurs.get("succes", 0),
+            "echecs_total": compteurs.get("echecs", 0),
+            "evictions_total": compteurs.get("evictions", 0),
+            "entrees": entrees,
+            "taille": taille,
+            "taille_max": self.taille_max,
+        }
+
+    def vider(self) -> None:
+        """
+        Supprime tous les résultats et remet les compteurs à zéro
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute("BEGIN IMMEDIATE")
+            self._connexion.execute("DELETE FROM resultats")
+            self._connexion.execute("DELETE FROM compteurs")
+            self._acces.clear()
+            self._compteurs.clear()
+            self.succes = self.echecs = 0
+
+
+def cache(chemin: str = CHEMIN_CACHE) -> CacheResultats:
+    """
+    Renvoie le cache de ce processus pour cette base, ouvert au premier appel
+
+    Le cache est partagé par les threads du processus. Une connexion SQLite
+    ne doit pas passer d'un processus à l'autre : après un fork, le processus
+    enfant ouvre la sienne.
+    """
+    cle = (os.getpid(), chemin)
+    with _verrou_caches:
+        if cle not in _caches:
+            _caches[cle] = CacheResultats(chemin)
+            atexit.register(_caches[cle].synchroniser)
+        return _caches[cle]
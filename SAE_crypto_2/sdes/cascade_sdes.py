@@ -0,0 +1,242 @@
+"""
+Module pour les cascades de SDES à un nombre quelconque de clés
+
+Une cascade de n clés crypte successivement avec chacune d'elles. L'attaque par
+rencontre au milieu généralisée coupe la cascade en deux : les k premières
+clés sont énumérées depuis le clair, les n - k dernières depuis le chiffré, et
+les états intermédiaires identiques sont joints.
+
+Le coût prévu de chaque découpage est calculé avant l'attaque ; le coût mesuré
+l'est pour le découpage choisi, ou pour tous ceux qui tiennent en mémoire
+quand on veut les comparer.
+"""
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .flux_sdes import crypte_octets, decrypte_octets
+from .mitm_sdes import jointure
+from .tables_sdes import NOMBRE_CLES, tables
+
+MEMOIRE_MAX = 1 << 32
+
+
+class RapportDecoupage(NamedTuple):
+    """
+    Coût prévu et coût mesuré d'une rencontre au milieu coupée après
+    `decoupage` clés (les mesures valent None si ce découpage n'a pas été
+    exécuté)
+    """
+    decoupage: int
+    tentatives_prevues: int
+    taille_table: int
+    memoire_prevue: int
+    tentatives: int | None
+    collisions: int | None
+    memoire: int | None
+    temps: float | None
+
+
+class ResultatCascade(NamedTuple):
+    """
+    Résultat d'une attaque par rencontre au milieu sur une cascade
+    """
+    cles: list[tuple[int, ...]]
+    rapport: RapportDecoupage
+    rapports: list[RapportDecoupage]
+
+
+def crypte_cascade_sdes(texte: str, cles) -> str:
+    """
+    Crypte le texte avec une cascade de SDES
+
+    Args:
+        texte (str): Le texte à crypter
+        cles (Sequence[int | SousCles]): Les clés, appliquées dans l'ordre
+
+    Returns:
+        str: Le texte crypté
+    """
+    return crypte_octets(texte.encode("latin-1"), *cles).decode("latin-1")
+
+
+def decrypte_cascade_sdes(texte: str, cles) -> str:
+    """
+    Décrypte le texte crypté avec une cascade de SDES
+
+    Args:
+        texte (str): Le texte à décrypter
+        cles (Sequence[int | SousCles]): Les clés, dans l'ordre du cryptage
+
+    Returns:
+        str: Le texte décrypté
+    """
+    return decrypte_octets(texte.encode("latin-1"), *cles).decode("latin-1")
+
+
+def etats_cascade(octets: bytes, nombre_cles: int,
+                  table: np.ndarray) -> np.ndarray:
+    """
+    Applique toutes les combinaisons de `nombre_cles` clés aux octets
+
+    La ligne `i` correspond aux clés dont l'écriture en base 1024 est `i`
+    (la première clé appliquée est le chiffre de poids fort).
+
+    Args:
+        octets (bytes): Les octets de départ
+        nombre_cles (int): Le nombre de clés à enchaîner
+        table (np.ndarray): La table (1024, 256) à appliquer à chaque étape
+
+    Returns:
+        np.ndarray: Les états, de forme (1024 ** nombre_cles, len(octets))
+    """
+    etats = np.frombuffer(octets, dtype=np.uint8)[None, :]
+    for _ in range(nombre_cles):
+        etats = table[:, etats].transpose(1, 0, 2).reshape(-1, len(octets))
+    return etats
+
+
+def rapport_prevu(nombre_cles: int, decoupage: int,
+                  longueur: int) -> RapportDecoupage:
+    """
+    Estime le coût d'une rencontre au milieu coupée après `decoupage` clés
+
+    Args:
+        nombre_cles (int): Le nombre de clés de la cascade
+        decoupage (int): Le nombre de clés énumérées depuis le clair
+        longueur (int): La longueur du message connu
+
+    Returns:
+        RapportDecoupage: Le rapport, sans les mesures
+    """
+    avant = NOMBRE_CLES ** decoupage
+    arriere = NOMBRE_CLES ** (nombre_cles - decoupage)
+    taille_table = min(avant, arriere)
+    # une ligne d'états et une empreinte 64 bits par entrée, de chaque côté
+    memoire = (avant + arriere) * (longueur + 8)
+    return RapportDecoupage(decoupage, avant + arriere, taille_table, memoire,
+                            None, None, None, None)
+
+
+def rapports_prevus(nombre_cles: int, longueur: int) -> list[RapportDecoupage]:
+    """
+    Estime le coût de chaque découpage possible de la cascade
+
+    Args:
+        nombre_cles (int): Le nombre de clés de la cascade
+        longueur (int): La longueur du message connu
+
+    Returns:
+        list[RapportDecoupage]: Les rapports prévus, du découpage après 1 clé
+        au découpage après `nombre_cles - 1` clés
+    """
+    return [rapport_prevu(nombre_cles, decoupage, longueur)
+            for decoupage in range(1, nombre_cles)]
+
+
+def meilleur_decoupage(nombre_cles: int, longueur: int) -> RapportDecoupage:
+    """
+    Choisit le découpage de la cascade le moins coûteux
+
+    Args:
+        nombre_cles (int): Le nombre de clés de la cascade
+        longueur (int): La longueur du message connu
+
+    Returns:
+        RapportDecoupage: Le rapport prévu du meilleur découpage
+    """
+    return min(rapports_prevus(nombre_cles, longueur),
+               key=lambda rapport: (rapport.tentatives_prevues,
+                                    rapport.memoire_prevue))
+
+
+def _cles_depuis_indices(indices: np.ndarray, nombre_cles: int) -> np.ndarray:
+    """
+    Décompose des indices de lignes en clés (poids fort en premier)
+    """
+    cles = np.empty((len(indices), nombre_cles), dtype=np.int64)
+    for position in reversed(range(nombre_cles)):
+        cles[:, position] = indices % NOMBRE_CLES
+        indices = indices // NOMBRE_CLES
+    return cles
+
+
+def _attaque_decoupage(clair: bytes, chiffre: bytes, nombre_cles: int,
+                       prevu: RapportDecoupage):
+    """
+    Exécute la rencontre au milieu pour un découpage et mesure son coût
+
+    Returns:
+        tuple: Les suites de clés triées et le rapport prévu/mesuré
+    """
+    debut = time.perf_counter()
+    chiffrement, dechiffrement = tables().en_numpy()
+    avant = etats_cascade(clair, prevu.decoupage, chiffrement)
+    # le chiffré est décrypté en remontant la cascade : la dernière clé
+    # appliquée est le chiffre de poids fort de l'indice
+    arriere = etats_cascade(chiffre, nombre_cles - prevu.decoupage,
+                            dechiffrement)
+    indices_avant, indices_arriere, collisions = jointure(avant, arriere)
+    cles_arriere = _cles_depuis_indices(indices_arriere,
+                                        nombre_cles - prevu.decoupage)
+    cles = np.concatenate(
+        (_cles_depuis_indices(indices_avant, prevu.decoupage),
+         cles_arriere[:, ::-1]), axis=1)
+    cles = cles[np.lexsort(cles.T[::-1])]
+    mesure = prevu._replace(tentatives=len(avant) + len(arriere),
+                            collisions=collisions,
+                            memoire=avant.nbytes + arriere.nbytes +
+                            8 * (len(avant) + len(arriere)),
+                            temps=round(time.perf_counter() - debut, 6))
+    return [tuple(ligne) for ligne in cles.tolist()], mesure
+
+
+def rencontre_au_milieu_cascade(clair: bytes, chiffre: bytes,
+                                nombre_cles: int,
+                                decoupage: int | None = None,
+                                memoire_max: int = MEMOIRE_MAX,
+                                comparer: bool = False) -> ResultatCascade:
+    """
+    Trouve toutes les suites de clés compatibles avec le clair et le chiffré
+    d'une cascade de `nombre_cles` SDES
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré, de même longueur
+        nombre_cles (int): Le nombre de clés de la cascade (au moins 2)
+        decoupage (int | None): Le nombre de clés énumérées depuis le clair
+            (le meilleur découpage par défaut)
+        memoire_max (int): La mémoire prévue au-delà de laquelle l'attaque
+            est refusée
+        comparer (bool): Exécute aussi les autres découpages qui tiennent
+            dans `memoire_max`, pour mesurer leur coût
+
+    Returns:
+        ResultatCascade: Les suites de clés triées, le rapport prévu/mesuré
+        du découpage choisi et ceux de tous les découpages envisagés
+    """
+    if len(clair) != len(chiffre):
+        raise ValueError("Le clair et le chiffré doivent avoir la même longueur")
+    if nombre_cles < 2:
+        raise ValueError("Une cascade attaquable compte au moins deux clés")
+    rapports = rapports_prevus(nombre_cles, len(clair))
+    if decoupage is None:
+        prevu = meilleur_decoupage(nombre_cles, len(clair))
+    else:
+        prevu = rapport_prevu(nombre_cles, decoupage, len(clair))
+    if prevu.memoire_prevue > memoire_max:
+        raise MemoryError(f"Découpage après {prevu.decoupage} clés : "
+                          f"{prevu.memoire_prevue} octets prévus, "
+                          f"limite {memoire_max}")
+    cles, mesure = _attaque_decoupage(clair, chiffre, nombre_cles, prevu)
+    for position, rapport in enumerate(rapports):
+        if rapport.decoupage == mesure.decoupage:
+            rapports[position] = mesure
+        elif comparer and rapport.memoire_prevue <= memoire_max:
+            autres_cles, rapports[position] = _attaque_decoupage(
+                clair, chiffre, nombre_cles, rapport)
+            if autres_cles != cles:
+                raise RuntimeError(f"Le découpage après {rapport.decoupage} "
+                                   "clés ne trouve pas les mêmes clés")
+    return ResultatCascade(cles, mesure, rapports)
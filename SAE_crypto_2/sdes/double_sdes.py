@@ -0,0 +1,303 @@
+"""
+Module pour le SDES
+"""
+from collections import namedtuple
+
+from . import tables_sdes
+
+taille_cle = 10
+sous_cle_taille = 8
+longueur_donnee = 8
+f_length = 4
+
+# Tables for initial and final permutations (b1, b2, b3, ... b8)
+initiale_table = (2, 6, 3, 1, 4, 8, 5, 7)
+finale_table = (4, 1, 3, 5, 7, 2, 8, 6)
+
+# Tables for subkey generation (k1, k2, k3, ... k10)
+table_p10 = (3, 5, 2, 7, 4, 10, 1, 9, 8, 6)
+table_p8 = (6, 3, 7, 4, 8, 5, 10, 9)
+
+# Tables for the fk function
+table_ep = (4, 1, 2, 3, 2, 3, 4, 1)
+table_50 = (1, 0, 3, 2, 3, 2, 1, 0, 0, 2, 1, 3, 3, 1, 3, 2)
+table_s1 = (0, 1, 2, 3, 2, 0, 1, 3, 3, 0, 1, 0, 2, 1, 0, 3)
+table_p4 = (2, 4, 3, 1)
+
+
+def permuter(bit_entree: int, la_table_permutation: list):
+    """
+    Permute le byte d'entrée selon la table de permutation donnée
+
+    Args:
+        bit_entree (int): Le bit à permuter
+        la_table_permutation (list): La table de permutation à utiliser
+    """
+    bit_sortie = 0
+    for index, elem in enumerate(la_table_permutation):
+        if index >= elem:
+            bit_sortie |= (bit_entree & (128 >>
+                                         (elem - 1))) >> (index - (elem - 1))
+        else:
+            bit_sortie |= (bit_entree & (128 >>
+                                         (elem - 1))) << ((elem - 1) - index)
+    return bit_sortie
+
+
+def ip(bit_entree):
+    """
+    Effectue la permutation initiale des données
+
+    Args:
+        bit_entree (int): Le bit à permuter
+    """
+    return permuter(bit_entree, initiale_table)
+
+
+def fp(bit_entree):
+    """
+    Effectue la permutation finale des données
+
+    Args:
+        bit_entree (int): Le bit à permuter
+    """
+    return permuter(bit_entree, finale_table)
+
+
+def echange_nibble(bit_entree):
+    """
+    Échange les deux nibbles des données
+
+    Args:
+        bit_entree (int): Le bit à permuter
+    """
+    return (bit_entree << 4 | bit_entree >> 4) & 0xff
+
+
+def calculer_sous_cles(cle):
+    """
+    Calcule les deux sous-clés requises bit à bit
+
+    Args:
+        cle (int): La clé à utiliser
+    """
+
+    def decalage_gauche(liste_bits: list):
+        """
+        Effectue un décalage circulaire à gauche sur les premiers et les deuxièmes cinq bits
+
+        Args:
+            liste_bits (list): La liste de bits à décaler
+        """
+        cle_decalee = [None] * taille_cle
+        cle_decalee[0:9] = liste_bits[1:10]
+        cle_decalee[4] = liste_bits[0]
+        cle_decalee[9] = liste_bits[5]
+        return cle_decalee
+
+    liste_cles = [(cle & 1 << i) >> i for i in reversed(range(taille_cle))]
+    perm_liste_cles = [None] * taille_cle
+    for index, elem in enumerate(table_p10):
+        perm_liste_cles[index] = liste_cles[elem - 1]
+    cle_declage_1 = decalage_gauche(perm_liste_cles)
+    cle_declage_2 = decalage_gauche(decalage_gauche(cle_declage_1))
+    sous_cle1 = sous_cle2 = 0
+    for index, elem in enumerate(table_p8):
+        sous_cle1 += (128 >> index) * cle_declage_1[elem - 1]
+        sous_cle2 += (128 >> index) * cle_declage_2[elem - 1]
+    return (sous_cle1, sous_cle2)
+
+
+class SousCles(namedtuple("SousCles", ("cle", "sous_cle1", "sous_cle2"))):
+    """
+    Clé SDES accompagnée de ses deux sous-clés déjà calculées
+    """
+    __slots__ = ()
+
+
+class CadencementCles:
+    """
+    Cadencement de toutes les clés SDES, calculé une seule fois
+
+    Les sous-clés sont rangées dans `sous_cles` : la première sous-clé de la
+    clé `cle` est à l'indice `2 * cle`, la deuxième à l'indice `2 * cle + 1`.
+    """
+
+    def __init__(self):
+        sous_cles = bytearray(2 * tables_sdes.NOMBRE_CLES)
+        for cle in range(tables_sdes.NOMBRE_CLES):
+            sous_cles[2 * cle], sous_cles[2 * cle + 1] = calculer_sous_cles(cle)
+        self.sous_cles = bytes(sous_cles)
+
+    def __len__(self):
+        return tables_sdes.NOMBRE_CLES
+
+    def __getitem__(self, cle: int) -> SousCles:
+        return SousCles(cle, self.sous_cles[2 * cle],
+                        self.sous_cles[2 * cle + 1])
+
+
+_cadencement = None
+
+
+def cadencement() -> CadencementCles:
+    """
+    Renvoie le cadencement de toutes les clés, calculé au premier appel
+
+    Returns:
+        CadencementCles: Les sous-clés des 1024 clés
+    """
+    global _cadencement
+    if _cadencement is None:
+        _cadencement = CadencementCles()
+    return _cadencement
+
+
+def planifier_cle(cle) -> SousCles:
+    """
+    Renvoie la clé avec ses sous-clés, sans recalcul si elle est déjà planifiée
+
+    Args:
+        cle (int | SousCles): La clé à planifier
+    """
+    if isinstance(cle, SousCles):
+        return cle
+    return cadencement()[cle & 0x3ff]
+
+
+def generer_cles_sous_cles(cle):
+    """
+    Génère les deux sous-clés requises à partir du cadencement précalculé
+
+    Args:
+        cle (int): La clé à utiliser
+    """
+    return planifier_cle(cle)[1:]
+
+
+def fonction_feistel(sous_cle, donnees):
+    """
+    Applique la fonction de Feistel sur les données avec la sous-clé donnée
+
+    Args:
+        sous_cle (int): La sous-clé à utiliser
+        donnees (int): Les données à utiliser
+    """
+
+    def f(sous_cle, nibble_droit):
+        aux = sous_cle ^ permuter(echange_nibble(nibble_droit), table_ep)
+        index1 = ((aux & 0x80) >> 4) + ((aux & 0x40) >> 5) + \
+                 ((aux & 0x20) >> 5) + ((aux & 0x10) >> 2)
+        index2 = ((aux & 0x08) >> 0) + ((aux & 0x04) >> 1) + \
+                 ((aux & 0x02) >> 1) + ((aux & 0x01) << 2)
+        sortie_sbox = echange_nibble((table_50[index1] << 2) +
+                                     table_s1[index2])
+        return permuter(sortie_sbox, table_p4)
+
+    nibble_gauche, nibble_droit = donnees & 0xf0, donnees & 0x0f
+    return (nibble_gauche ^ f(sous_cle, nibble_droit)) | nibble_droit
+
+
+def crypter_bits(cle, le_texte):
+    """
+    Crypte le texte clair avec la clé donnée en calculant chaque permutation
+
+    Args:
+        cle (int | SousCles): La clé à utiliser, éventuellement déjà planifiée
+        le_texte (str): Le texte clair à crypter
+    """
+    sous_cles = planifier_cle(cle)
+    donnees = fonction_feistel(sous_cles.sous_cle1, ip(le_texte))
+    return fp(fonction_feistel(sous_cles.sous_cle2, echange_nibble(donnees)))
+
+
+def decrypt_bits(key, ciphertext):
+    """Decrypt ciphertext with given (possibly scheduled) key, bit by bit"""
+    sous_cles = planifier_cle(key)
+    donnees = fonction_feistel(sous_cles.sous_cle2, ip(ciphertext))
+    return fp(fonction_feistel(sous_cles.sous_cle1, echange_nibble(donnees)))
+
+
+def crypter(cle, le_texte):
+    """
+    Crypte le texte clair avec la clé donnée à partir du dictionnaire de codes
+
+    Args:
+        cle (int | SousCles): La clé à utiliser, éventuellement déjà planifiée
+        le_texte (str): Le texte clair à crypter
+    """
+    if isinstance(cle, SousCles):
+        cle = cle.cle
+    # comme le calcul bit à bit, seuls les 10 bits de la clé et les 8 bits du
+    # texte comptent
+    return tables_sdes.tables().chiffrement[(cle & 0x3ff) << 8
+                                            | le_texte & 0xff]
+
+
+def decrypt(key, ciphertext):
+    """Decrypt ciphertext with given (possibly scheduled) key via codebook"""
+    if isinstance(key, SousCles):
+        key = key.cle
+    return tables_sdes.tables().dechiffrement[(key & 0x3ff) << 8
+                                              | ciphertext & 0xff]
+
+
+"""
+Module pour la stéganographie sur les images
+"""
+
+
+if __name__ == "__main__":
+    from sdes import crypte_double_sdes, decrypte_double_sdes, cassage_astucieux, cassage_brutal
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    # In [2]:
+    a = crypte_double_sdes("Je m'appelle Baptiste", 0b00000000, 0b11111111)
+    b = decrypte_double_sdes(a, 0b00000000, 0b11111111)
+
+    res_brutal = cassage_brutal("Je m'appelle Baptiste", a)
+    res_astucieux = cassage_astucieux("Je m'appelle Baptiste", a)
+
+    # Données
+    categories = ['Nombre tentatives', 'Temps mis']
+    tentatives = [res_astucieux[2], res_brutal[2]]
+    temps = [res_astucieux[3], res_brutal[3]]
+
+    # Création du graphique
+    fig, ax = plt.subplots()
+
+    ax.set_ylim(0, max(tentatives) + 1000)
+    ax.set_title("Comparaion cassage double SDES")
+    ax.set_ylabel("Nombre de tentatives")
+    ax.set_xticks(np.arange(len(categories)))
+    ax.set_xticklabels(categories)
+
+    # Création des barres
+    barres1 = ax.bar(np.arange(1) -0.2, tentatives[0], 0.4, label="Brutal", color="steelblue")
+    barres2 = ax.bar(np.arange(1) +0.2, tentatives[1], 0.4, label="Astucieux", color="orange")
+
+    ax.legend()
+    axe2 = ax.twinx()
+    axe2.set_ylabel("Temps mis (s)")
+    axe2.set_ylim(0, max(temps) + 2)
+    bar1 = axe2.bar(np.arange(1) + 1 -0.2, temps[0], 0.4, color="steelblue")
+    bar2 = axe2.bar(np.arange(1) + 1 +0.2, temps[1], 0.4, color="orange")
+
+    # Ajout des valeurs au dessus des barres
+    def ajouter_valeur(barres, axe):
+        for barre in barres:
+            hauteur = barre.get_height()
+            axe.annotate('{}'.format(hauteur),
+                        xy=(barre.get_x() + barre.get_width() / 2, hauteur),
+                        xytext=(0, 3),
+                        textcoords="offset points",
+                        ha='center', va='bottom')
+
+    ajouter_valeur(barres1, ax)
+    ajouter_valeur(barres2, ax)
+    ajouter_valeur(bar1, axe2)
+    ajouter_valeur(bar2, axe2)
+
+    # Affichage du graphique
+    plt.show()
@@ -0,0 +1,69 @@
+"""
+Module pour le filtrage progressif des paires de clés du double SDES
+
+Au lieu de crypter tout le message pour chaque paire de clés, les paires sont
+d'abord filtrées sur le premier octet grâce à un index (entrée, sortie) -> clés
+précalculé, puis sur quelques octets suivants, et seules les survivantes sont
+vérifiées sur le message entier. Le coût ne dépend presque plus de la longueur
+du message.
+"""
+from .tables_sdes import NOMBRE_BLOCS, NOMBRE_CLES, tables
+
+LONGUEUR_PREFIXE = 4
+
+_index = None
+
+
+def index_inverse() -> list[tuple[int, ...]]:
+    """
+    Renvoie l'index des clés qui envoient chaque octet d'entrée sur chaque octet
+    de sortie, construit au premier appel
+
+    Returns:
+        list: À l'indice `entree << 8 | sortie`, les clés (triées) telles que
+        crypter(cle, entree) == sortie
+    """
+    global _index
+    if _index is None:
+        chiffrement = tables().chiffrement
+        index = [[] for _ in range(NOMBRE_BLOCS * NOMBRE_BLOCS)]
+        for cle in range(NOMBRE_CLES):
+            base = cle << 8
+            for entree in range(NOMBRE_BLOCS):
+                index[entree << 8 | chiffrement[base | entree]].append(cle)
+        _index = [tuple(cles) for cles in index]
+    return _index
+
+
+def paires_candidates(clair: bytes, chiffre: bytes, progression=None):
+    """
+    Énumère dans l'ordre (cle1, cle2) les paires de clés qui font passer du
+    clair au chiffré, en filtrant progressivement
+
+    Args:
+        clair (bytes): Le message clair (non vide)
+        chiffre (bytes): Le message chiffré, de même longueur
+        progression (callable | None): Appelée avec (tentatives, total)
+            après chaque première clé
+
+    Yields:
+        tuple[int, int]: Les paires de clés compatibles avec tout le message
+    """
+    table = tables()
+    chiffrement = table.chiffrement
+    index = index_inverse()
+    premier_chiffre = chiffre[0]
+    prefixe = list(zip(clair[1:LONGUEUR_PREFIXE], chiffre[1:LONGUEUR_PREFIXE]))
+    for cle1 in range(NOMBRE_CLES):
+        base1 = cle1 << 8
+        milieu = chiffrement[base1 | clair[0]]
+        for cle2 in index[milieu << 8 | premier_chiffre]:
+            base2 = cle2 << 8
+            if all(chiffrement[base2 | chiffrement[base1 | octet_clair]]
+                   == octet_chiffre for octet_clair, octet_chiffre in prefixe):
+                if len(clair) <= LONGUEUR_PREFIXE or clair.translate(
+                        table.ligne_chiffrement(cle1)).translate(
+                            table.ligne_chiffrement(cle2)) == chiffre:
+                    yield (cle1, cle2)
+        if progression is not None:
+            progression((cle1 + 1) * NOMBRE_CLES, NOMBRE_CLES * NOMBRE_CLES)
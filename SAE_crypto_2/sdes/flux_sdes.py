@@ -0,0 +1,145 @@
+"""
+Module pour le chiffrement SDES de données binaires et de fichiers
+
+Pour des clés fixées, le SDES simple ou double n'est qu'une substitution de
+256 octets : les données sont donc traduites d'un bloc avec `bytes.translate`,
+et les fichiers sont traités par morceaux à mémoire constante.
+"""
+from .double_sdes import SousCles
+from .tables_sdes import NOMBRE_CLES, tables
+
+TAILLE_MORCEAU = 1 << 20
+IDENTITE = bytes(range(256))
+
+
+def _indice_cle(cle) -> int:
+    """
+    Renvoie la clé sous forme d'entier
+
+    Args:
+        cle (int | SousCles): La clé, éventuellement déjà planifiée
+    """
+    indice = cle.cle if isinstance(cle, SousCles) else cle
+    if not 0 <= indice < NOMBRE_CLES:
+        raise ValueError(f"Clé SDES hors de [0, {NOMBRE_CLES}[ : {indice}")
+    return indice
+
+
+def table_substitution(*cles, dechiffrer: bool = False) -> bytes:
+    """
+    Compose la table de substitution des clés données, appliquées dans l'ordre
+
+    Args:
+        cles (int | SousCles): Les clés du chiffrement (une pour le SDES simple,
+            deux pour le double SDES)
+        dechiffrer (bool): Renvoie la table du déchiffrement si vrai
+
+    Returns:
+        bytes: La table de 256 octets à donner à `bytes.translate`
+    """
+    table = tables()
+    substitution = IDENTITE
+    if dechiffrer:
+        for cle in reversed(cles):
+            substitution = substitution.translate(
+                table.ligne_dechiffrement(_indice_cle(cle)))
+    else:
+        for cle in cles:
+            substitution = substitution.translate(
+                table.ligne_chiffrement(_indice_cle(cle)))
+    return substitution
+
+
+def crypte_octets(donnees, *cles) -> bytes:
+    """
+    Crypte des données binaires avec les clés données
+
+    Args:
+        donnees (bytes | bytearray | memoryview): Les données à crypter
+        cles (int | SousCles): Les clés du chiffrement
+
+    Returns:
+        bytes: Les données cryptées
+    """
+    return bytes(donnees).translate(table_substitution(*cles))
+
+
+def decrypte_octets(donnees, *cles) -> bytes:
+    """
+    Décrypte des données binaires avec les clés données
+
+    Args:
+        donnees (bytes | bytearray | memoryview): Les données à décrypter
+        cles (int | SousCles): Les clés du chiffrement, dans l'ordre du cryptage
+
+    Returns:
+        bytes: Les données décryptées
+    """
+    return bytes(donnees).translate(table_substitution(*cles,
+                                                       dechiffrer=True))
+
+
+def traduit_flux(entree, sortie, substitution: bytes,
+                 taille_morceau: int = TAILLE_MORCEAU) -> int:
+    """
+    Applique une table de substitution à un flux binaire, morceau par morceau
+
+    Args:
+        entree: Le flux binaire à lire (doit avoir `readinto`)
+        sortie: Le flux binaire où écrire
+        substitution (bytes): La table de 256 octets
+        taille_morceau (int): La taille du tampon de lecture
+
+    Returns:
+        int: Le nombre d'octets traités
+    """
+    tampon = bytearray(taille_morceau)
+    vue = memoryview(tampon)
+    total = 0
+    while True:
+        nombre_lus = entree.readinto(tampon)
+        if not nombre_lus:
+            return total
+        if nombre_lus == taille_morceau:
+            sortie.write(tampon.translate(substitution))
+        else:
+            sortie.write(vue[:nombre_lus].tobytes().translate(substitution))
+        total += nombre_lus
+
+
+def crypte_flux(entree, sortie, *cles,
+                taille_morceau: int = TAILLE_MORCEAU) -> int:
+    """
+    Crypte un flux binaire avec les clés données, à mémoire constante
+
+    Args:
+        entree: Le flux binaire à lire
+        sortie: Le flux binaire où écrire
+        cles (int | SousCles): Les clés du chiffrement
+        taille_morceau (int): La taille du tampon de lecture
+
+    Returns:
+        int: Le nombre d'octets cryptés
+    """
+    return traduit_flux(entree, sortie, table_substitution(*cles),
+                        taille_morceau)
+
+
+def decrypte_flux(entree, sortie, *cles,
+                  taille_morceau: int = TAILLE_MORCEAU) -> int:
+    """
+    Décrypte un flux binaire avec les clés données, à mémoire constante
+
+    Args:
+        entree: Le flux binaire à lire
+        sortie: Le flux binaire où écrire
+        cles (int | SousCles): Les clés du chiffrement, dans l'ordre du cryptage
+        taille_morceau (int): La taille du tampon de lecture
+
+    Returns:
+        int: Le nombre d'octets décryptés
+    """
+    return traduit_flux(entree, sortie,
+                        table_substitution(*cles, dechiffrer=True),
+                        taille_morceau)
+
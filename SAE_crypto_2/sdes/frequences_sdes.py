@@ -0,0 +1,129 @@
+"""
+Module pour le cassage du double SDES à partir du seul message chiffré
+
+Un modèle de fréquences des octets est appris sur des textes français. Pour
+une paire de clés, l'histogramme du texte décrypté n'est qu'une permutation de
+l'histogramme du chiffré : le score d'une paire se calcule donc par lecture
+dans des tables, sans décrypter le message, et toutes les paires de clés sont
+classées d'un bloc avec NumPy.
+"""
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from .tables_sdes import NOMBRE_BLOCS, NOMBRE_CLES, tables
+
+DOSSIER_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              os.pardir)
+CORPUS = (os.path.join(DOSSIER_CORPUS, "arsene_lupin_extrait.txt"),
+          os.path.join(DOSSIER_CORPUS, "lettres_persanes.txt"))
+TAILLE_BLOC = 64
+
+
+class Candidat(NamedTuple):
+    """
+    Paire de clés classée par le cassage fréquentiel
+    """
+    cle1: int
+    cle2: int
+    score: float
+
+
+def modele_frequences(chemins=CORPUS, encodage: str = "latin-1") -> np.ndarray:
+    """
+    Apprend la fréquence de chaque octet sur un corpus de textes
+
+    Args:
+        chemins (Iterable[str]): Les fichiers texte (UTF-8) du corpus
+        encodage (str): L'encodage des messages qui seront attaqués
+
+    Returns:
+        np.ndarray: Les 256 probabilités, lissées pour qu'aucune ne soit nulle
+    """
+    comptes = np.ones(NOMBRE_BLOCS, dtype=np.float64)
+    for chemin in chemins:
+        with open(chemin, encoding="utf-8") as fichier:
+            octets = fichier.read().encode(encodage, errors="ignore")
+        comptes += np.bincount(np.frombuffer(octets, dtype=np.uint8),
+                               minlength=NOMBRE_BLOCS)
+    return comptes / comptes.sum()
+
+
+def classer_paires(chiffre: bytes,
+                   modele: np.ndarray | None = None,
+                   nombre: int = 10,
+                   methode: str = "vraisemblance") -> list[Candidat]:
+    """
+    Classe toutes les paires de clés du double SDES selon la ressemblance du
+    texte décrypté avec le modèle de fréquences
+
+    Args:
+        chiffre (bytes): Le message chiffré
+        modele (np.ndarray | None): Les probabilités des octets (celles du
+            corpus français fourni par défaut)
+        nombre (int): Le nombre de paires à renvoyer
+        methode (str): "vraisemblance" (log-vraisemblance, plus grand = mieux)
+            ou "khi2" (khi carré, plus petit = mieux)
+
+    Returns:
+        list[Candidat]: Les meilleures paires, de la plus probable à la moins
+        probable
+    """
+    if modele is None:
+        modele = modele_frequences()
+    scores = scores_paires(chiffre, modele, methode)
+    if methode == "vraisemblance":
+        scores = -scores
+    nombre = min(nombre, scores.size)
+    meilleurs = np.argpartition(scores, nombre - 1, axis=None)[:nombre]
+    meilleurs = meilleurs[np.argsort(scores.ravel()[meilleurs], kind="stable")]
+    signe = -1.0 if methode == "vraisemblance" else 1.0
+    return [Candidat(int(indice) // NOMBRE_CLES, int(indice) % NOMBRE_CLES,
+                     signe * float(scores.ravel()[indice]))
+            for indice in meilleurs]
+
+
+def scores_paires(chiffre: bytes, modele: np.ndarray,
+                  methode: str = "vraisemblance") -> np.ndarray:
+    """
+    Calcule le score de chacune des 2^20 paires de clés
+
+    Seuls les octets présents dans le chiffré interviennent : pour chaque
+    deuxième clé, on lit l'octet intermédiaire, puis pour chaque première clé
+    la probabilité de l'octet clair correspondant.
+
+    Args:
+        chiffre (bytes): Le message chiffré
+        modele (np.ndarray): Les probabilités des octets
+        methode (str): "vraisemblance" ou "khi2"
+
+    Returns:
+        np.ndarray: Les scores, de forme (1024, 1024) indexée par (cle1, cle2)
+    """
+    if methode not in ("vraisemblance", "khi2"):
+        raise ValueError(f"Méthode de score inconnue : {methode}")
+    _, dechiffrement = tables().en_numpy()
+    histogramme = np.bincount(np.frombuffer(chiffre, dtype=np.uint8),
+                              minlength=NOMBRE_BLOCS)
+    presents = np.nonzero(histogramme)[0]
+    poids = histogramme[presents].astype(np.float64)
+    longueur = poids.sum()
+    # octet intermédiaire de chaque octet présent, pour chaque deuxième clé
+    milieux = dechiffrement[:, presents]
+    if methode == "vraisemblance":
+        valeurs = np.log(modele)[dechiffrement]
+    else:
+        valeurs = modele[dechiffrement]
+    scores = np.empty((NOMBRE_CLES, NOMBRE_CLES), dtype=np.float64)
+    for debut in range(0, NOMBRE_CLES, TAILLE_BLOC):
+        bloc = valeurs[debut:debut + TAILLE_BLOC][:, milieux]
+        if methode == "vraisemblance":
+            scores[debut:debut + TAILLE_BLOC] = bloc @ poids
+        else:
+            attendus = longueur * bloc
+            scores[debut:debut + TAILLE_BLOC] = (
+                ((poids - attendus)**2 / attendus).sum(axis=-1) +
+                longueur * (1.0 - bloc.sum(axis=-1)))
+    return scores
+
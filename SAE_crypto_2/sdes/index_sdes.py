@@ -0,0 +1,278 @@
+"""
+Module pour l'index inverse des permutations du double SDES
+
+Avec des clés fixées, le double SDES est une permutation des 256 octets, et
+beaucoup de paires (cle1, cle2) donnent la même. L'index regroupe les 2^20
+paires par permutation composée : retrouver les paires équivalentes à partir
+de quelques octets clairs/chiffrés devient une recherche dans l'index.
+
+Pour la recherche, l'index garde aussi, pour chaque (octet d'entrée, octet de
+sortie), les clés simples qui envoient l'un sur l'autre. Le premier octet
+connu donne ainsi directement les quelque 4 000 paires (cle1, cle2)
+compatibles, donc leurs permutations ; seules celles-ci sont vérifiées sur
+les octets suivants.
+
+Sur les 2^20 paires, il n'y a que 982 643 permutations distinctes. L'index
+tient en 13 Mo (`python -m sdes index`) ; son chemin se change avec la
+variable d'environnement SDES_INDEX.
+"""
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .mitm_sdes import MULTIPLICATEUR
+from .tables_sdes import NOMBRE_BLOCS, NOMBRE_CLES, tables
+
+CHEMIN_INDEX = os.environ.get(
+    "SDES_INDEX",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "index_sdes.npz"))
+
+_index_charge = None
+
+
+class IndexPermutations(NamedTuple):
+    """
+    Index des permutations composées du double SDES
+
+    La paire (cle1, cle2) porte le numéro `cle1 * 1024 + cle2`. Les paires qui
+    donnent la permutation numéro i sont `paires[debuts[i]:debuts[i + 1]]`,
+    et `identifiants[numero]` est la permutation de la paire `numero`.
+    Les permutations ne sont pas stockées : la première paire de chaque groupe
+    sert de représentant et sa permutation se relit dans le codebook.
+
+    Les clés simples qui envoient l'octet x sur l'octet y sont
+    `cles_sorties[debuts_sorties[g]:debuts_sorties[g + 1]]`, avec
+    `g = x << 8 | y`.
+    """
+    paires: np.ndarray
+    debuts: np.ndarray
+    identifiants: np.ndarray
+    cles_sorties: np.ndarray
+    debuts_sorties: np.ndarray
+
+    @property
+    def nombre_permutations(self) -> int:
+        """
+        Le nombre de permutations distinctes de l'espace des clés
+        """
+        return len(self.debuts) - 1
+
+    def representants(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Renvoie les clés (cle1, cle2) du représentant de chaque permutation
+        """
+        numeros = self.paires[self.debuts[:-1]]
+        return numeros // NOMBRE_CLES, numeros % NOMBRE_CLES
+
+    def permutation(self, identifiant: int) -> bytes:
+        """
+        Renvoie la permutation numéro `identifiant`, sous forme de table de
+        256 octets utilisable avec `bytes.translate`
+        """
+        numero = int(self.paires[self.debuts[identifiant]])
+        chiffrement = tables().chiffrement
+        return bytes(chiffrement[(numero % NOMBRE_CLES) << 8 |
+                                 chiffrement[(numero // NOMBRE_CLES) << 8 | x]]
+                     for x in range(NOMBRE_BLOCS))
+
+    def paires_de(self, identifiant: int) -> list[tuple[int, int]]:
+        """
+        Renvoie les paires de clés qui donnent la permutation numéro
+        `identifiant`
+        """
+        numeros = self.paires[self.debuts[identifiant]:
+                              self.debuts[identifiant + 1]]
+        return [(int(numero) // NOMBRE_CLES, int(numero) % NOMBRE_CLES)
+                for numero in numeros]
+
+    def _candidates(self, octet_clair: int,
+                    octet_chiffre: int) -> np.ndarray:
+        """
+        Renvoie les numéros (triés) des permutations qui envoient
+        `octet_clair` sur `octet_chiffre`
+
+        Pour chaque première clé, les deuxièmes clés possibles se lisent
+        dans le groupe (octet intermédiaire, octet chiffré) de l'index.
+        """
+        chiffrement, _ = tables().en_numpy()
+        groupes = chiffrement[:, octet_clair].astype(np.int64) << 8 \
+            | octet_chiffre
+        debuts = self.debuts_sorties[groupes].astype(np.int64)
+        longueurs = self.debuts_sorties[groupes + 1] - debuts
+        # positions dans cles_sorties de tous les groupes mis bout à bout
+        decalages = np.repeat(debuts - (np.cumsum(longueurs) - longueurs),
+                              longueurs)
+        cles2 = self.cles_sorties[
+            np.arange(int(longueurs.sum())) + decalages]
+        cles1 = np.repeat(np.arange(NOMBRE_CLES, dtype=np.int64), longueurs)
+        return np.unique(self.identifiants[cles1 * NOMBRE_CLES + cles2])
+
+    def recherche_permutations(self, clair: bytes,
+                               chiffre: bytes) -> np.ndarray:
+        """
+        Renvoie les numéros des permutations qui envoient les octets de
+        `clair` sur ceux de `chiffre`
+
+        Args:
+            clair (bytes): Quelques octets clairs
+            chiffre (bytes): Les octets chiffrés correspondants
+
+        Returns:
+            np.ndarray: Les numéros des permutations compatibles
+        """
+        if len(clair) != len(chiffre):
+            raise ValueError(
+                "Le clair et le chiffré doivent avoir la même longueur")
+        correspondances = {}
+        for octet_clair, octet_chiffre in zip(clair, chiffre):
+            if correspondances.setdefault(octet_clair,
+                                          octet_chiffre) != octet_chiffre:
+                # un même octet chiffré de deux façons : aucune permutation
+                return np.empty(0, dtype=np.uint32)
+        if not correspondances:
+            return np.arange(self.nombre_permutations, dtype=np.uint32)
+        correspondances = iter(correspondances.items())
+        identifiants = self._candidates(*next(correspondances)).astype(
+            np.uint32)
+        chiffrement, _ = tables().en_numpy()
+        numeros = self.paires[self.debuts[identifiants]]
+        cles1, cles2 = numeros // NOMBRE_CLES, numeros % NOMBRE_CLES
+        # seules les candidates du premier octet sont vérifiées sur les
+        # suivants ; on s'arrête dès qu'il ne reste plus rien
+        for octet_clair, octet_chiffre in correspondances:
+            if not len(identifiants):
+                break
+            compatibles = chiffrement[
+                cles2, chiffrement[cles1, octet_clair]] == octet_chiffre
+            identifiants = identifiants[compatibles]
+            cles1, cles2 = cles1[compatibles], cles2[compatibles]
+        return identifiants
+
+    def recherche(self, clair: bytes,
+                  chiffre: bytes) -> list[tuple[int, int]]:
+        """
+        Renvoie toutes les paires de clés qui envoient les octets de `clair`
+        sur ceux de `chiffre`
+
+        Args:
+            clair (bytes): Quelques octets clairs
+            chiffre (bytes): Les octets chiffrés correspondants
+
+        Returns:
+            list[tuple[int, int]]: Les paires (cle1, cle2), triées
+        """
+        numeros = sorted(int(numero)
+                         for identifiant in self.recherche_permutations(
+                             clair, chiffre)
+                         for numero in self.paires[
+                             self.debuts[identifiant]:
+                             self.debuts[identifiant + 1]])
+        return [(numero // NOMBRE_CLES, numero % NOMBRE_CLES)
+                for numero in numeros]
+
+
+def _empreintes_lignes(permutations: np.ndarray) -> np.ndarray:
+    """
+    Calcule une empreinte 64 bits de chaque permutation (ligne de 256 octets)
+    """
+    mots = permutations.view(np.uint64)
+    empreintes = np.zeros(len(permutations), dtype=np.uint64)
+    for colonne in mots.T:
+        empreintes = empreintes * MULTIPLICATEUR ^ colonne
+    return empreintes
+
+
+def construire_index() -> tuple[IndexPermutations, float]:
+    """
+    Calcule la permutation composée de chaque paire de clés et les regroupe
+
+    Returns:
+        tuple: L'index et le temps de construction
+    """
+    debut = time.perf_counter()
+    chiffrement, _ = tables().en_numpy()
+    chiffrement = np.ascontiguousarray(chiffrement)
+    empreintes = np.empty(NOMBRE_CLES * NOMBRE_CLES, dtype=np.uint64)
+    for cle1 in range(NOMBRE_CLES):
+        # composees[cle2, x] = crypter(cle2, crypter(cle1, x))
+        composees = np.ascontiguousarray(chiffrement[:, chiffrement[cle1]])
+        empreintes[cle1 * NOMBRE_CLES:(cle1 + 1) * NOMBRE_CLES] = \
+            _empreintes_lignes(composees)
+    _, identifiants = np.unique(empreintes, return_inverse=True)
+    identifiants = identifiants.astype(np.uint32).ravel()
+    paires = np.argsort(identifiants, kind="stable").astype(np.uint32)
+    debuts = np.searchsorted(identifiants[paires],
+                             np.arange(identifiants.max() + 2)).astype(
+                                 np.uint32)
+    # index des clés simples par (entrée, sortie)
+    codes = (np.arange(NOMBRE_BLOCS) << 8 | chiffrement).ravel()
+    ordre = np.argsort(codes, kind="stable")
+    cles_sorties = (ordre // NOMBRE_BLOCS).astype(np.uint16)
+    debuts_sorties = np.searchsorted(
+        codes[ordre], np.arange(NOMBRE_BLOCS * NOMBRE_BLOCS + 1)).astype(
+            np.uint32)
+    index = IndexPermutations(paires, debuts, identifiants, cles_sorties,
+                              debuts_sorties)
+    # vérification : deux permutations différentes ne partagent pas
+    # d'empreinte, chaque paire a bien la permutation de son représentant
+    cles1, cles2 = index.representants()
+    for cle1 in range(NOMBRE_CLES):
+        bloc = identifiants[cle1 * NOMBRE_CLES:(cle1 + 1) * NOMBRE_CLES]
+        attendues = chiffrement[cles2[bloc, None],
+                                chiffrement[cles1[bloc]]]
+        if not np.array_equal(chiffrement[:, chiffrement[cle1]], attendues):
+            raise RuntimeError("Collision d'empreintes dans l'index")
+    return index, time.perf_counter() - debut
+
+
+def sauvegarder_index(index: IndexPermutations,
+                      chemin: str = CHEMIN_INDEX) -> None:
+    """
+    Enregistre l'index dans un fichier .npz (13 Mo environ), de façon
+    atomique
+
+    Args:
+        index (IndexPermutations): L'index construit
+        chemin (str): Le fichier de destination
+    """
+    temporaire = f"{chemin}.{os.getpid()}.tmp.npz"
+    np.savez(temporaire, **index._asdict())
+    os.replace(temporaire, chemin)
+
+
+def charger_index(chemin: str = CHEMIN_INDEX) -> IndexPermutations:
+    """
+    Charge l'index depuis le fichier, en le construisant et en l'enregistrant
+    d'abord s'il n'existe pas
+
+    Args:
+        chemin (str): Le fichier de l'index
+
+    Returns:
+        IndexPermutations: L'index des permutations
+    """
+    if os.path.exists(chemin):
+        with np.load(chemin) as donnees:
+            # un index d'une version précédente, incomplet, est reconstruit
+            if all(champ in donnees for champ in IndexPermutations._fields):
+                return IndexPermutations(
+                    **{champ: donnees[champ]
+                       for champ in IndexPermutations._fields})
+    index, _ = construire_index()
+    try:
+        sauvegarder_index(index, chemin)
+    except OSError:
+        pass
+    return index
+
+
+def index() -> IndexPermutations:
+    """
+    Renvoie l'index du processus courant, chargé au premier appel
+    """
+    global _index_charge
+    if _index_charge is None:
+        _index_charge = charger_index()
+    return _index_charge
@@ -0,0 +1,377 @@
+"""
+Module pour mesurer les attaques pendant qu'elles tournent
+
+Une `Instrumentation` passée à une attaque reçoit le temps de chacune de ses
+étapes (construction des tables, recherche, lecture, décryptage...), compte
+les clés essayées et appelle régulièrement une fonction de progression avec
+le débit et le temps restant estimé. Ses mesures sont un dictionnaire
+sérialisable en JSON.
+
+Sans instrumentation, les attaques reçoivent `INACTIVE`, dont les méthodes ne
+font rien ; les appels sont placés hors des boucles internes pour que leur
+coût reste négligeable. Deux variables d'environnement instrumentent tous
+les appels sans toucher au code :
+
+    SDES_METRIQUES=mesures.jsonl   ajoute les mesures de chaque appel au
+                                   fichier, une ligne JSON par appel
+    SDES_PROFIL=cprofile,tracemalloc
+                                   ajoute aux mesures les fonctions les plus
+                                   coûteuses et les plus grosses allocations
+
+Les profileurs et `json` ne sont importés que lorsqu'ils servent, pour que
+l'import du paquet reste rapide.
+"""
+import os
+import sys
+import threading
+import time
+from typing import NamedTuple
+
+METRIQUES = os.environ.get("SDES_METRIQUES")
+PROFIL = tuple(nom.strip() for nom in
+               os.environ.get("SDES_PROFIL", "").split(",") if nom.strip())
+PROFILEURS = ("cprofile", "tracemalloc")
+# délai minimal (s) entre deux appels de la fonction de progression
+INTERVALLE_PROGRESSION = 0.5
+# fonctions et allocations gardées dans les mesures
+NOMBRE_PROFIL = 20
+
+
+class Progression(NamedTuple):
+    """
+    Ce que reçoit la fonction de progression
+    """
+    nom: str
+    faites: int
+    total: int | None
+    par_seconde: float
+    reste: float | None
+    temps: float
+
+
+class Instrumentation:
+    """
+    Mesures d'un appel : étapes, compteurs, progression et profil
+    """
+
+    def __init__(self, nom: str = "", progression=None,
+                 intervalle: float = INTERVALLE_PROGRESSION,
+                 profil=PROFIL, sortie: str | None = METRIQUES):
+        """
+        Args:
+            nom (str): Le nom de l'appel mesuré (par défaut celui de
+                l'attaque)
+            progression (callable | None): Appelée avec une `Progression` au
+                plus toutes les `intervalle` secondes, puis à la fin
+            intervalle (float): Le délai minimal entre deux appels
+            profil (Iterable[str]): "cprofile" et/ou "tracemalloc"
+            sortie (str | None): Le fichier JSON lines où ajouter les mesures
+                à la fin de l'appel
+        """
+        for profileur in profil:
+            if profileur not in PROFILEURS:
+                raise ValueError(f"Profileur inconnu : {profileur}")
+        self.nom = nom
+        self.progression = progression
+        self.intervalle = intervalle
+        self.profil = tuple(profil)
+        self.sortie = sortie
+        self.etapes = {}
+        self.compteurs = {}
+        self.faites = 0
+        self.total = None
+        self.debut = self.fin = None
+        self.profileur = None
+        self.memoire = None
+        self._verrou = threading.Lock()
+        self._profondeur = 0
+        self._horloge = 0.0
+        self._arret = None
+        self._prochain_rapport = 0.0
+        self._tracemalloc_lance = False
+
+    def __enter__(self):
+        self._profondeur += 1
+        if self._profondeur == 1:
+            self._demarrer()
+        return self
+
+    def __exit__(self, *exception):
+        self._profondeur -= 1
+        if self._profondeur == 0:
+            self._arreter()
+        return False
+
+    def _demarrer(self) -> None:
+        """
+        Remet les mesures à zéro et lance les profileurs demandés
+        """
+        self.etapes.clear()
+        self.compteurs.clear()
+        self.faites = 0
+        self.total = None
+        self.debut, self.fin = time.time(), None
+        self._horloge, self._arret = time.perf_counter(), None
+        self._prochain_rapport = self._horloge + self.intervalle
+        if "tracemalloc" in self.profil:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_lance = True
+        if "cprofile" in self.profil:
+            import cProfile
+
+            self.profileur = cProfile.Profile()
+            try:
+                self.profileur.enable()
+            except ValueError:  # un autre profileur tourne déjà
+                self.profileur = None
+
+    def _arreter(self) -> None:
+        """
+        Arrête les profileurs, envoie la dernière progression et écrit les
+        mesures si une sortie est donnée
+        """
+        if self.profileur is not None:
+            self.profileur.disable()
+        if self._tracemalloc_lance:
+            import tracemalloc
+
+            actuelle, pic = tracemalloc.get_traced_memory()
+            instantane = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._tracemalloc_lance = False
+            self.memoire = {
+                "actuelle": actuelle,
+                "pic": pic,
+                "allocations": [
+                    {"lieu": str(statistique.traceback),
+                     "taille": statistique.size,
+                     "nombre": statistique.count}
+                    for statistique in
+                    instantane.statistics("lineno")[:NOMBRE_PROFIL]],
+            }
+        self.fin, self._arret = time.time(), time.perf_counter()
+        if self.progression is not None:
+            self.progression(self.etat())
+        if self.sortie:
+            self.ecrire(self.sortie)
+
+    def etape(self, nom: str) -> "_Etape":
+        """
+        Chronomètre une étape : `with mesures.etape("recherche"): ...`
+
+        Les temps d'une même étape s'additionnent, y compris depuis
+        plusieurs threads.
+        """
+        return _Etape(self, nom)
+
+    def ajoute_temps(self, nom: str, temps: float, appels: int = 1) -> None:
+        """
+        Ajoute un temps mesuré à part au total d'une étape
+        """
+        with self._verrou:
+            etape = self.etapes.setdefault(nom, [0.0, 0])
+            etape[0] += temps
+            etape[1] += appels
+
+    def chronometre(self, nom: str, elements):
+        """
+        Ajoute à l'étape `nom` le temps passé à attendre chaque élément
+        d'un itérable (la lecture d'un fichier au fil de l'eau, par exemple)
+
+        Yields:
+            Les éléments de l'itérable
+        """
+        iterateur = iter(elements)
+        while True:
+            debut = time.perf_counter()
+            try:
+                element = next(iterateur)
+            except StopIteration:
+                self.ajoute_temps(nom, time.perf_counter() - debut, 0)
+                return
+            self.ajoute_temps(nom, time.perf_counter() - debut)
+            yield element
+
+    def compte(self, nom: str, nombre: int = 1) -> None:
+        """
+        Ajoute `nombre` au compteur `nom`
+        """
+        with self._verrou:
+            self.compteurs[nom] = self.compteurs.get(nom, 0) + nombre
+
+    def prevoit(self, total: int | None) -> None:
+        """
+        Donne le nombre total d'essais prévus, pour estimer le temps restant
+        """
+        self.total = total
+
+    def avance(self, nombre: int = 1) -> None:
+        """
+        Compte `nombre` essais de plus et appelle la fonction de progression
+        si le délai est écoulé
+        """
+        self.faites += nombre
+        if self.progression is not None and \
+                time.perf_counter() >= self._prochain_rapport:
+            self._prochain_rapport = time.perf_counter() + self.intervalle
+            self.progression(self.etat())
+
+    def atteint(self, faites: int, total: int | None = None) -> None:
+        """
+        Fonction de progression à donner aux moteurs : reçoit le nombre
+        cumulé d'essais (et le total s'il change) au lieu d'un incrément
+        """
+        if total is not None:
+            self.total = total
+        self.avance(faites - self.faites)
+
+    def etat(self) -> Progression:
+        """
+        Renvoie la progression actuelle
+        """
+        temps = (self._arret or time.perf_counter()) - self._horloge
+        par_seconde = self.faites / temps if temps > 0 else 0.0
+        reste = None
+        if self.total is not None and par_seconde > 0:
+            reste = max(self.total - self.faites, 0) / par_seconde
+        return Progression(self.nom, self.faites, self.total, par_seconde,
+                           reste, temps)
+
+    def _profil(self) -> list[dict]:
+        """
+        Renvoie les fonctions qui ont pris le plus de temps, cumulé
+        """
+        import pstats
+
+        statistiques = pstats.Stats(self.profileur).stats
+        lignes = sorted(statistiques.items(), key=lambda item: item[1][3],
+                        reverse=True)[:NOMBRE_PROFIL]
+        return [{"fonction": f"{fichier}:{ligne}({fonction})",
+                 "appels": appels, "temps_propre": propre,
+                 "temps_cumule": cumule}
+                for (fichier, ligne, fonction), (_, appels, propre, cumule, _)
+                in lignes]
+
+    def metriques(self) -> dict:
+        """
+        Renvoie les mesures sous forme sérialisable en JSON
+        """
+        etat = self.etat()
+        resultat = {
+            "nom": self.nom,
+            "pid": os.getpid(),
+            "debut": self.debut,
+            "duree": None if self.fin is None else self.fin - self.debut,
+            "etapes": {nom: {"temps": temps, "appels": appels}
+                       for nom, (temps, appels) in self.etapes.items()},
+            "compteurs": dict(self.compteurs),
+            "faites": self.faites,
+            "total": self.total,
+            "par_seconde": etat.par_seconde,
+        }
+        if self.profileur is not None:
+            resultat["profil"] = self._profil()
+        if self.memoire is not None:
+            resultat["memoire"] = self.memoire
+        return resultat
+
+    def ecrire(self, chemin: str) -> None:
+        """
+        Ajoute les mesures au fichier, sur une seule ligne JSON
+        """
+        import json
+
+        ligne = json.dumps(self.metriques(), ensure_ascii=False) + "\n"
+        with open(chemin, "a", encoding="utf-8") as fichier:
+            fichier.write(ligne)
+
+
+class _Etape:
+    """
+    Chronomètre d'une étape, ajouté au total de l'étape à la sortie
+    """
+    __slots__ = ("instrumentation", "nom", "debut")
+
+    def __init__(self, instrumentation: Instrumentation, nom: str):
+        self.instrumentation = instrumentation
+        self.nom = nom
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        self.instrumentation.ajoute_temps(self.nom,
+                                          time.perf_counter() - self.debut)
+        return False
+
+
+class _Inactive:
+    """
+    Instrumentation qui ne mesure rien, utilisée quand aucune n'est demandée
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+    def etape(self, nom: str):
+        return self
+
+    def ajoute_temps(self, nom: str, temps: float, appels: int = 1) -> None:
+        pass
+
+    def chronometre(self, nom: str, elements):
+        return elements
+
+    def compte(self, nom: str, nombre: int = 1) -> None:
+        pass
+
+    def prevoit(self, total: int | None) -> None:
+        pass
+
+    def avance(self, nombre: int = 1) -> None:
+        pass
+
+    def atteint(self, faites: int, total: int | None = None) -> None:
+        pass
+
+
+INACTIVE = _Inactive()
+
+
+def instrumente(instrumentation: Instrumentation | None, nom: str):
+    """
+    Renvoie l'instrumentation à utiliser pour un appel
+
+    Args:
+        instrumentation (Instrumentation | None): Celle passée à l'attaque
+        nom (str): Le nom de l'attaque, si l'instrumentation n'en a pas
+
+    Returns:
+        Instrumentation: Celle qui est donnée, une nouvelle si SDES_METRIQUES
+        ou SDES_PROFIL est défini, `INACTIVE` sinon
+    """
+    if instrumentation is None:
+        if not (METRIQUES or PROFIL):
+            return INACTIVE
+        instrumentation = Instrumentation()
+    if not instrumentation.nom:
+        instrumentation.nom = nom
+    return instrumentation
+
+
+def affiche_progression(etat: Progression) -> None:
+    """
+    Fonction de progression qui écrit une ligne sur la sortie d'erreur
+    """
+    total = "" if etat.total is None else f"/{etat.total}"
+    reste = "" if etat.reste is None else f", reste {etat.reste:.1f} s"
+    print(f"{etat.nom} : {etat.faites}{total} en {etat.temps:.1f} s "
+          f"({etat.par_seconde:,.0f}/s{reste})", file=sys.stderr)
@@ -0,0 +1,99 @@
+"""
+Module pour l'attaque par rencontre au milieu du double SDES avec NumPy
+
+Les états intermédiaires de toutes les clés sont calculés d'un bloc à partir
+du dictionnaire de codes, puis joints par tri-fusion : on obtient toutes les
+paires de clés compatibles avec le couple clair/chiffré, pas seulement la
+première trouvée.
+"""
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .tables_sdes import NOMBRE_CLES, tables
+
+MULTIPLICATEUR = np.uint64(0x100000001B3)
+
+
+class ResultatRencontre(NamedTuple):
+    """
+    Résultat d'une attaque par rencontre au milieu
+    """
+    paires: list[tuple[int, int]]
+    nombre_candidats_avant: int
+    nombre_candidats_arriere: int
+    nombre_collisions: int
+    temps: float
+
+
+def empreintes(etats: np.ndarray) -> np.ndarray:
+    """
+    Calcule une empreinte 64 bits de chaque ligne d'états intermédiaires
+
+    Args:
+        etats (np.ndarray): Les états, une ligne par clé
+
+    Returns:
+        np.ndarray: Les empreintes (uint64), une par ligne
+    """
+    empreinte = np.zeros(len(etats), dtype=np.uint64)
+    for colonne in etats.T:
+        empreinte = empreinte * MULTIPLICATEUR ^ colonne.astype(np.uint64)
+    return empreinte
+
+
+def jointure(avant: np.ndarray,
+             arriere: np.ndarray) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Joint par tri-fusion les lignes identiques de deux matrices d'états
+
+    Args:
+        avant (np.ndarray): Les états obtenus depuis le clair, une ligne par clé
+        arriere (np.ndarray): Les états obtenus depuis le chiffré
+
+    Returns:
+        tuple: Les indices des lignes de `avant` et de `arriere` qui coïncident,
+        et le nombre de collisions d'empreintes examinées
+    """
+    empreintes_avant = empreintes(avant)
+    empreintes_arriere = empreintes(arriere)
+    ordre = np.argsort(empreintes_avant, kind="stable")
+    triees = empreintes_avant[ordre]
+    gauche = np.searchsorted(triees, empreintes_arriere, side="left")
+    droite = np.searchsorted(triees, empreintes_arriere, side="right")
+    nombres = droite - gauche
+    nombre_collisions = int(nombres.sum())
+    indices_arriere = np.repeat(np.arange(len(arriere)), nombres)
+    decalages = np.arange(nombre_collisions) - np.repeat(
+        np.cumsum(nombres) - nombres, nombres)
+    indices_avant = ordre[np.repeat(gauche, nombres) + decalages]
+    egales = (avant[indices_avant] == arriere[indices_arriere]).all(axis=1)
+    return indices_avant[egales], indices_arriere[egales], nombre_collisions
+
+
+def rencontre_au_milieu(clair: bytes, chiffre: bytes) -> ResultatRencontre:
+    """
+    Trouve toutes les paires de clés (cle1, cle2) telles que le double SDES de
+    `clair` donne `chiffre`
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré, de même longueur
+
+    Returns:
+        ResultatRencontre: Les paires triées, le nombre de candidats de chaque
+        côté, le nombre de collisions vérifiées et le temps de calcul
+    """
+    if len(clair) != len(chiffre):
+        raise ValueError("Le clair et le chiffré doivent avoir la même longueur")
+    debut = time.perf_counter()
+    chiffrement, dechiffrement = tables().en_numpy()
+    avant = chiffrement[:, np.frombuffer(clair, dtype=np.uint8)]
+    arriere = dechiffrement[:, np.frombuffer(chiffre, dtype=np.uint8)]
+    cles1, cles2, nombre_collisions = jointure(avant, arriere)
+    ordre = np.lexsort((cles2, cles1))
+    paires = list(zip(cles1[ordre].tolist(), cles2[ordre].tolist()))
+    return ResultatRencontre(paires, NOMBRE_CLES, NOMBRE_CLES,
+                             nombre_collisions,
+                             round(time.perf_counter() - debut, 6))
@@ -0,0 +1,120 @@
+"""
+Module pour le cassage brutal du double SDES réparti sur plusieurs processus
+
+L'espace des premières clés est découpé en tranches confiées à un groupe de
+processus. Les processus partagent un compteur de tentatives et la plus petite
+première clé trouvée : dès qu'une paire est trouvée, les tranches suivantes
+s'arrêtent d'elles-mêmes.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .tables_sdes import NOMBRE_CLES, tables
+
+TAILLE_TRANCHE = 8
+
+_clair = b""
+_chiffre = b""
+_compteur = None
+_meilleure = None
+_lignes = []
+
+
+def _initialiser(clair: bytes, chiffre: bytes, compteur, meilleure) -> None:
+    """
+    Prépare un processus de travail : message, compteurs partagés et lignes
+    du dictionnaire de codes
+    """
+    global _clair, _chiffre, _compteur, _meilleure, _lignes
+    _clair, _chiffre = clair, chiffre
+    _compteur, _meilleure = compteur, meilleure
+    table = tables()
+    _lignes = [table.ligne_chiffrement(cle) for cle in range(NOMBRE_CLES)]
+
+
+def _explorer_tranche(debut: int, fin: int) -> tuple[int, int] | None:
+    """
+    Teste toutes les paires dont la première clé est dans [debut, fin[
+
+    Returns:
+        tuple | None: La première paire trouvée dans la tranche
+    """
+    for cle1 in range(debut, fin):
+        if cle1 >= _meilleure.value:
+            return None
+        milieu = _clair.translate(_lignes[cle1])
+        for cle2 in range(NOMBRE_CLES):
+            if milieu.translate(_lignes[cle2]) == _chiffre:
+                with _compteur.get_lock():
+                    _compteur.value += cle2 + 1
+                with _meilleure.get_lock():
+                    _meilleure.value = min(_meilleure.value, cle1)
+                return (cle1, cle2)
+        with _compteur.get_lock():
+            _compteur.value += NOMBRE_CLES
+    return None
+
+
+def cassage_brutal_parallele(
+        clair: bytes,
+        chiffre: bytes,
+        nombre_processus: int | None = None,
+        progression=None,
+        intervalle: float = 0.5) -> tuple[int, int, int, float] | None:
+    """
+    Casse le double SDES en répartissant les paires de clés sur des processus
+
+    La paire renvoyée est la même que celle du cassage séquentiel (la plus
+    petite dans l'ordre (cle1, cle2)) : les tranches qui précèdent la première
+    clé trouvée sont menées à leur terme, les autres sont annulées.
+
+    Args:
+        clair (bytes): Le message clair
+        chiffre (bytes): Le message chiffré
+        nombre_processus (int | None): Le nombre de processus (un par cœur
+            par défaut)
+        progression (callable | None): Appelée avec (tentatives, total)
+            toutes les `intervalle` secondes
+        intervalle (float): La période des appels à `progression`
+
+    Returns:
+        tuple: La clé 1 et la clé 2, le nombre de tentatives réellement
+        effectuées et le temps de calcul
+    """
+    debut = time.time()
+    tables()  # construit le fichier des tables avant de lancer les processus
+    compteur = multiprocessing.Value("q", 0)
+    meilleure = multiprocessing.Value("i", NOMBRE_CLES)
+    total = NOMBRE_CLES * NOMBRE_CLES
+    with ProcessPoolExecutor(max_workers=nombre_processus or os.cpu_count(),
+                             initializer=_initialiser,
+                             initargs=(clair, chiffre, compteur,
+                                       meilleure)) as executeur:
+        en_cours = {
+            executeur.submit(_explorer_tranche, cle,
+                             min(cle + TAILLE_TRANCHE, NOMBRE_CLES))
+            for cle in range(0, NOMBRE_CLES, TAILLE_TRANCHE)
+        }
+        trouvees = []
+        dernier_appel = time.monotonic()
+        while en_cours:
+            terminees, en_cours = wait(en_cours, timeout=intervalle,
+                                       return_when=FIRST_COMPLETED)
+            for tache in terminees:
+                if not tache.cancelled() and tache.result() is not None:
+                    trouvees.append(tache.result())
+            if trouvees:
+                for tache in en_cours:
+                    tache.cancel()
+            maintenant = time.monotonic()
+            if progression is not None and (
+                    not en_cours or maintenant - dernier_appel >= intervalle):
+                dernier_appel = maintenant
+                progression(compteur.value, total)
+    if not trouvees:
+        return None
+    cle1, cle2 = min(trouvees)
+    temps = round(time.time() - debut, 3)
+    return (cle1, cle2, compteur.value, temps)
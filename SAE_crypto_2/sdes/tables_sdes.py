@@ -0,0 +1,149 @@
+"""
+Module pour le dictionnaire de codes du SDES
+
+Le SDES n'a que 1024 clés et 256 blocs possibles : les tables complètes de
+chiffrement et de déchiffrement (1024 x 256 octets chacune) sont calculées une
+seule fois, enregistrées dans un fichier puis projetées en mémoire pour que
+plusieurs processus partagent la même copie.
+"""
+import mmap
+import os
+
+NOMBRE_CLES = 1024
+NOMBRE_BLOCS = 256
+TAILLE_TABLE = NOMBRE_CLES * NOMBRE_BLOCS
+CHEMIN_TABLES = os.environ.get(
+    "SDES_TABLES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "tables_sdes.bin"))
+
+_tables_chargees = None
+
+
+class TablesSDES:
+    """
+    Tables de chiffrement et de déchiffrement du SDES
+
+    L'octet crypté avec la clé `cle` se trouve à l'indice `cle << 8 | octet`
+    de `chiffrement`, et de même pour `dechiffrement`.
+    """
+
+    def __init__(self, donnees):
+        """
+        Args:
+            donnees (bytes | mmap.mmap): Les deux tables mises bout à bout
+        """
+        if len(donnees) != 2 * TAILLE_TABLE:
+            raise ValueError("Les tables SDES doivent faire "
+                             f"{2 * TAILLE_TABLE} octets")
+        self.donnees = donnees
+        vue = memoryview(donnees)
+        self.chiffrement = vue[:TAILLE_TABLE]
+        self.dechiffrement = vue[TAILLE_TABLE:]
+
+    def ligne_chiffrement(self, cle: int) -> bytes:
+        """
+        Renvoie la table de substitution (256 octets) du chiffrement avec la clé
+
+        Args:
+            cle (int): La clé à utiliser
+        """
+        return bytes(self.chiffrement[cle << 8:(cle + 1) << 8])
+
+    def ligne_dechiffrement(self, cle: int) -> bytes:
+        """
+        Renvoie la table de substitution (256 octets) du déchiffrement avec la clé
+
+        Args:
+            cle (int): La clé à utiliser
+        """
+        return bytes(self.dechiffrement[cle << 8:(cle + 1) << 8])
+
+    def en_numpy(self):
+        """
+        Renvoie les deux tables sous forme de tableaux NumPy (1024, 256) sans copie
+
+        Returns:
+            tuple: La table de chiffrement et la table de déchiffrement
+        """
+        import numpy as np
+        chiffrement = np.frombuffer(self.chiffrement, dtype=np.uint8)
+        dechiffrement = np.frombuffer(self.dechiffrement, dtype=np.uint8)
+        return (chiffrement.reshape(NOMBRE_CLES, NOMBRE_BLOCS),
+                dechiffrement.reshape(NOMBRE_CLES, NOMBRE_BLOCS))
+
+
+def construire_tables() -> bytes:
+    """
+    Calcule les tables de chiffrement et de déchiffrement avec le SDES bit à bit
+
+    Returns:
+        bytes: La table de chiffrement suivie de la table de déchiffrement
+    """
+    from .double_sdes import cadencement, crypter_bits
+
+    chiffrement = bytearray(TAILLE_TABLE)
+    dechiffrement = bytearray(TAILLE_TABLE)
+    for cle in range(NOMBRE_CLES):
+        sous_cles = cadencement()[cle]
+        base = cle << 8
+        for octet in range(NOMBRE_BLOCS):
+            octet_crypte = crypter_bits(sous_cles, octet)
+            chiffrement[base | octet] = octet_crypte
+            dechiffrement[base | octet_crypte] = octet
+    return bytes(chiffrement + dechiffrement)
+
+
+def sauvegarder_tables(donnees: bytes, chemin: str = CHEMIN_TABLES) -> None:
+    """
+    Enregistre les tables dans un fichier, de façon atomique pour que les
+    processus concurrents ne lisent jamais un fichier à moitié écrit
+
+    Args:
+        donnees (bytes): Les tables construites par `construire_tables`
+        chemin (str): Le fichier de destination
+    """
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.write(donnees)
+    os.replace(temporaire, chemin)
+
+
+def charger_tables(chemin: str = CHEMIN_TABLES) -> TablesSDES:
+    """
+    Projette les tables en mémoire depuis le fichier, en les construisant et en
+    les enregistrant d'abord si le fichier n'existe pas ou est invalide
+
+    Args:
+        chemin (str): Le fichier des tables
+
+    Returns:
+        TablesSDES: Les tables en lecture seule
+    """
+    try:
+        if os.path.getsize(chemin) == 2 * TAILLE_TABLE:
+            with open(chemin, "rb") as fichier:
+                return TablesSDES(
+                    mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ))
+    except OSError:
+        pass
+    donnees = construire_tables()
+    try:
+        sauvegarder_tables(donnees, chemin)
+    except OSError:
+        # Répertoire en lecture seule : on garde les tables en mémoire
+        return TablesSDES(donnees)
+    return charger_tables(chemin)
+
+
+def tables() -> TablesSDES:
+    """
+    Renvoie les tables du processus courant, chargées au premier appel
+
+    Returns:
+        TablesSDES: Les tables de chiffrement et de déchiffrement
+    """
+    global _tables_chargees
+    if _tables_chargees is None:
+        _tables_chargees = charger_tables()
+    return _tables_chargees
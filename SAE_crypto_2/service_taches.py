@@ -0,0 +1,688 @@
+"""
+Service asyncio qui exécute des tâches de cryptage, de cassage et de
+décryptage de trace dans un pool de processus
+
+Les tâches attendent dans une file de taille bornée, par ordre de priorité
+(la plus petite d'abord), puis dans l'ordre d'arrivée ; une tâche annulée
+pendant qu'elle attend quitte aussitôt la file. Chaque processus du pool
+exécute une tâche à la fois ; sa progression (celle de l'instrumentation des
+attaques) remonte au service par le tube de retour du processus, lu sans
+bloquer la boucle asyncio, et est diffusée aux clients qui suivent la tâche.
+
+Une tâche annulée ou qui dépasse son délai est arrêtée sur-le-champ, quel que
+soit le calcul en cours : son processus est tué et remplacé par un nouveau.
+
+La façade HTTP n'utilise que la bibliothèque standard, sur TCP ou sur une
+socket UNIX :
+
+    python service_taches.py --socket /tmp/sdes.sock
+    curl --unix-socket /tmp/sdes.sock -d '{"type": "casser", "parametres":
+        {"clair": "bonjour", "chiffre": "..."}}' http://sdes/taches
+    curl --unix-socket /tmp/sdes.sock http://sdes/taches/<id>/evenements
+    curl --unix-socket /tmp/sdes.sock -X DELETE http://sdes/taches/<id>
+
+    POST   /taches                  soumet une tâche : {"type", "parametres",
+                                    "priorite", "delai"} -> 202 {"id"}, ou
+                                    503 si la file est pleine
+    GET    /taches/<id>             l'état de la tâche
+    GET    /taches/<id>/evenements  les événements, une ligne JSON chacun,
+                                    jusqu'à la fin de la tâche
+    GET    /taches/<id>/resultat    attend la fin de la tâche
+    DELETE /taches/<id>             annule la tâche
+    GET    /etat                    l'état du service
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import multiprocessing
+import os
+import pickle
+import signal
+import struct
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sdes.instrumentation import Instrumentation
+
+HOTE = "127.0.0.1"
+PORT = 8765
+# tâches qui peuvent attendre dans la file
+TAILLE_FILE = 1024
+# tâches terminées dont l'état reste consultable
+TACHES_GARDEES = 4096
+# délai minimal (s) entre deux événements de progression d'une tâche
+INTERVALLE_PROGRESSION = 0.5
+TAILLE_REQUETE = 1 << 20
+# connexions qui peuvent attendre d'être acceptées
+CONNEXIONS_EN_ATTENTE = 1024
+FINALES = ("terminee", "echec", "annulee", "expiree")
+# en-tête d'un message du tube de retour : la taille du pickle qui suit
+_ENTETE = struct.Struct("!Q")
+
+
+def _crypter(instrumentation: Instrumentation, texte: str, cle1: int,
+             cle2: int, dechiffrer: bool = False) -> str:
+    """
+    Crypte (ou décrypte) un texte en double SDES
+    """
+    from sdes import crypte_double_sdes, decrypte_double_sdes
+
+    fonction = decrypte_double_sdes if dechiffrer else crypte_double_sdes
+    with instrumentation, instrumentation.etape("cryptage"):
+        return fonction(texte, cle1, cle2)
+
+
+def _casser(instrumentation: Instrumentation, clair: str, chiffre: str,
+            methode: str = "astucieux", moteur: str | None = None):
+    """
+    Casse le double SDES à partir d'un clair et d'un chiffré connus
+    """
+    from sdes import cassage_astucieux, cassage_brutal
+
+    fonctions = {"brutal": cassage_brutal, "astucieux": cassage_astucieux}
+    if methode not in fonctions:
+        raise ValueError(f"Méthode de cassage inconnue : {methode}")
+    options = {} if moteur is None else {"moteur": moteur}
+    return fonctions[methode](clair, chiffre, instrumentation=instrumentation,
+                              **options)
+
+
+def _decrypter_trace(instrumentation: Instrumentation, chemin: str,
+                     moteur: str = "brut") -> list[str]:
+    """
+    Décrypte les messages d'Alice et Bob d'une trace
+    """
+    from analyse_trace import messages_alice_et_bob
+
+    return list(messages_alice_et_bob(chemin, moteur=moteur,
+                                      instrumentation=instrumentation))
+
+
+TRAVAUX = {
+    "crypter": _crypter,
+    "casser": _casser,
+    "trace": _decrypter_trace,
+}
+
+
+def _envoyer(sortie, message) -> None:
+    """
+    Écrit un message sur le tube de retour : sa taille sur 8 octets, puis le
+    message en pickle
+    """
+    donnees = pickle.dumps(message)
+    sortie.write(_ENTETE.pack(len(donnees)))
+    sortie.write(donnees)
+    sortie.flush()
+
+
+def _executer(sortie, genre: str, parametres: dict,
+              intervalle: float) -> dict:
+    """
+    Exécute une tâche dans un processus du pool
+
+    Args:
+        sortie (BinaryIO): Le tube de retour, où partent les événements de
+            progression
+        genre (str): Le type de la tâche (clé de TRAVAUX)
+        parametres (dict): Ses paramètres
+        intervalle (float): Le délai entre deux événements de progression
+
+    Returns:
+        dict: Le résultat et les mesures de la tâche
+    """
+    def progression(etat):
+        _envoyer(sortie, ("progression", {
+            "type": "progression", "faites": etat.faites, "total": etat.total,
+            "par_seconde": etat.par_seconde, "reste": etat.reste,
+            "temps": etat.temps}))
+
+    instrumentation = Instrumentation(genre, progression, intervalle,
+                                      profil=(), sortie=None)
+    resultat = TRAVAUX[genre](instrumentation, **parametres)
+    return {"resultat": resultat, "metriques": instrumentation.metriques()}
+
+
+def _processus(travaux, retours) -> None:
+    """
+    Boucle d'un processus du pool : reçoit les tâches une à la fois et
+    renvoie leurs événements puis leur fin par le tube de retour
+
+    Ctrl+C n'arrête que le service, qui arrête ensuite le pool.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sortie = open(retours.fileno(), "wb", closefd=False)
+    while True:
+        try:
+            travail = travaux.recv()
+        except EOFError:  # le service s'est arrêté sans prévenir
+            return
+        if travail is None:
+            return
+        try:
+            _envoyer(sortie, ("terminee", _executer(sortie, *travail)))
+        except Exception as erreur:
+            _envoyer(sortie, ("echec", repr(erreur)))
+
+
+class _Processus(NamedTuple):
+    """
+    Un processus du pool, vu du service
+    """
+    processus: multiprocessing.Process
+    # les tâches partent par `travaux` ; leurs messages reviennent par
+    # `lecteur`, lu par la boucle asyncio
+    travaux: object
+    lecteur: asyncio.StreamReader
+    transport: asyncio.ReadTransport
+
+
+class Tache:
+    """
+    Une tâche soumise au service, et les événements publiés à son sujet
+    """
+
+    def __init__(self, genre: str, parametres: dict, priorite: int = 0,
+                 delai: float | None = None):
+        self.identifiant = uuid.uuid4().hex
+        self.genre = genre
+        self.parametres = parametres
+        self.priorite = priorite
+        self.delai = delai
+        self.etat = "en_attente"
+        self.resultat = None
+        self.erreur = None
+        self.metriques = None
+        self.soumise = time.time()
+        self.debut = self.fin = None
+        self.annulation = asyncio.Event()
+        self.evenements = []
+        self._nouvel_evenement = asyncio.Event()
+
+    @property
+    def finie(self) -> bool:
+        return self.etat in FINALES
+
+    def description(self) -> dict:
+        """
+        Renvoie l'état de la tâche, sérialisable en JSON
+        """
+        return {"id": self.identifiant, "type": self.genre,
+                "priorite": self.priorite, "etat": self.etat,
+                "soumise": self.soumise, "debut": self.debut,
+                "fin": self.fin, "resultat": self.resultat,
+                "erreur": self.erreur, "metriques": self.metriques}
+
+    def publier(self, evenement: dict) -> None:
+        """
+        Ajoute un événement et réveille les clients qui suivent la tâche
+        """
+        self.evenements.append(evenement)
+        self._nouvel_evenement.set()
+        self._nouvel_evenement = asyncio.Event()
+
+    def changer_etat(self, etat: str, **details) -> None:
+        """
+        Change l'état de la tâche et publie l'événement correspondant
+        """
+        self.etat = etat
+        if etat == "en_cours":
+            self.debut = time.time()
+        if etat in FINALES:
+            self.fin = time.time()
+        self.publier({"type": "etat", "etat": etat, **details})
+
+    async def suivre(self):
+        """
+        Renvoie les événements de la tâche depuis le premier, puis au fur et
+        à mesure, jusqu'à sa fin
+
+        Yields:
+            dict: Les événements
+        """
+        position = 0
+        while True:
+            while position < len(self.evenements):
+                position += 1
+                yield self.evenements[position - 1]
+            if self.finie:
+                return
+            await self._nouvel_evenement.wait()
+
+
+class ServiceTaches:
+    """
+    File de tâches à priorités exécutées dans un pool de processus
+    """
+
+    def __init__(self, nombre_processus: int | None = None,
+                 taille_file: int = TAILLE_FILE,
+                 intervalle: float = INTERVALLE_PROGRESSION):
+        """
+        Args:
+            nombre_processus (int | None): La taille du pool
+            taille_file (int): Le nombre de tâches qui peuvent attendre
+            intervalle (float): Le délai entre deux événements de progression
+        """
+        self.nombre_processus = nombre_processus or os.cpu_count() or 1
+        self.taille_file = taille_file
+        self.intervalle = intervalle
+        self.taches = OrderedDict()
+        # tas des (priorite, numero, tache) en attente
+        self._file = []
+        self._arrivee = None
+        self._ouvriers = []
+        self._contexte = None
+        self._processus = []
+        self._boucle = None
+        self._numero = 0
+
+    async def __aenter__(self):
+        await self.demarrer()
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.arreter()
+        return False
+
+    async def demarrer(self) -> None:
+        """
+        Lance les processus du pool et les coroutines qui leur distribuent
+        les tâches
+        """
+        self._contexte = multiprocessing.get_context("spawn")
+        self._boucle = asyncio.get_running_loop()
+        self._arrivee = asyncio.Event()
+        self._processus = [await self._lancer_processus()
+                           for _ in range(self.nombre_processus)]
+        self._ouvriers = [asyncio.create_task(self._ouvrier(case))
+                          for case in range(self.nombre_processus)]
+
+    async def arreter(self) -> None:
+        """
+        Annule les tâches en cours et en attente, puis arrête le pool
+        """
+        for tache in self.taches.values():
+            if not tache.finie:
+                self.annuler(tache.identifiant)
+        for ouvrier in self._ouvriers:
+            ouvrier.cancel()
+        await asyncio.gather(*self._ouvriers, return_exceptions=True)
+        for processus in self._processus:
+            if processus.processus.is_alive():
+                processus.travaux.send(None)
+        for processus in self._processus:
+            await asyncio.to_thread(processus.processus.join)
+            processus.travaux.close()
+            processus.transport.close()
+
+    async def _lancer_processus(self) -> _Processus:
+        """
+        Lance un processus du pool et branche son tube de retour sur la
+        boucle asyncio
+        """
+        # Pipe(duplex=False) renvoie le bout en lecture, puis en écriture
+        travaux_enfant, travaux = self._contexte.Pipe(duplex=False)
+        retours, retours_enfant = self._contexte.Pipe(duplex=False)
+        # pas de processus démon : le moteur "parallele" lance les siens
+        processus = self._contexte.Process(
+            target=_processus, args=(travaux_enfant, retours_enfant))
+        processus.start()
+        travaux_enfant.close()
+        retours_enfant.close()
+        lecteur = asyncio.StreamReader()
+        transport, _ = await self._boucle.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(lecteur), retours)
+        return _Processus(processus, travaux, lecteur, transport)
+
+    async def _tuer_processus(self, case: int) -> None:
+        """
+        Tue le processus `case`, qui exécute une tâche abandonnée
+        """
+        processus = self._processus[case]
+        processus.processus.kill()
+        await asyncio.to_thread(processus.processus.join)
+        processus.travaux.close()
+        processus.transport.close()
+
+    async def _remplacer_processus(self, case: int) -> None:
+        """
+        Tue le processus `case` et le remplace par un nouveau
+        """
+        await self._tuer_processus(case)
+        self._processus[case] = await self._lancer_processus()
+
+    @staticmethod
+    async def _recevoir(lecteur: asyncio.StreamReader):
+        """
+        Lit le prochain message d'un processus, sans bloquer la boucle même
+        s'il est gros ou arrive en plusieurs morceaux
+
+        Raises:
+            asyncio.IncompleteReadError: Si le processus s'est arrêté
+        """
+        taille, = _ENTETE.unpack(await lecteur.readexactly(_ENTETE.size))
+        return pickle.loads(await lecteur.readexactly(taille))
+
+    async def _suivre_processus(self, tache: Tache,
+                                lecteur: asyncio.StreamReader) -> tuple:
+        """
+        Publie les événements de progression d'une tâche jusqu'à sa fin
+
+        Returns:
+            tuple: ("terminee", sortie) ou ("echec", erreur)
+        """
+        while True:
+            genre, contenu = await self._recevoir(lecteur)
+            if genre != "progression":
+                return genre, contenu
+            tache.publier(contenu)
+
+    def soumettre(self, genre: str, parametres: dict | None = None,
+                  priorite: int = 0, delai: float | None = None) -> Tache:
+        """
+        Ajoute une tâche à la file
+
+        Args:
+            genre (str): "crypter", "casser" ou "trace"
+            parametres (dict | None): Les paramètres de la fonction
+            priorite (int): La priorité (la plus petite passe d'abord)
+            delai (float | None): Le temps (s) d'exécution au bout duquel la
+                tâche est arrêtée
+
+        Returns:
+            Tache: La tâche en attente
+
+        Raises:
+            ValueError: Si le type de tâche est inconnu
+            asyncio.QueueFull: Si la file est pleine
+        """
+        if genre not in TRAVAUX:
+            raise ValueError(f"Type de tâche inconnu : {genre}")
+        if not isinstance(parametres or {}, dict):
+            raise ValueError("Les paramètres doivent être un objet")
+        if len(self._file) >= self.taille_file:
+            raise asyncio.QueueFull
+        tache = Tache(genre, parametres or {}, priorite, delai)
+        self._numero += 1
+        heapq.heappush(self._file, (priorite, self._numero, tache))
+        self._arrivee.set()
+        self.taches[tache.identifiant] = tache
+        tache.changer_etat("en_attente")
+        self._oublier()
+        return tache
+
+    def _oublier(self) -> None:
+        """
+        Oublie les tâches finies les plus anciennes au-delà de TACHES_GARDEES
+        """
+        surplus = len(self.taches) - TACHES_GARDEES
+        for identifiant in list(self.taches):
+            if surplus <= 0:
+                break
+            if self.taches[identifiant].finie:
+                del self.taches[identifiant]
+                surplus -= 1
+
+    def annuler(self, identifiant: str) -> bool:
+        """
+        Annule une tâche : si elle attend, elle quitte la file ; si elle
+        tourne, son processus est arrêté
+
+        Returns:
+            bool: Faux si la tâche est inconnue ou déjà finie
+        """
+        tache = self.taches.get(identifiant)
+        if tache is None or tache.finie:
+            return False
+        tache.annulation.set()
+        if tache.etat == "en_attente":
+            self._file = [element for element in self._file
+                          if element[2] is not tache]
+            heapq.heapify(self._file)
+            tache.changer_etat("annulee")
+        return True
+
+    async def _ouvrier(self, case: int) -> None:
+        """
+        Exécute les tâches de la file une par une, dans le processus `case`
+        du pool
+        """
+        while True:
+            while not self._file:
+                self._arrivee.clear()
+                await self._arrivee.wait()
+            _, _, tache = heapq.heappop(self._file)
+            await self._lancer(tache, case)
+
+    async def _lancer(self, tache: Tache, case: int) -> None:
+        """
+        Exécute une tâche et publie sa fin ; l'annulation et le délai
+        arrêtent son processus
+        """
+        processus = self._processus[case]
+        tache.changer_etat("en_cours")
+        processus.travaux.send((tache.genre, tache.parametres,
+                                self.intervalle))
+        execution = asyncio.create_task(
+            self._suivre_processus(tache, processus.lecteur))
+        annulation = asyncio.create_task(tache.annulation.wait())
+        try:
+            await asyncio.wait({execution, annulation}, timeout=tache.delai,
+                               return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:  # arrêt du service
+            execution.cancel()
+            await self._tuer_processus(case)
+            tache.changer_etat("annulee")
+            raise
+        finally:
+            annulation.cancel()
+        if not execution.done():
+            execution.cancel()
+            tache.changer_etat("annulee" if tache.annulation.is_set()
+                               else "expiree")
+            await self._remplacer_processus(case)
+            return
+        try:
+            fin, contenu = execution.result()
+        except asyncio.IncompleteReadError:
+            fin, contenu = "echec", "processus arrêté"
+        if fin == "echec":
+            tache.erreur = contenu
+            tache.changer_etat("echec", erreur=tache.erreur)
+        else:
+            tache.resultat = contenu["resultat"]
+            tache.metriques = contenu["metriques"]
+            tache.changer_etat("terminee", resultat=tache.resultat)
+        if not self._processus[case].processus.is_alive():
+            await self._remplacer_processus(case)
+
+    def etat(self) -> dict:
+        """
+        Renvoie l'état du service, sérialisable en JSON
+        """
+        etats = {}
+        for tache in self.taches.values():
+            etats[tache.etat] = etats.get(tache.etat, 0) + 1
+        return {"processus": self.nombre_processus,
+                "file": len(self._file), "taille_file": self.taille_file,
+                "taches": etats}
+
+
+async def _lit_requete(lecteur: asyncio.StreamReader):
+    """
+    Lit une requête HTTP/1.1
+
+    Returns:
+        tuple: La méthode, le chemin et le corps décodé depuis le JSON (ou
+        None)
+    """
+    entete = await lecteur.readuntil(b"\r\n\r\n")
+    lignes = entete.decode("latin-1").split("\r\n")
+    methode, chemin, _ = lignes[0].split(" ", 2)
+    champs = {}
+    for ligne in lignes[1:]:
+        if ":" in ligne:
+            nom, valeur = ligne.split(":", 1)
+            champs[nom.strip().lower()] = valeur.strip()
+    longueur = int(champs.get("content-length", 0))
+    if longueur > TAILLE_REQUETE:
+        raise ValueError("Requête trop grande")
+    corps = await lecteur.readexactly(longueur) if longueur else b""
+    return methode, chemin.split("?", 1)[0], \
+        json.loads(corps) if corps else None
+
+
+async def _repond(ecrivain: asyncio.StreamWriter, statut: int,
+                  corps) -> None:
+    """
+    Écrit une réponse JSON complète
+    """
+    raisons = {200: "OK", 202: "Accepted", 400: "Bad Request",
+               404: "Not Found", 405: "Method Not Allowed",
+               503: "Service Unavailable"}
+    donnees = json.dumps(corps, ensure_ascii=False).encode("utf-8")
+    ecrivain.write(
+        f"HTTP/1.1 {statut} {raisons[statut]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(donnees)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + donnees)
+    await ecrivain.drain()
+
+
+class FacadeHTTP:
+    """
+    Façade HTTP du service, une requête par connexion
+    """
+
+    def __init__(self, service: ServiceTaches):
+        self.service = service
+
+    async def client(self, lecteur: asyncio.StreamReader,
+                     ecrivain: asyncio.StreamWriter) -> None:
+        """
+        Traite une connexion
+        """
+        try:
+            try:
+                methode, chemin, corps = await _lit_requete(lecteur)
+            except (ValueError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError):
+                await _repond(ecrivain, 400, {"erreur": "requête invalide"})
+                return
+            await self.traiter(methode, chemin, corps, ecrivain)
+        except ConnectionError:
+            pass
+        finally:
+            ecrivain.close()
+
+    async def traiter(self, methode: str, chemin: str, corps,
+                      ecrivain: asyncio.StreamWriter) -> None:
+        """
+        Répond à une requête
+        """
+        parties = [partie for partie in chemin.split("/") if partie]
+        if parties == ["etat"] and methode == "GET":
+            await _repond(ecrivain, 200, self.service.etat())
+            return
+        if parties == ["taches"]:
+            if methode != "POST":
+                await _repond(ecrivain, 405, {"erreur": "POST attendu"})
+                return
+            await self.soumettre(corps, ecrivain)
+            return
+        if len(parties) not in (2, 3) or parties[0] != "taches":
+            await _repond(ecrivain, 404, {"erreur": "chemin inconnu"})
+            return
+        tache = self.service.taches.get(parties[1])
+        if tache is None:
+            await _repond(ecrivain, 404, {"erreur": "tâche inconnue"})
+            return
+        action = parties[2] if len(parties) == 3 else None
+        if methode == "DELETE" and action is None:
+            annulee = self.service.annuler(tache.identifiant)
+            await _repond(ecrivain, 200, {"id": tache.identifiant,
+                                          "annulee": annulee,
+                                          "etat": tache.etat})
+        elif methode != "GET":
+            await _repond(ecrivain, 405, {"erreur": "GET attendu"})
+        elif action is None:
+            await _repond(ecrivain, 200, tache.description())
+        elif action == "resultat":
+            async for _ in tache.suivre():
+                pass
+            await _repond(ecrivain, 200, tache.description())
+        elif action == "evenements":
+            ecrivain.write(b"HTTP/1.1 200 OK\r\n"
+                           b"Content-Type: application/x-ndjson\r\n"
+                           b"Connection: close\r\n\r\n")
+            async for evenement in tache.suivre():
+                ecrivain.write(json.dumps(evenement, ensure_ascii=False)
+                               .encode("utf-8") + b"\n")
+                await ecrivain.drain()
+        else:
+            await _repond(ecrivain, 404, {"erreur": "chemin inconnu"})
+
+    async def soumettre(self, corps, ecrivain: asyncio.StreamWriter) -> None:
+        """
+        Soumet la tâche décrite par le corps de la requête
+        """
+        if not isinstance(corps, dict):
+            await _repond(ecrivain, 400, {"erreur": "objet JSON attendu"})
+            return
+        try:
+            delai = corps.get("delai")
+            tache = self.service.soumettre(
+                corps.get("type"), corps.get("parametres"),
+                int(corps.get("priorite", 0)),
+                None if delai is None else float(delai))
+        except (TypeError, ValueError) as erreur:
+            await _repond(ecrivain, 400, {"erreur": str(erreur)})
+            return
+        except asyncio.QueueFull:
+            await _repond(ecrivain, 503, {"erreur": "file pleine"})
+            return
+        await _repond(ecrivain, 202, {"id": tache.identifiant,
+                                      "etat": tache.etat})
+
+
+async def servir(hote: str = HOTE, port: int = PORT,
+                 socket_unix: str | None = None,
+                 nombre_processus: int | None = None,
+                 taille_file: int = TAILLE_FILE) -> None:
+    """
+    Lance le service et sa façade HTTP, jusqu'à SIGINT ou SIGTERM
+    """
+    arret = asyncio.Event()
+    boucle = asyncio.get_running_loop()
+    for signal_arret in (signal.SIGINT, signal.SIGTERM):
+        boucle.add_signal_handler(signal_arret, arret.set)
+    async with ServiceTaches(nombre_processus, taille_file) as service:
+        facade = FacadeHTTP(service)
+        if socket_unix is not None:
+            serveur = await asyncio.start_unix_server(
+                facade.client, socket_unix, limit=TAILLE_REQUETE,
+                backlog=CONNEXIONS_EN_ATTENTE)
+        else:
+            serveur = await asyncio.start_server(
+                facade.client, hote, port, limit=TAILLE_REQUETE,
+                backlog=CONNEXIONS_EN_ATTENTE)
+        async with serveur:
+            await arret.wait()
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(
+        description="Service de tâches SDES et AES, en HTTP")
+    parseur.add_argument("--hote", default=HOTE)
+    parseur.add_argument("--port", type=int, default=PORT)
+    parseur.add_argument("--socket", help="socket UNIX (au lieu de TCP)")
+    parseur.add_argument("-j", "--processus", type=int, default=None)
+    parseur.add_argument("--file", type=int, default=TAILLE_FILE,
+                         help="tâches qui peuvent attendre")
+    options = parseur.parse_args()
+    asyncio.run(servir(options.hote, options.port, options.socket,
+                       options.processus, options.file))
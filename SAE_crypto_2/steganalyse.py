@@ -0,0 +1,334 @@
+"""
+Module de stéganalyse par lots sur des dossiers d'images
+
+Pour chaque image : proportion de 1 dans chaque plan de bits, test du khi
+carré de Westfeld et Pfitzmann sur les paires de valeurs (2k, 2k+1), calculé
+sur des débuts de plus en plus longs de l'image pour repérer une insertion
+séquentielle, et début de la charge extraite des bits de poids faible. Les
+images d'un même nom au numéro près (rossignol1.bmp, rossignol2.bmp) sont
+comparées plan de bits par plan de bits, chacune avec la suivante dans
+l'ordre des numéros.
+
+Le travail est réparti sur un pool de processus et chaque résultat est écrit
+dès qu'il est prêt, une ligne JSON par image ou par paire :
+
+    python steganalyse.py . -o rapport.jsonl --extraction charges/
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+
+import numpy as np
+
+from enigme_images import extrait_octets, pixels_image
+
+EXTENSIONS = (".bmp", ".png", ".tif", ".tiff", ".gif", ".ppm", ".pgm")
+# débuts de l'image (en proportion) sur lesquels le khi carré est calculé
+PROPORTIONS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+OCTETS_APERCU = 32
+# effectif attendu minimal d'une paire de valeurs pour entrer dans le test
+EFFECTIF_MIN = 5
+# tâches soumises en avance, par processus
+TACHES_PAR_PROCESSUS = 2
+
+
+def images(dossiers, recursif: bool = True) -> list[str]:
+    """
+    Liste les images des dossiers donnés
+
+    Args:
+        dossiers (Iterable[str]): Les dossiers (ou fichiers) à parcourir
+        recursif (bool): Parcourt aussi les sous-dossiers
+
+    Returns:
+        list[str]: Les chemins des images, triés
+    """
+    chemins = []
+    for dossier in dossiers:
+        if os.path.isfile(dossier):
+            chemins.append(dossier)
+            continue
+        for racine, sous_dossiers, fichiers in os.walk(dossier):
+            chemins.extend(os.path.join(racine, fichier)
+                           for fichier in fichiers
+                           if fichier.lower().endswith(EXTENSIONS))
+            if not recursif:
+                sous_dossiers.clear()
+    return sorted(chemins)
+
+
+def _numeros(chemin: str) -> tuple[int, ...]:
+    """
+    Renvoie les nombres du nom d'un fichier, pour trier img2 avant img10
+    """
+    return tuple(int(nombre) for nombre in
+                 re.findall(r"\d+", os.path.basename(chemin)))
+
+
+def paires(chemins):
+    """
+    Regroupe les images du même dossier dont les noms ne diffèrent que par
+    les chiffres (rossignol1.bmp et rossignol2.bmp) et compare chacune avec
+    la suivante dans l'ordre des numéros
+
+    Une série de n images donne n - 1 paires, et non n(n - 1)/2 : les
+    versions successives d'une image sont comparées deux à deux.
+
+    Args:
+        chemins (Iterable[str]): Les images
+
+    Yields:
+        tuple[str, str]: Les paires à comparer
+    """
+    groupes = defaultdict(list)
+    for chemin in chemins:
+        dossier, fichier = os.path.split(chemin)
+        nom, extension = os.path.splitext(fichier)
+        groupes[dossier, re.sub(r"\d+", "#", nom), extension.lower()].append(
+            chemin)
+    for groupe in groupes.values():
+        groupe.sort(key=lambda chemin: (_numeros(chemin), chemin))
+        yield from zip(groupe, groupe[1:])
+
+
+def probabilite_khi2(khi2: float, degres: int) -> float | None:
+    """
+    Renvoie P(X >= khi2) pour une loi du khi carré, par l'approximation de
+    Wilson et Hilferty (suffisante pour un seuil de détection), ou None s'il
+    n'y a aucun degré de liberté (pas assez de données pour conclure)
+    """
+    if degres < 1:
+        return None
+    z = ((khi2 / degres)**(1 / 3) - (1 - 2 / (9 * degres))) / \
+        math.sqrt(2 / (9 * degres))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def khi2_paires(valeurs: np.ndarray) -> dict:
+    """
+    Test du khi carré sur les paires de valeurs (2k, 2k+1)
+
+    Une insertion dans les bits de poids faible égalise les effectifs des
+    deux valeurs de chaque paire : une probabilité proche de 1 signale une
+    insertion probable.
+
+    Args:
+        valeurs (np.ndarray): Les valeurs des pixels, à plat
+
+    Returns:
+        dict: Le khi carré, le nombre de degrés de liberté et la
+        probabilité d'insertion, "indéterminé" si aucune paire n'a
+        l'effectif minimal
+    """
+    histogramme = np.bincount(valeurs, minlength=256).reshape(128, 2)
+    attendus = histogramme.sum(axis=1) / 2
+    gardes = attendus >= EFFECTIF_MIN
+    khi2 = float((((histogramme[gardes, 0] - attendus[gardes])**2) /
+                  attendus[gardes]).sum())
+    degres = max(int(gardes.sum()) - 1, 0)
+    probabilite = probabilite_khi2(khi2, degres)
+    return {"khi2": khi2, "degres": degres,
+            "probabilite_insertion": "indéterminé" if probabilite is None
+            else probabilite}
+
+
+def chemin_extraction(chemin: str, extraction: str,
+                      racine: str | None = None) -> str:
+    """
+    Renvoie le fichier où écrire la charge extraite d'une image : le chemin
+    de l'image relatif à `racine`, recopié sous `extraction`, extension
+    comprise (x.bmp -> x.bmp.lsb), pour que deux images n'écrivent jamais
+    dans le même fichier
+
+    Args:
+        chemin (str): L'image
+        extraction (str): Le dossier des charges extraites
+        racine (str | None): Le dossier parcouru (celui de l'image par
+            défaut)
+
+    Returns:
+        str: Le chemin du fichier de la charge
+    """
+    racine = os.path.dirname(os.path.abspath(chemin)) if racine is None \
+        else racine
+    relatif = os.path.relpath(os.path.abspath(chemin), os.path.abspath(racine))
+    return os.path.join(extraction, f"{relatif}.lsb")
+
+
+def analyse_image(chemin: str, octets_apercu: int = OCTETS_APERCU,
+                  extraction: str | None = None,
+                  racine: str | None = None) -> dict:
+    """
+    Statistiques de stéganalyse d'une image
+
+    Args:
+        chemin (str): L'image
+        octets_apercu (int): Le nombre d'octets de la charge extraite à
+            recopier dans le rapport
+        extraction (str | None): Un dossier où écrire toute la charge
+            extraite des bits de poids faible
+        racine (str | None): Le dossier parcouru, dont l'arborescence est
+            recopiée sous `extraction` (voir `chemin_extraction`)
+
+    Returns:
+        dict: La ligne du rapport
+    """
+    pixels = pixels_image(chemin)
+    valeurs = pixels.reshape(-1)
+    plans = np.unpackbits(valeurs[:, None], axis=1).sum(axis=0)[::-1]
+    resultat = {
+        "type": "image",
+        "image": chemin,
+        "forme": list(pixels.shape),
+        "proportion_uns": (plans / max(len(valeurs), 1)).tolist(),
+        "khi2": [{"proportion": proportion,
+                  **khi2_paires(valeurs[:max(1, int(len(valeurs) *
+                                                    proportion))])}
+                 for proportion in PROPORTIONS],
+    }
+    charge = extrait_octets(pixels)
+    resultat["apercu_lsb"] = charge[:octets_apercu].hex()
+    imprimables = sum(32 <= octet < 127 or octet in (9, 10, 13)
+                      for octet in charge[:octets_apercu])
+    resultat["apercu_imprimable"] = imprimables / max(
+        1, min(octets_apercu, len(charge)))
+    if extraction is not None:
+        resultat["charge"] = chemin_extraction(chemin, extraction, racine)
+        os.makedirs(os.path.dirname(resultat["charge"]), exist_ok=True)
+        with open(resultat["charge"], "wb") as fichier:
+            fichier.write(charge)
+    return resultat
+
+
+def compare_paire(chemin1: str, chemin2: str) -> dict:
+    """
+    Compare deux images plan de bits par plan de bits
+
+    Args:
+        chemin1 (str): La première image
+        chemin2 (str): La deuxième image
+
+    Returns:
+        dict: La ligne du rapport : nombre et proportion de bits différents
+        par plan (0 = poids faible), écart maximal et premier pixel
+        différent
+    """
+    pixels1, pixels2 = pixels_image(chemin1), pixels_image(chemin2)
+    resultat = {"type": "paire", "images": [chemin1, chemin2]}
+    if pixels1.shape != pixels2.shape:
+        resultat["erreur"] = "formes différentes"
+        return resultat
+    difference = np.bitwise_xor(pixels1, pixels2).reshape(-1)
+    differents = np.unpackbits(difference[:, None], axis=1).sum(
+        axis=0)[::-1]
+    ecarts = np.nonzero(difference)[0]
+    resultat.update({
+        "bits_differents": differents.tolist(),
+        "proportion_differents": (differents /
+                                  max(len(difference), 1)).tolist(),
+        "ecart_max": int(np.abs(pixels1.astype(np.int16) -
+                                pixels2.astype(np.int16)).max(initial=0)),
+        "premier_ecart": int(ecarts[0]) if len(ecarts) else None,
+    })
+    return resultat
+
+
+def _executer(tache: tuple) -> dict:
+    """
+    Exécute une tâche du pool et transforme une erreur en ligne de rapport
+    """
+    fonction, arguments = tache
+    try:
+        return fonction(*arguments)
+    except Exception as erreur:  # une image illisible ne doit pas tout arrêter
+        return {"type": fonction.__name__, "arguments": list(arguments),
+                "erreur": repr(erreur)}
+
+
+def steganalyse(dossiers, nombre_processus: int | None = None,
+                octets_apercu: int = OCTETS_APERCU,
+                extraction: str | None = None, recursif: bool = True):
+    """
+    Analyse toutes les images des dossiers et compare les paires, dans un
+    pool de processus
+
+    Args:
+        dossiers (Iterable[str]): Les dossiers à parcourir
+        nombre_processus (int | None): La taille du pool
+        octets_apercu (int): Les octets de charge recopiés dans le rapport
+        extraction (str | None): Le dossier où écrire les charges extraites
+        recursif (bool): Parcourt aussi les sous-dossiers
+
+    Yields:
+        dict: Les lignes du rapport, dans l'ordre où elles sont prêtes
+    """
+    dossiers = list(dossiers)
+    # une image donnée deux fois (par deux dossiers imbriqués) n'est
+    # analysée qu'une fois
+    chemins = sorted(set(images(dossiers, recursif)))
+    # toutes les images sont sous cette racine : leurs chemins relatifs,
+    # recopiés sous `extraction`, sont tous différents
+    racine = os.path.commonpath(
+        [os.path.abspath(dossier if os.path.isdir(dossier)
+                         else os.path.dirname(dossier) or ".")
+         for dossier in dossiers]) if chemins else None
+    # les tâches sont construites au fur et à mesure de leur soumission
+    taches = chain(((analyse_image, (chemin, octets_apercu, extraction,
+                                     racine))
+                    for chemin in chemins),
+                   ((compare_paire, paire) for paire in paires(chemins)))
+    nombre_processus = nombre_processus or os.cpu_count() or 1
+    with ProcessPoolExecutor(nombre_processus) as executeur:
+        en_cours = set()
+        for tache in taches:
+            en_cours.add(executeur.submit(_executer, tache))
+            if len(en_cours) >= TACHES_PAR_PROCESSUS * nombre_processus:
+                termines, en_cours = wait(en_cours,
+                                          return_when=FIRST_COMPLETED)
+                for futur in termines:
+                    yield futur.result()
+        while en_cours:
+            termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+            for futur in termines:
+                yield futur.result()
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Point d'entrée : écrit le rapport JSON lines
+    """
+    parseur = argparse.ArgumentParser(
+        description="Stéganalyse des images de dossiers entiers")
+    parseur.add_argument("dossiers", nargs="+")
+    parseur.add_argument("-o", "--sortie", default="-",
+                         help="rapport JSON lines (sortie standard sinon)")
+    parseur.add_argument("-j", "--processus", type=int, default=None)
+    parseur.add_argument("--octets", type=int, default=OCTETS_APERCU,
+                         help="octets de charge recopiés dans le rapport")
+    parseur.add_argument("--extraction",
+                         help="dossier où écrire les charges extraites, "
+                         "avec l'arborescence des images (x.bmp -> x.bmp.lsb)")
+    parseur.add_argument("--non-recursif", action="store_true")
+    options = parseur.parse_args(arguments)
+    sortie = sys.stdout if options.sortie == "-" else \
+        open(options.sortie, "w", encoding="utf-8")
+    try:
+        for ligne in steganalyse(options.dossiers, options.processus,
+                                 options.octets, options.extraction,
+                                 not options.non_recursif):
+            sortie.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+            sortie.flush()
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -191,27 +191,57 @@ def cryptage_mot(mot, cle1, cle2):
         liste.append(cryptage2SDES(chiffre,cle1,cle2))
     return liste
 
-def cassage2SDESastucieux(message_crypte, message_clair):
-    cle1 = creation_cles(10)
-    dico = dict()
-    for premiere_cle in cle1:
-        t1 = tuple(cryptage_simple_mot(message_clair,premiere_cle))
-        dico[t1] = premiere_cle
-        if tuple(decryptage_simple_mot(message_crypte,premiere_cle)) in dico.keys():
-            return (dico[tuple(decryptage_simple_mot(message_crypte,premiere_cle))], premiere_cle)
-    return None
+class _SansMesures:
+    """Instrumentation qui ne mesure rien, pour ne pas dépendre du paquet sdes"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+    def etape(self, nom):
+        return self
+
+    def prevoit(self, total):
+        pass
+
+    def avance(self, nombre=1):
+        pass
+
+def _mesures(instrumentation, nom):
+    """Le paquet sdes n'est importé que si une instrumentation est donnée"""
+    if instrumentation is None:
+        return _SansMesures()
+    from sdes.instrumentation import instrumente
+    return instrumente(instrumentation, nom)
+
+def cassage2SDESastucieux(message_crypte, message_clair, instrumentation=None):
+    with _mesures(instrumentation, "cassage2SDESastucieux") as mesures:
+        with mesures.etape("cles"):
+            cle1 = creation_cles(10)
+            dico = dict()
+        mesures.prevoit(len(cle1))
+        with mesures.etape("recherche"):
+            for premiere_cle in cle1:
+                t1 = tuple(cryptage_simple_mot(message_clair,premiere_cle))
+                dico[t1] = premiere_cle
+                mesures.avance()
+                if tuple(decryptage_simple_mot(message_crypte,premiere_cle)) in dico.keys():
+                    return (dico[tuple(decryptage_simple_mot(message_crypte,premiere_cle))], premiere_cle)
+        return None
 
 '''fonctionne pas :'''
 
 
 '''fonctionne : '''
-mottest = "LETTRE I USBEK À SON AMI RUSTAN. À Ispahan. Nous n’avons séjourné qu’un jour à Com. Lorsque nous eûmes fait nos dévotions sur le tombeau de la vierge qui a mis au monde douze prophètes, nous nous remîmes en chemin, et hier, vingt-cinquième jour de notre départ d’Ispahan, nous arrivâmes à Tauris. Rica et moi sommes peut-être les premiers parmi les Persans que l’envie de savoir ait fait sortir de leur pays, et qui aient renoncé aux douceurs d’une vie tranquille pour aller chercher laborieusement la sagesse. Nous sommes nés dans un royaume florissant ; mais nous n’avons pas cru que ses bornes fussent celles de nos connoissances, et que la lumière orientale dût seule nous éclairer. Mande-moi ce que l’on dit de notre voyage ; ne me flatte point : je ne compte pas sur un grand nombre d’approbateurs. Adresse ta lettre à Erzeron, où je séjournerai quelque temps. Adieu, mon cher Rustan. Sois assuré qu’en quelque lieu du monde où je sois, tu as un ami fidèle. De Tauris, le 15 de la lune de Saphar, 1711."
-print(bytes_to_str(int_from_bytes(mottest)))
-print(cryptage_simple_mot(mottest,0b1100001110))
-mott = cryptage_simple_mot(mottest,0b1100001110)
-print(decryptage_simple_mot(mott,0b1100001110))
-messagecrypte = cryptage_mot(mottest,0b1100001110, 0b1110001110)
-print(messagecrypte)
-print("suite")
-print(cassage2SDESastucieux(messagecrypte,mottest))
-print("résultat attendu :",0b1100001110, 0b1110001110)
\ No newline at end of file
+if __name__ == "__main__":
+    mottest = "LETTRE I USBEK À SON AMI RUSTAN. À Ispahan. Nous n’avons séjourné qu’un jour à Com. Lorsque nous eûmes fait nos dévotions sur le tombeau de la vierge qui a mis au monde douze prophètes, nous nous remîmes en chemin, et hier, vingt-cinquième jour de notre départ d’Ispahan, nous arrivâmes à Tauris. Rica et moi sommes peut-être les premiers parmi les Persans que l’envie de savoir ait fait sortir de leur pays, et qui aient renoncé aux douceurs d’une vie tranquille pour aller chercher laborieusement la sagesse. Nous sommes nés dans un royaume florissant ; mais nous n’avons pas cru que ses bornes fussent celles de nos connoissances, et que la lumière orientale dût seule nous éclairer. Mande-moi ce que l’on dit de notre voyage ; ne me flatte point : je ne compte pas sur un grand nombre d’approbateurs. Adresse ta lettre à Erzeron, où je séjournerai quelque temps. Adieu, mon cher Rustan. Sois assuré qu’en quelque lieu du monde où je sois, tu as un ami fidèle. De Tauris, le 15 de la lune de Saphar, 1711."
+    print(bytes_to_str(int_from_bytes(mottest)))
+    print(cryptage_simple_mot(mottest,0b1100001110))
+    mott = cryptage_simple_mot(mottest,0b1100001110)
+    print(decryptage_simple_mot(mott,0b1100001110))
+    messagecrypte = cryptage_mot(mottest,0b1100001110, 0b1110001110)
+    print(messagecrypte)
+    print("suite")
+    print(cassage2SDESastucieux(messagecrypte,mottest))
+    print("résultat attendu :",0b1100001110, 0b1110001110)